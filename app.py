@@ -11,20 +11,13 @@ from pathlib import Path
 # Add the project root to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from deployer import create_app
+from deployer import create_app, start_background_tasks
 from deployer.services.process_service import ProcessService, setup_signal_handlers
 
 # Create the application
 app = create_app()
 
 if __name__ == '__main__':
-    # Setup signal handlers for graceful shutdown
-    try:
-        process_service = ProcessService.get_instance()
-        setup_signal_handlers(process_service)
-    except Exception as e:
-        print(f"Warning: Could not setup signal handlers: {e}")
-    
     # Get configuration from environment variables
     from deployer.utils.env_config import get_server_config
     server_config = get_server_config()
@@ -37,7 +30,24 @@ if __name__ == '__main__':
     print(f"Vault path: {app.config['VAULT_PATH']}")
     print("🚀 Using WebSockets for real-time logs")
     
-    # Run the SocketIO application
+    if server_config['SERVER_MODE'] == 'production':
+        # Gunicorn handles signals and starts the background tasks in its worker
+        from deployer.server import run_production
+        run_production(app, server_config)
+        sys.exit(0)
+    
+    # Setup signal handlers for graceful shutdown
+    try:
+        process_service = ProcessService.get_instance()
+        setup_signal_handlers(process_service)
+    except Exception as e:
+        print(f"Warning: Could not setup signal handlers: {e}")
+    
+    # With the reloader, only the child process that serves requests runs them
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_tasks(app.socketio)
+    
+    # Run the SocketIO application (development server)
     app.socketio.run(
         app,
         host=host,
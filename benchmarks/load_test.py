@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Load test: development server vs production server.
+
+Starts Deployer on a throwaway vault once per server mode and measures:
+
+- HTTP throughput and latency of ``GET /api/projects/`` from concurrent
+  keep-alive clients;
+- WebSocket fan-out: many Socket.IO clients join the log room of a project
+  that prints timestamped lines, and each client measures how long every
+  line took to reach it.
+
+Needs the production requirements plus the Socket.IO client extras::
+
+    pip install -r requirements.txt "python-socketio[client]"
+    python benchmarks/load_test.py --duration 10 --concurrency 32 --clients 50
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import socketio
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Project whose log lines carry the time they were printed
+TICKER = '''
+import sys, time
+time.sleep({delay})
+for i in range({lines}):
+    print(f"TICK {{i}} {{time.time():.6f}}", flush=True)
+    time.sleep({interval})
+time.sleep(3600)
+'''
+
+
+def percentile(values, fraction):
+    """Value below which a fraction of the sorted values falls."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def start_server(mode, port, vault, threads):
+    """Run app.py in a server mode and wait until it answers."""
+    env = dict(os.environ,
+               SERVER_MODE=mode, PORT=str(port), HOST='127.0.0.1', DEBUG='false',
+               SERVER_THREADS=str(threads),
+               VAULT_PATH=str(vault), STORAGE_PATH=str(vault / 'data'),
+               LOG_FILE=str(vault.parent / f'deployer-{mode}.log'),
+               PROJECT_PORT_RANGE=f'{port + 100}-{port + 199}', PROXY_ENABLED='false')
+    # Run from the scratch directory: the server writes running_processes.json to its cwd
+    process = subprocess.Popen([sys.executable, str(ROOT / 'app.py')], env=env, cwd=vault.parent,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/api/projects/')
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{mode} server did not start on port {port}")
+
+
+def stop_server(process, port):
+    """Stop the ticker project and the server."""
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        connection.request('POST', '/api/projects/ticker/stop')
+        connection.getresponse().read()
+    except OSError:
+        pass
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def http_load(port, concurrency, duration):
+    """Hit the project list from keep-alive clients for a while."""
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    stop_at = time.monotonic() + duration
+
+    def client(index):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            try:
+                connection.request('GET', '/api/projects/')
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors[index] += 1
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+                continue
+            latencies[index].append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    samples = [value for values in latencies for value in values]
+    return {
+        'requests': len(samples),
+        'errors': sum(errors),
+        'rps': round(len(samples) / duration, 1),
+        'p50_ms': round(percentile(samples, 0.5) * 1000, 2) if samples else None,
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 2) if samples else None
+    }
+
+
+def fanout(port, clients, lines, interval):
+    """Measure delivery latency of log lines to many Socket.IO clients."""
+    delays = []
+    lock = threading.Lock()
+    joined = threading.Semaphore(0)
+    sockets = []
+
+    for _ in range(clients):
+        sio = socketio.Client(reconnection=False)
+
+        @sio.on('joined_project')
+        def on_joined(data):
+            joined.release()
+
+        @sio.on('new_log')
+        def on_log(data):
+            received = time.time()
+            parts = data['log']['message'].split()
+            if len(parts) == 3 and parts[0] == 'TICK':
+                with lock:
+                    delays.append(received - float(parts[2]))
+
+        sio.connect(f'http://127.0.0.1:{port}', transports=['websocket'])
+        sio.emit('join_project_logs', {'project_name': 'ticker'})
+        sockets.append(sio)
+
+    for _ in range(clients):
+        joined.acquire(timeout=10)
+
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    connection.request('POST', '/api/projects/ticker/start')
+    connection.getresponse().read()
+
+    expected = clients * lines
+    deadline = time.monotonic() + 5 + lines * interval * 3
+    while time.monotonic() < deadline and len(delays) < expected:
+        time.sleep(0.1)
+
+    for sio in sockets:
+        sio.disconnect()
+
+    return {
+        'delivered': f"{len(delays)}/{expected}",
+        'p50_ms': round(percentile(delays, 0.5) * 1000, 2) if delays else None,
+        'p99_ms': round(percentile(delays, 0.99) * 1000, 2) if delays else None,
+        'max_ms': round(max(delays) * 1000, 2) if delays else None,
+        'mean_ms': round(statistics.mean(delays) * 1000, 2) if delays else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--modes', default='development,production')
+    parser.add_argument('--port', type=int, default=5600)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--lines', type=int, default=50)
+    parser.add_argument('--interval', type=float, default=0.05)
+    parser.add_argument('--threads', type=int, default=64, help='SERVER_THREADS in production')
+    args = parser.parse_args()
+
+    results = {}
+    for offset, mode in enumerate(args.modes.split(',')):
+        workdir = Path(tempfile.mkdtemp(prefix='deployer-load-'))
+        vault = workdir / 'vault'
+        ticker = vault / 'ticker'
+        ticker.mkdir(parents=True)
+        (ticker / '__init__.py').write_text(
+            TICKER.format(delay=1, lines=args.lines, interval=args.interval))
+
+        port = args.port + offset * 200
+        process = start_server(mode, port, vault, args.threads)
+        try:
+            results[mode] = {
+                'http': http_load(port, args.concurrency, args.duration),
+                'fanout': fanout(port, args.clients, args.lines, args.interval)
+            }
+        finally:
+            stop_server(process, port)
+            shutil.rmtree(workdir, ignore_errors=True)
+        print(mode, json.dumps(results[mode]), flush=True)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
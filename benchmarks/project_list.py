@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark of GET /api/projects on a large vault.
+
+Creates a throwaway vault with many git projects and times the list
+endpoint through the Flask test client for several field sets, filters
+and page sizes, so the cost of each computed field is visible.
+
+    python benchmarks/project_list.py --projects 1000
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+QUERIES = [
+    ('every field', ''),
+    ('every field but git', '?fields=' + ','.join([
+        'path', 'github_url', 'created_at', 'updated_at', 'pid', 'started_at',
+        'is_git', 'has_init', 'has_venv', 'has_requirements', 'running', 'replicas'])),
+    ('stored fields only', '?fields=path,github_url,created_at,updated_at'),
+    ('name, running', '?fields=name,running'),
+    ('running=true', '?fields=name&running=true'),
+    ('q substring', '?fields=name&q=project-09'),
+    ('page of 50', '?limit=50'),
+    ('page of 50, name only', '?fields=name&limit=50'),
+]
+
+
+def make_vault(vault, count):
+    """Vault of git projects sharing one template repository."""
+    template = vault.parent / 'template'
+    template.mkdir(parents=True)
+    (template / '__init__.py').write_text('print("hello")\n')
+    (template / 'requirements.txt').write_text('')
+    for command in (['init', '-q'], ['add', '.'],
+                    ['-c', 'user.name=bench', '-c', 'user.email=bench@localhost',
+                     'commit', '-q', '-m', 'init']):
+        subprocess.run(['git', *command], cwd=template, check=True)
+    for index in range(count):
+        shutil.copytree(template, vault / f'project-{index:04d}', symlinks=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--projects', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix='deployer-list-'))
+    vault = workdir / 'vault'
+    vault.mkdir()
+    try:
+        make_vault(vault, args.projects)
+        os.environ.update(VAULT_PATH=str(vault), STORAGE_PATH=str(vault / 'data'),
+                          LOG_FILE=str(workdir / 'deployer.log'), DISABLE_RATE_LIMITING='true')
+        os.chdir(workdir)
+        sys.path.insert(0, str(ROOT))
+        from deployer import create_app, start_background_tasks
+        app = create_app()
+        start_background_tasks(app.socketio)
+        client = app.test_client()
+
+        # Warm the project cache and the git status cache
+        client.get('/api/projects/')
+        time.sleep(1)
+
+        for label, query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = client.get(f'/api/projects/{query}')
+                timings.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.get_data(as_text=True)
+            print(f"{label:<24} {min(timings) * 1000:8.2f} ms  {len(response.data):>9} bytes")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the rate limiter overhead per request.
+
+Measures the GCRA check on its own for every state store (one hot client,
+and many clients cycling through the bounded table), and the cost it adds
+to a full Flask request through the test client. Then several processes
+hammer one client of a shared store at once: together they must accept
+exactly one policy's worth of requests.
+
+    python benchmarks/rate_limiter.py --requests 200000 --processes 4
+"""
+
+import argparse
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from flask import Flask, jsonify
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deployer.middleware.rate_limit_store import create_store  # noqa: E402
+from deployer.middleware.rate_limiter import RateLimitMiddleware  # noqa: E402
+
+# Limits high enough that every request is accepted and fully counted
+UNLIMITED = '1000000000/second'
+
+
+def make_app(limited):
+    """Minimal app with one API route, with or without the limiter."""
+    app = Flask(__name__)
+    app.config.update(RATE_LIMIT_READ=UNLIMITED)
+
+    @app.route('/api/ping')
+    def ping():
+        return jsonify({'ok': True})
+
+    if limited:
+        RateLimitMiddleware(app)
+    return app
+
+
+def per_call(fn, count):
+    """Microseconds per call of fn over count calls."""
+    started = time.perf_counter()
+    fn(count)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def store_path(kind, directory):
+    """File of a store in the scratch directory."""
+    return Path(directory) / f'rate_limits.{kind}'
+
+
+def hammer(kind, path, limit, attempts, start, results):
+    """Process body: try attempts requests of one client, report how many passed."""
+    limiter = RateLimitMiddleware()
+    limiter.store = create_store(kind, path, 1000)
+    limiter.policies['heavy'] = [(limit, 3600.0)]
+    start.wait()
+    results.put(sum(limiter.consume('ip_shared', 'heavy').allowed for _ in range(attempts)))
+
+
+def consistency(kind, directory, processes, limit):
+    """Requests of one client accepted by several processes together."""
+    context = multiprocessing.get_context('fork')
+    start, results = context.Event(), context.Queue()
+    path = store_path(kind, directory)
+    workers = [context.Process(target=hammer, args=(kind, path, limit, limit, start, results))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    start.set()
+    accepted = sum(results.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    return accepted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=200000)
+    parser.add_argument('--clients', type=int, default=50000)
+    parser.add_argument('--max-keys', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--stores', default='memory,shm,sqlite')
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--limit', type=int, default=2000, help='Policy of the consistency check')
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp(prefix='deployer-ratelimit-')
+
+    for kind in args.stores.split(','):
+        limiter = RateLimitMiddleware()
+        limiter.store = create_store(kind, store_path(kind, directory), args.max_keys)
+        limiter.policies['read'] = [(10 ** 9, 1.0)]
+        limiter.policies['heavy'] = [(10 ** 9, 60.0), (10 ** 9, 3600.0)]
+        # SQLite is two orders of magnitude slower: fewer calls keep runs short
+        requests = args.requests if kind != 'sqlite' else max(args.requests // 20, 1000)
+
+        def hot(count):
+            for _ in range(count):
+                limiter.consume('ip_1', 'read')
+
+        def two_limits(count):
+            for _ in range(count):
+                limiter.consume('ip_1', 'heavy')
+
+        keys = [f'ip_{i}' for i in range(args.clients)]
+
+        def churn(count):
+            n = len(keys)
+            for i in range(count):
+                limiter.consume(keys[i % n], 'read')
+
+        print(f"[{kind}]")
+        print(f"consume, one client, 1 limit:        {per_call(hot, requests):6.2f} us")
+        print(f"consume, one client, 2 limits:       {per_call(two_limits, requests):6.2f} us")
+        print(f"consume, {args.clients} clients, {args.max_keys} keys: "
+              f"{per_call(churn, requests):6.2f} us ({len(limiter.store)} keys kept)")
+        accepted = consistency(kind, directory, args.processes, args.limit)
+        print(f"{args.processes} processes, policy {args.limit}/hour: {accepted} accepted "
+              f"({'one shared limit' if accepted <= args.limit + 1 else 'one limit per process'})")
+    shutil.rmtree(directory, ignore_errors=True)
+
+    def route(count):
+        for _ in range(count):
+            RateLimitMiddleware.route_group('POST', '/api/projects/demo/start')
+
+    print(f"route group lookup:                  {per_call(route, args.requests):6.2f} us")
+    # Alternate both variants and keep the best round of each: the full
+    # request takes hundreds of microseconds and is noisy
+    requests = max(args.requests // 40, 1000)
+    timings = {False: [], True: []}
+    clients = {limited: make_app(limited).test_client() for limited in timings}
+    for _ in range(args.rounds):
+        for limited, client in clients.items():
+            def full(count):
+                for _ in range(count):
+                    client.get('/api/ping')
+
+            timings[limited].append(per_call(full, requests))
+    without, with_limiter = min(timings[False]), min(timings[True])
+    print(f"Flask request without limiter:       {without:6.2f} us")
+    print(f"Flask request with limiter:          {with_limiter:6.2f} us "
+          f"(+{with_limiter - without:.2f} us)")
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,9 @@ from flask_socketio import SocketIO
 
 from deployer.utils.env_config import get_app_config
 
+# Process that started the background tasks (they must run once per process)
+_background_tasks_pid = None
+
 
 def create_app(config_name=None):
     """Create and configure Flask application."""
@@ -32,13 +35,30 @@ def create_app(config_name=None):
         r"/*": {"origins": app.config['CORS_ORIGINS']}
     })
     
+    # Take the client address from X-Forwarded-For only behind trusted proxies
+    if app.config['TRUSTED_PROXIES'] > 0:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'])
+    
+    # Rate limit API requests per client and route group
+    from deployer.middleware.rate_limiter import setup_rate_limiting
+    setup_rate_limiting(app)
+    
+    # Gzip large JSON responses (API_GZIP_MIN_SIZE)
+    from deployer.middleware.compression import setup_compression
+    setup_compression(app)
+    
     # Initialize SocketIO
-    socketio = SocketIO(app, cors_allowed_origins=app.config['CORS_ORIGINS'])
+    socketio = create_socketio(app)
     app.socketio = socketio
     
     # Register blueprints
     register_blueprints(app)
     
+    # Index the React build once instead of looking files up per request
+    from deployer.utils.static_assets import StaticAssets
+    app.static_assets = StaticAssets(Path(app.root_path) / 'static' / 'dist')
+    
     # Register WebSocket events
     register_socketio_events(socketio)
     
@@ -49,41 +69,127 @@ def create_app(config_name=None):
     initialize_json_storage(app)
     
     # Initialize services
+    from deployer.services.disk_usage_service import DiskUsageService
+    from deployer.services.environment_service import EnvironmentService
+    from deployer.services.git_status_service import GitStatusService
+    from deployer.services.job_service import JobService
+    from deployer.services.lifecycle_service import LifecycleService
+    from deployer.services.mirror_service import MirrorService
     from deployer.services.process_service import ProcessService
     from deployer.services.project_service_json import ProjectService
+    from deployer.services.proxy_service import ProxyService
+    from deployer.services.resource_service import ResourceService
+    from deployer.services.state_version_service import StateVersionService
+    from deployer.services.trash_service import TrashService
+    from deployer.services.warmup_service import WarmupService
     from deployer.utils.security import SecurityContext
     
     vault_path = Path(app.config['VAULT_PATH'])
     security_context = SecurityContext(vault_path)
     
+    StateVersionService.initialize(app.config)
+    LifecycleService.initialize(app.config)
+    ResourceService.initialize(app.config)
+    JobService.initialize(app.config)
+    TrashService.initialize(app.config)
+    MirrorService.initialize(app.config)
+    GitStatusService.initialize(app.config)
+    DiskUsageService.initialize(app.config)
+    EnvironmentService.initialize(app.config)
+    WarmupService.initialize(app.config)
     ProcessService.initialize(app.config)
-    ProjectService.initialize(vault_path, security_context)
-    
-    # Start background log monitoring
-    start_background_tasks(socketio)
+    ProjectService.initialize(vault_path, security_context, app.config)
+    ProxyService.initialize(app.config)
     
+    # Background tasks are started by the server entry point, once per process
     return app
 
 
+def create_socketio(app):
+    """
+    Create the Socket.IO server.
+    
+    Threading mode is used on every server: the services rely on threads and
+    blocking calls that eventlet or gevent monkey-patching would stall. Rooms
+    live in the one process that serves the app (see deployer.server).
+    """
+    return SocketIO(
+        app,
+        async_mode='threading',
+        cors_allowed_origins=app.config['CORS_ORIGINS'],
+        ping_timeout=app.config['WEBSOCKET_PING_TIMEOUT'],
+        ping_interval=app.config['WEBSOCKET_PING_INTERVAL']
+    )
+
+
 def start_background_tasks(socketio):
-    """Start background tasks for log monitoring."""
+    """Start background tasks (log monitoring, watchers, proxy), once per process."""
     import threading
     import time
     
+    global _background_tasks_pid
+    if _background_tasks_pid == os.getpid():
+        return
+    _background_tasks_pid = os.getpid()
+    
     def log_monitoring_task():
         """Background task to check for new logs."""
+        from deployer.services.environment_service import EnvironmentService
         from deployer.services.log_service import LogService
+        from deployer.services.process_service import ProcessService
+        from deployer.services.resource_service import ResourceService
         
         while True:
             try:
                 LogService.check_for_new_logs()
             except Exception as e:
                 print(f"Error in log monitoring: {e}")
+            try:
+                ResourceService.get_instance().poll_oom_events()
+            except Exception as e:
+                print(f"Error checking OOM events: {e}")
+            try:
+                ProcessService.get_instance().rebalance_if_due()
+            except Exception as e:
+                print(f"Error rebalancing CPU placement: {e}")
+            try:
+                EnvironmentService.get_instance().collect_garbage_if_due()
+            except Exception as e:
+                print(f"Error collecting unused environments: {e}")
             time.sleep(1)  # Check every second
     
     # Start the background thread
     log_thread = threading.Thread(target=log_monitoring_task, daemon=True)
     log_thread.start()
+    
+    # Keep git mirrors fresh so new projects clone from a recent copy
+    from deployer.services.mirror_service import MirrorService
+    MirrorService.get_instance().start_refresher()
+    
+    # Keep the project cache in sync with the vault on disk
+    from deployer.services.project_service_json import ProjectService
+    ProjectService.get_instance().start_watcher()
+    
+    # Disk usage: one full walk, then re-walks of what changed
+    from deployer.services.disk_usage_service import DiskUsageService
+    disk_usage_service = DiskUsageService.get_instance()
+    ProjectService.get_instance().watcher.add_listener(disk_usage_service.on_vault_change)
+    disk_usage_service.start()
+    
+    # Deleted projects and venvs are reclaimed at low priority
+    from deployer.services.trash_service import TrashService
+    TrashService.get_instance().start_reaper()
+    TrashService.get_instance().add_listener(lambda: disk_usage_service.mark_changed(None))
+    
+    # Lifecycle events reach the dashboard and project rooms in coalesced batches
+    from deployer.services.lifecycle_service import LifecycleService
+    from deployer.websocket.events import broadcast_lifecycle_events
+    LifecycleService.get_instance().subscribe(broadcast_lifecycle_events)
+    LifecycleService.get_instance().start()
+    
+    # Reverse proxy runs on its own threads, never on Flask request workers
+    from deployer.services.proxy_service import ProxyService
+    ProxyService.get_instance().start()
 
 
 def configure_logging(app):
@@ -108,6 +214,7 @@ def configure_logging(app):
 def register_blueprints(app):
     """Register application blueprints."""
     
+    from deployer.api.jobs import jobs_bp
     from deployer.api.projects import projects_bp
     from deployer.api.system import system_bp
     from deployer.views.main import main_bp
@@ -115,6 +222,7 @@ def register_blueprints(app):
     app.register_blueprint(main_bp)
     app.register_blueprint(projects_bp, url_prefix='/api/projects')
     app.register_blueprint(system_bp, url_prefix='/api/system')
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
 
 
 def register_socketio_events(socketio):
@@ -148,7 +256,9 @@ def initialize_json_storage(app):
     storage_path = Path(app.config.get('STORAGE_PATH', app.config['VAULT_PATH'] / 'data'))
     
     # Initialize JSON storage
-    initialize_storage(str(storage_path))
+    initialize_storage(str(storage_path),
+                       log_segment_size=app.config.get('LOG_ARCHIVE_SEGMENT_SIZE', 8 * 1024 * 1024),
+                       log_max_segments=app.config.get('LOG_ARCHIVE_MAX_SEGMENTS', 64))
     
     app.logger.info(f"JSON storage initialized at: {storage_path}")
 
@@ -0,0 +1,64 @@
+"""Background job API endpoints."""
+
+from flask import Blueprint, request, jsonify
+
+from deployer.services.job_service import JobService, JobServiceError, JOB_STATES
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+@jobs_bp.route('/', methods=['GET'])
+def get_jobs():
+    """List jobs, optionally filtered by project and status."""
+    try:
+        project_name = request.args.get('project')
+        status = request.args.get('status')
+        
+        if status and status not in JOB_STATES:
+            return jsonify({'error': f"status must be one of: {', '.join(JOB_STATES)}"}), 400
+        
+        job_service = JobService.get_instance()
+        jobs = job_service.list_jobs(project_name, status)
+        
+        return jsonify({
+            'jobs': [job.to_dict() for job in jobs],
+            'stats': job_service.get_stats()
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get job status, duration and recent output."""
+    try:
+        job = JobService.get_instance().get_job(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify(job.to_dict(include_output=True))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@jobs_bp.route('/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running job."""
+    try:
+        job_service = JobService.get_instance()
+        if not job_service.get_job(job_id):
+            return jsonify({'error': 'Job not found'}), 404
+        
+        job = job_service.cancel(job_id)
+        
+        return jsonify({
+            'message': 'Job cancellation requested',
+            'job': job.to_dict()
+        })
+    
+    except JobServiceError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
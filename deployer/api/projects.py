@@ -1,34 +1,179 @@
 """Project API endpoints."""
 
-from flask import Blueprint, request, jsonify
-
+import base64
+import binascii
+import json
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+from flask import Blueprint, Response, current_app, request, jsonify
+
+from deployer.models.project_json import Project
+from deployer.services.disk_usage_service import DiskUsageService, DiskUsageServiceError
+from deployer.services.git_status_service import GitStatusService
+from deployer.services.log_service import LOG_LEVELS, LogService, LogServiceError
 from deployer.services.project_service_json import ProjectService, ProjectServiceError
 from deployer.services.process_service import ProcessService, ProcessServiceError
+from deployer.services.resource_service import ResourceService, ResourceServiceError
+from deployer.services.state_version_service import StateVersionService
+from deployer.storage.json_storage import get_log_storage
+from deployer.utils.conditional import add_validators, not_modified, send_file_range
 from deployer.utils.validators import validate_github_url, validate_project_name
 
 projects_bp = Blueprint('projects', __name__)
 
+# Fields the project list adds to Project.to_dict()
+LIST_FIELDS = ('running', 'replicas', 'git')
+PROJECT_FIELDS = tuple(dict.fromkeys(
+    tuple(Project.__dataclass_fields__) + Project.COMPUTED_FIELDS + LIST_FIELDS))
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Reconnect delay suggested to log stream clients
+SSE_RETRY_MS = 3000
+
+
+def _parse_fields(spec: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse ``?fields=name,running``: None for every field, name always included.
+    
+    Raises:
+        ValueError: If a field is unknown
+    """
+    if spec is None:
+        return None
+    fields = [field.strip() for field in spec.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in PROJECT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} "
+                         f"(available: {', '.join(PROJECT_FIELDS)})")
+    return ['name'] + [field for field in fields if field != 'name']
+
+
+def _parse_bool(value: Optional[str], name: str) -> Optional[bool]:
+    """Parse an optional true/false query parameter."""
+    if value is None:
+        return None
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f"{name} must be true or false")
+
+
+def _encode_cursor(project_name: str) -> str:
+    """Opaque cursor pointing after a project."""
+    return base64.urlsafe_b64encode(project_name.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor: str) -> str:
+    """Project name a cursor points after."""
+    try:
+        return base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def _project_validators(project_name: Optional[str] = None) -> Optional[Tuple[str, float]]:
+    """
+    ETag and last change time of the project list, or of one project.
+    
+    None while the vault watcher is off: changes made on disk would then
+    not bump the version counters.
+    """
+    if not ProjectService.get_instance().watcher.running:
+        return None
+    versions = StateVersionService.get_instance()
+    if project_name is None:
+        version = versions.global_version()
+    else:
+        version = versions.project_version(project_name)
+    return versions.etag(version), version[1]
+
 
 @projects_bp.route('/', methods=['GET'])
 def get_projects():
-    """Get all projects with current status."""
+    """
+    Get projects with current status (supports conditional GET).
+    
+    Query parameters:
+        fields: Comma-separated fields to return (all by default); the
+            filesystem checks and git status only run when requested
+        running: true or false to filter by running status
+        q: Case-insensitive substring of the name or repository URL
+        limit, cursor: Paginate by name; the response is then an object with
+            the page in ``projects`` and the cursor of the next page
+    """
     try:
         project_service = ProjectService.get_instance()
         process_service = ProcessService.get_instance()
+        git_status_service = GitStatusService.get_instance()
+        
+        try:
+            fields = _parse_fields(request.args.get('fields'))
+            running_filter = _parse_bool(request.args.get('running'), 'running')
+            after = request.args.get('cursor')
+            after = _decode_cursor(after) if after else None
+            paginate = 'limit' in request.args or after is not None
+            limit = request.args.get('limit', DEFAULT_PAGE_SIZE)
+            if not str(limit).isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+                raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+            limit = int(limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        query = request.args.get('q', '').strip().lower()
+        
+        # Taken before building the body: a change meanwhile only costs a refetch
+        validators = _project_validators()
+        if validators:
+            cached = not_modified(*validators)
+            if cached is not None:
+                git_status_service.refresh_expired()
+                return cached
         
         projects = project_service.get_all_projects()
-        running_projects = process_service.get_running_projects()
+        running_projects = set(process_service.get_running_projects())
+        
+        # Filter and page on stored data before computing any field
+        if query:
+            projects = [project for project in projects
+                        if query in project.name.lower() or query in (project.github_url or '').lower()]
+        if running_filter is not None:
+            projects = [project for project in projects
+                        if (project.name in running_projects) == running_filter]
+        projects.sort(key=lambda project: project.name)
+        if paginate:
+            start = bisect_right([project.name for project in projects], after) if after is not None else 0
+            has_more = start + limit < len(projects)
+            projects = projects[start:start + limit]
+        
+        wanted = set(LIST_FIELDS) if fields is None else set(fields)
         
         # Update running status for each project (without logs for performance)
         projects_data = []
         for project in projects:
-            project_dict = project.to_dict()
-            project_dict['running'] = project.name in running_projects
+            project_dict = project.to_dict(fields)
+            if 'running' in wanted:
+                project_dict['running'] = project.name in running_projects
+            if 'replicas' in wanted:
+                project_dict['replicas'] = process_service.get_replica_count(project.name)
+            if 'git' in wanted:
+                project_dict['git'] = git_status_service.get_status(project.name, project.project_path)
             # Don't include logs in the main projects list to improve performance
             # Logs can be fetched separately when needed
             projects_data.append(project_dict)
         
-        return jsonify(projects_data)
+        if paginate:
+            response = jsonify({
+                'projects': projects_data,
+                'limit': limit,
+                'has_more': has_more,
+                'next_cursor': _encode_cursor(projects[-1].name) if has_more else None
+            })
+        else:
+            response = jsonify(projects_data)
+        return add_validators(response, *validators) if validators else response
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -55,9 +200,13 @@ def create_project():
             return jsonify({'error': 'Invalid project name'}), 400
         
         project_service = ProjectService.get_instance()
-        project = project_service.create_project(github_url, project_name)
+        job = project_service.create_project(github_url, project_name)
         
-        return jsonify(project.to_dict()), 201
+        return jsonify({
+            'message': 'Project creation started',
+            'project_name': job.project_name,
+            'job': job.to_dict()
+        }), 202, {'Location': f'/api/jobs/{job.id}'}
     
     except ProjectServiceError as e:
         return jsonify({'error': str(e)}), 400
@@ -67,15 +216,27 @@ def create_project():
 
 @projects_bp.route('/<project_name>', methods=['GET'])
 def get_project(project_name):
-    """Get specific project."""
+    """Get specific project (supports conditional GET)."""
     try:
         project_service = ProjectService.get_instance()
+        git_status_service = GitStatusService.get_instance()
+        
+        validators = _project_validators(project_name)
+        if validators:
+            cached = not_modified(*validators)
+            if cached is not None:
+                git_status_service.refresh_expired(project_name)
+                return cached
+        
         project = project_service.get_project(project_name)
         
         if not project:
             return jsonify({'error': 'Project not found'}), 404
         
-        return jsonify(project.to_dict())
+        project_dict = project.to_dict()
+        project_dict['git'] = git_status_service.get_status(project.name, project.project_path)
+        response = jsonify(project_dict)
+        return add_validators(response, *validators) if validators else response
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -107,12 +268,19 @@ def delete_project(project_name):
 
 @projects_bp.route('/<project_name>/update', methods=['POST'])
 def update_project(project_name):
-    """Update project from Git repository."""
+    """Update project from Git repository (fetch, fast-forward or check out a ref)."""
     try:
+        data = request.get_json(silent=True) or {}
+        ref = data.get('ref', request.args.get('ref'))
+        strategy = data.get('strategy', request.args.get('strategy', 'stop'))
+        
         project_service = ProjectService.get_instance()
-        project = project_service.update_project(project_name)
+        job = project_service.update_project(project_name, ref, strategy)
         
-        return jsonify(project.to_dict())
+        return jsonify({
+            'message': 'Project update started',
+            'job': job.to_dict()
+        }), 202, {'Location': f'/api/jobs/{job.id}'}
     
     except ProjectServiceError as e:
         return jsonify({'error': str(e)}), 400
@@ -125,12 +293,12 @@ def create_venv(project_name):
     """Create virtual environment for project."""
     try:
         project_service = ProjectService.get_instance()
-        success = project_service.create_virtual_environment(project_name)
+        job = project_service.create_venv(project_name)
         
-        if success:
-            return jsonify({'message': 'Virtual environment created successfully'})
-        else:
-            return jsonify({'error': 'Failed to create virtual environment'}), 500
+        return jsonify({
+            'message': 'Virtual environment creation started',
+            'job': job.to_dict()
+        }), 202, {'Location': f'/api/jobs/{job.id}'}
     
     except ProjectServiceError as e:
         return jsonify({'error': str(e)}), 400
@@ -143,7 +311,7 @@ def delete_venv(project_name):
     """Delete virtual environment for project."""
     try:
         project_service = ProjectService.get_instance()
-        success = project_service.delete_virtual_environment(project_name)
+        success = project_service.delete_venv(project_name)
         
         if success:
             return jsonify({'message': 'Virtual environment deleted successfully'})
@@ -158,15 +326,19 @@ def delete_venv(project_name):
 
 @projects_bp.route('/<project_name>/install', methods=['POST'])
 def install_requirements(project_name):
-    """Install requirements for project."""
+    """Install requirements for project, skipping unchanged ones unless forced."""
     try:
         project_service = ProjectService.get_instance()
-        success = project_service.install_requirements(project_name)
+        data = request.get_json(silent=True) or {}
+        force = data.get('force', request.args.get('force', 'false'))
+        if isinstance(force, str):
+            force = force.lower() in ('1', 'true', 'yes')
+        job = project_service.install_requirements(project_name, force=bool(force))
         
-        if success:
-            return jsonify({'message': 'Requirements installed successfully'})
-        else:
-            return jsonify({'error': 'Failed to install requirements'}), 500
+        return jsonify({
+            'message': 'Requirements installation started',
+            'job': job.to_dict()
+        }), 202, {'Location': f'/api/jobs/{job.id}'}
     
     except ProjectServiceError as e:
         return jsonify({'error': str(e)}), 400
@@ -185,10 +357,16 @@ def start_project(project_name):
         if not project:
             return jsonify({'error': 'Project not found'}), 404
         
-        success = process_service.start_project(project)
+        data = request.get_json(silent=True) or {}
+        replicas = data.get('replicas', request.args.get('replicas', type=int))
+        
+        success = process_service.start_project(project, replicas)
         
         if success:
-            return jsonify({'message': 'Project started successfully'})
+            return jsonify({
+                'message': 'Project started successfully',
+                'status': process_service.get_project_status(project_name)
+            })
         else:
             return jsonify({'error': 'Failed to start project'}), 500
     
@@ -198,15 +376,206 @@ def start_project(project_name):
         return jsonify({'error': str(e)}), 500
 
 
+@projects_bp.route('/<project_name>/restart', methods=['POST'])
+def restart_project(project_name):
+    """Restart project (stop and start), with zero downtime when strategy=bluegreen."""
+    try:
+        project_service = ProjectService.get_instance()
+        process_service = ProcessService.get_instance()
+        
+        project = project_service.get_project(project_name)
+        if not project:
+            return jsonify({'error': 'Project not found'}), 404
+        
+        data = request.get_json(silent=True) or {}
+        strategy = data.get('strategy', request.args.get('strategy', 'stop'))
+        
+        report = process_service.restart_project(project, strategy)
+        
+        return jsonify({
+            'message': 'Project restarted successfully',
+            'restart': report
+        })
+    
+    except (ProjectServiceError, ProcessServiceError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/prepare', methods=['POST'])
+def prepare_project(project_name):
+    """Precompile a project and check that its entry point imports."""
+    try:
+        project_service = ProjectService.get_instance()
+        data = request.get_json(silent=True) or {}
+        force = data.get('force', request.args.get('force', 'false'))
+        if isinstance(force, str):
+            force = force.lower() in ('1', 'true', 'yes')
+        job = project_service.prepare_project(project_name, force=bool(force))
+        
+        return jsonify({
+            'message': 'Project preparation started',
+            'job': job.to_dict()
+        }), 202, {'Location': f'/api/jobs/{job.id}'}
+    
+    except ProjectServiceError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/warmup', methods=['GET'])
+def get_project_warmup(project_name):
+    """Get preparation state and cold versus warm start times."""
+    try:
+        project_service = ProjectService.get_instance()
+        if not project_service.get_project(project_name):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        return jsonify(project_service.get_warmup_status(project_name))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/disk', methods=['GET'])
+def get_project_disk_usage(project_name):
+    """Get disk usage of a project per category (code, git, venv, logs)."""
+    try:
+        project_service = ProjectService.get_instance()
+        if not project_service.get_project(project_name):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        return jsonify(DiskUsageService.get_instance().get_project_usage(project_name))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/disk', methods=['PUT'])
+def update_project_disk_quota(project_name):
+    """Set the disk quota of a project ({"quota": "2G"}, null for the default)."""
+    try:
+        data = request.get_json()
+        if data is None or 'quota' not in data:
+            return jsonify({'error': 'quota is required'}), 400
+        
+        project_service = ProjectService.get_instance()
+        if not project_service.get_project(project_name):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        disk_usage_service = DiskUsageService.get_instance()
+        disk_usage_service.set_quota(project_name, data['quota'])
+        
+        return jsonify({
+            'message': 'Disk quota updated successfully',
+            'disk': disk_usage_service.get_project_usage(project_name)
+        })
+    
+    except DiskUsageServiceError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/readiness', methods=['GET'])
+def get_project_readiness(project_name):
+    """Get the readiness probe used by blue/green restarts."""
+    try:
+        project_service = ProjectService.get_instance()
+        if not project_service.get_project(project_name):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        probe = ProcessService.get_instance().get_readiness_probe(project_name)
+        return jsonify(probe.to_dict())
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/readiness', methods=['PUT'])
+def update_project_readiness(project_name):
+    """Configure the readiness probe used by blue/green restarts."""
+    try:
+        data = request.get_json()
+        if data is None:
+            return jsonify({'error': 'JSON data required'}), 400
+        
+        project_service = ProjectService.get_instance()
+        if not project_service.get_project(project_name):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        probe = ProcessService.get_instance().set_readiness_probe(project_name, data)
+        
+        return jsonify({
+            'message': 'Readiness probe updated successfully',
+            'readiness': probe.to_dict()
+        })
+    
+    except ProcessServiceError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/scale', methods=['POST'])
+def scale_project(project_name):
+    """Change the number of running replicas of a project."""
+    try:
+        data = request.get_json()
+        if not data or 'replicas' not in data:
+            return jsonify({'error': 'replicas is required'}), 400
+        
+        project_service = ProjectService.get_instance()
+        process_service = ProcessService.get_instance()
+        
+        project = project_service.get_project(project_name)
+        if not project:
+            return jsonify({'error': 'Project not found'}), 404
+        
+        status = process_service.scale_project(project, data['replicas'])
+        
+        return jsonify({'message': 'Project scaled successfully', 'status': status})
+    
+    except (ProjectServiceError, ProcessServiceError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/status', methods=['GET'])
+def get_project_status(project_name):
+    """Get process status of a project and its replicas."""
+    try:
+        process_service = ProcessService.get_instance()
+        status = process_service.get_project_status(project_name)
+        
+        replica = request.args.get('replica', type=int)
+        if replica is not None:
+            matches = [r for r in status['replicas'] if r['replica'] == replica]
+            if not matches:
+                return jsonify({'error': 'Replica not found'}), 404
+            return jsonify(matches[0])
+        
+        return jsonify(status)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @projects_bp.route('/<project_name>/stop', methods=['POST'])
 def stop_project(project_name):
     """Stop project execution."""
     try:
         process_service = ProcessService.get_instance()
         
-        success = process_service.stop_project(project_name)
+        replica = request.args.get('replica', type=int)
+        success = process_service.stop_project(project_name, replica)
         
         if success:
+            if replica is not None:
+                return jsonify({'message': f'Replica {replica} stopped successfully'})
             return jsonify({'message': 'Project stopped successfully'})
         else:
             return jsonify({'error': 'Failed to stop project'}), 500
@@ -217,33 +586,194 @@ def stop_project(project_name):
         return jsonify({'error': str(e)}), 500
 
 
+@projects_bp.route('/<project_name>/resources', methods=['GET'])
+def get_project_resources(project_name):
+    """Get resource limits and current usage for a project."""
+    try:
+        project_service = ProjectService.get_instance()
+        process_service = ProcessService.get_instance()
+        
+        if not project_service.get_project(project_name):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        report = ResourceService.get_instance().get_report(
+            project_name, process_service.get_project_pids(project_name)
+        )
+        report['running'] = process_service.is_project_running(project_name)
+        
+        return jsonify(report)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/resources', methods=['PUT'])
+def update_project_resources(project_name):
+    """Update resource limits for a project (applied live under cgroups, else on next start)."""
+    try:
+        data = request.get_json()
+        if data is None:
+            return jsonify({'error': 'JSON data required'}), 400
+        
+        project_service = ProjectService.get_instance()
+        if not project_service.get_project(project_name):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        limits = ResourceService.get_instance().set_limits(project_name, data)
+        
+        return jsonify({
+            'message': 'Resource limits updated successfully',
+            'limits': limits.to_dict()
+        })
+    
+    except ResourceServiceError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @projects_bp.route('/<project_name>/logs', methods=['GET'])
 def get_project_logs(project_name):
-    """Get project logs with optional pagination."""
+    """Get project logs with optional pagination (supports conditional GET)."""
     try:
         process_service = ProcessService.get_instance()
         
+        versions = StateVersionService.get_instance()
+        version = versions.log_version(project_name)
+        etag = versions.etag(version)
+        cached = not_modified(etag, version[1])
+        if cached is not None:
+            return cached
+        
         # Get pagination parameters
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
+        replica = request.args.get('replica', type=int)
         
         # Limit maximum logs per request
         limit = min(limit, 200)
         
-        logs = process_service.get_project_logs(project_name)
+        logs = process_service.get_project_logs(project_name, replica)
         
         # Apply pagination
         total_logs = len(logs)
         paginated_logs = logs[offset:offset + limit] if logs else []
         
-        return jsonify({
+        response = jsonify({
             'logs': [log.to_dict() for log in paginated_logs],
             'total': total_logs,
             'offset': offset,
             'limit': limit,
             'has_more': offset + limit < total_logs
         })
+        return add_validators(response, etag, version[1])
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/logs/stream', methods=['GET'])
+def stream_project_logs(project_name):
+    """
+    Stream a project's log lines as Server-Sent Events.
+    
+    Fed from the same in-memory buffer as the WebSocket log rooms, with no
+    storage reads. Each line is a ``log`` event whose id is the log entry
+    id; reconnecting with ``Last-Event-ID`` replays the buffered lines after
+    it. ``?level=WARNING`` sets the lowest level sent, ``?tail=N`` replays
+    the last N buffered lines on a fresh connection. A slow reader loses its
+    oldest queued lines (reported by a ``dropped`` event), and a comment
+    line is sent when idle so proxies and clients see the stream alive.
+    """
+    try:
+        if not ProjectService.get_instance().get_project(project_name):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        level = request.args.get('level', 'DEBUG').upper()
+        if level not in LOG_LEVELS:
+            return jsonify({'error': f"level must be one of: {', '.join(LOG_LEVELS)}"}), 400
+        tail = max(request.args.get('tail', 0, type=int), 0)
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        
+        config = current_app.config
+        heartbeat = config.get('LOG_STREAM_HEARTBEAT', 15)
+        # Every stream holds a server thread for as long as it is open
+        subscription, backlog = LogService.subscribe(
+            project_name, config.get('LOG_STREAM_BUFFER', 1000), level, last_event_id, tail,
+            max_streams=config.get('LOG_STREAM_MAX_CLIENTS', 32)
+        )
+    except LogServiceError:
+        return jsonify({'error': 'Too many log streams'}), 503, {'Retry-After': str(heartbeat)}
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    def event(entry):
+        return f"id: {entry['id']}\nevent: log\ndata: {json.dumps(entry)}\n\n"
+    
+    def generate():
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n" + ''.join(event(entry) for entry in backlog)
+            while True:
+                entries, dropped = subscription.get(heartbeat)
+                chunk = ''.join(event(entry) for entry in entries)
+                if dropped:
+                    chunk = f"event: dropped\ndata: {json.dumps({'dropped': dropped})}\n\n" + chunk
+                # A write to a closed connection ends the generator
+                yield chunk or ': keepalive\n\n'
+        finally:
+            LogService.unsubscribe(subscription)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@projects_bp.route('/<project_name>/logs/archive', methods=['GET'])
+def get_project_log_archive(project_name):
+    """List the segments of a project's log history."""
+    try:
+        if not ProjectService.get_instance().get_project(project_name):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        segments = get_log_storage().archive.segments(project_name)
+        return jsonify({
+            'segments': segments,
+            'total_bytes': sum(segment['size'] for segment in segments)
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<project_name>/logs/raw', methods=['GET'])
+def download_project_logs(project_name):
+    """
+    Download a project's log history as stored on disk.
+    
+    Without ``?segment`` the live segment is sent as JSON lines; a sealed
+    segment is sent gzip-compressed as stored (``.jsonl.gz``). Range and
+    If-Range requests resume or split downloads.
+    """
+    try:
+        if not ProjectService.get_instance().get_project(project_name):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        segment = request.args.get('segment')
+        if segment is not None and (not segment.isdigit() or int(segment) < 1):
+            return jsonify({'error': 'segment must be a positive integer'}), 400
+        
+        path = get_log_storage().archive.segment_path(project_name, int(segment) if segment else None)
+        if path is None:
+            return jsonify({'error': 'Log segment not found'}), 404
+        
+        if path.suffix == '.gz':
+            return send_file_range(path, 'application/gzip', f"{project_name}-{path.name}")
+        return send_file_range(path, 'application/x-ndjson', f"{project_name}-logs.jsonl")
     
+    except FileNotFoundError:
+        # Sealed or cleared between the lookup and the open
+        return jsonify({'error': 'Log segment not found'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
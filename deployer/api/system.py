@@ -1,11 +1,26 @@
 """System API endpoints."""
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify
 
+from deployer.services.disk_usage_service import DiskUsageService
+from deployer.services.environment_service import EnvironmentService
+from deployer.services.git_status_service import GitStatusService
+from deployer.services.job_service import JobService
+from deployer.services.mirror_service import MirrorService
 from deployer.services.process_service import ProcessService
+from deployer.services.project_service_json import ProjectService
+from deployer.services.proxy_service import ProxyService
+from deployer.services.resource_service import ResourceService
+from deployer.services.state_version_service import StateVersionService
+from deployer.services.trash_service import TrashService
+from deployer.utils.conditional import add_validators, not_modified
 
 system_bp = Blueprint('system', __name__)
 
+# Log lines per running project in the overview (the buffers keep 50 per replica)
+OVERVIEW_LOG_LINES = 20
+MAX_OVERVIEW_LOG_LINES = 50
+
 
 @system_bp.route('/stats', methods=['GET'])
 def get_system_stats():
@@ -20,6 +35,74 @@ def get_system_stats():
         return jsonify({'error': str(e)}), 500
 
 
+@system_bp.route('/overview', methods=['GET'])
+def get_overview():
+    """
+    Dashboard snapshot in one response (supports conditional GET).
+    
+    Projects with their status, project and job counts, the last log lines
+    of each running project (``?logs=N``) and system stats, all read from
+    in-memory state.
+    """
+    try:
+        log_lines = request.args.get('logs', OVERVIEW_LOG_LINES, type=int)
+        log_lines = max(0, min(log_lines, MAX_OVERVIEW_LOG_LINES))
+        
+        project_service = ProjectService.get_instance()
+        process_service = ProcessService.get_instance()
+        git_status_service = GitStatusService.get_instance()
+        job_service = JobService.get_instance()
+        
+        running_projects = set(process_service.get_running_projects())
+        jobs = job_service.get_stats()
+        
+        # Projects, replicas and logs share one change sequence: its highest
+        # number covers them all. Job counts are not versioned, they go in as is
+        validators = None
+        if project_service.watcher.running:
+            versions = StateVersionService.get_instance()
+            version = max([versions.global_version()] +
+                          [versions.log_version(name) for name in running_projects])
+            etag = f"{versions.etag(version)}-{log_lines}-{jobs['running']}.{jobs['queued']}"
+            validators = (etag, version[1])
+            cached = not_modified(*validators)
+            if cached is not None:
+                git_status_service.refresh_expired()
+                return cached
+        
+        projects_data = []
+        logs = {}
+        replicas = 0
+        for project in sorted(project_service.get_all_projects(), key=lambda project: project.name):
+            project_dict = project.to_dict()
+            project_dict['running'] = project.name in running_projects
+            project_dict['replicas'] = process_service.get_replica_count(project.name)
+            project_dict['git'] = git_status_service.get_status(project.name, project.project_path)
+            projects_data.append(project_dict)
+            replicas += project_dict['replicas']
+            if project_dict['running'] and log_lines:
+                entries = process_service.get_project_logs(project.name, count=log_lines)[-log_lines:]
+                logs[project.name] = [entry.to_dict() for entry in entries]
+        
+        response = jsonify({
+            'projects': projects_data,
+            'counts': {
+                'projects': len(projects_data),
+                'running': len(running_projects),
+                'replicas': replicas,
+                'jobs_running': jobs['running'],
+                'jobs_queued': jobs['queued']
+            },
+            'logs': logs,
+            'stats': process_service.get_system_stats(),
+            'jobs': jobs
+        })
+        return add_validators(response, *validators) if validators else response
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @system_bp.route('/running', methods=['GET'])
 def get_running_projects():
     """Get list of currently running projects."""
@@ -33,6 +116,80 @@ def get_running_projects():
         return jsonify({'error': str(e)}), 500
 
 
+@system_bp.route('/placement', methods=['GET'])
+def get_cpu_placement():
+    """Get the CPU placement map of running projects."""
+    try:
+        process_service = ProcessService.get_instance()
+        return jsonify(process_service.get_placement())
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@system_bp.route('/proxy', methods=['GET'])
+def get_proxy_status():
+    """Get reverse proxy routes, upstream health and traffic counters."""
+    try:
+        return jsonify(ProxyService.get_instance().get_status())
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@system_bp.route('/mirrors', methods=['GET'])
+def get_git_mirrors():
+    """Get the git clone mode and the cached repository mirrors."""
+    try:
+        return jsonify(MirrorService.get_instance().get_status())
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@system_bp.route('/disk', methods=['GET'])
+def get_disk_usage():
+    """Get vault disk usage per project and category, with quota warnings."""
+    try:
+        return jsonify(DiskUsageService.get_instance().get_status())
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@system_bp.route('/trash', methods=['GET'])
+def get_trash():
+    """Get deleted directories still waiting for the background reaper."""
+    try:
+        return jsonify(TrashService.get_instance().get_status())
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@system_bp.route('/environments', methods=['GET'])
+def get_shared_environments():
+    """Get shared environments, the projects using them and their disk usage."""
+    try:
+        return jsonify(EnvironmentService.get_instance().get_status())
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@system_bp.route('/environments/gc', methods=['POST'])
+def collect_shared_environments():
+    """Delete shared environments no project uses (immediately with ?grace=0)."""
+    try:
+        grace = request.args.get('grace', type=float)
+        removed = EnvironmentService.get_instance().collect_garbage(grace)
+        
+        return jsonify({'message': f'Removed {len(removed)} environments', 'removed': removed})
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @system_bp.route('/cleanup', methods=['POST'])
 def cleanup_finished():
     """Clean up finished processes."""
@@ -42,5 +199,15 @@ def cleanup_finished():
         
         return jsonify({'message': 'Cleanup completed successfully'})
     
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@system_bp.route('/resources', methods=['GET'])
+def get_resource_status():
+    """Get resource limit backend status and recent OOM events."""
+    try:
+        return jsonify(ResourceService.get_instance().get_status())
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
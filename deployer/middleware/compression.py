@@ -0,0 +1,65 @@
+"""Gzip compression of large JSON API responses."""
+
+import gzip
+from typing import Optional
+
+from flask import Flask, Response, request
+
+
+class CompressionMiddleware:
+    """
+    Gzips JSON responses of at least API_GZIP_MIN_SIZE bytes for clients
+    that accept it (0 disables it, e.g. behind a proxy that compresses).
+
+    Streamed and file responses are left alone. A compressed response keeps
+    its ETag as a weak one: the bytes differ from the identity encoding,
+    but the conditional GET helpers compare ETags weakly.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.min_size = 0
+        self.level = 6
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize middleware with Flask app.
+
+        Args:
+            app: Flask application instance
+        """
+        self.min_size = app.config.get('API_GZIP_MIN_SIZE', 0)
+        self.level = min(max(app.config.get('API_GZIP_LEVEL', 6), 1), 9)
+        if self.min_size > 0:
+            app.after_request(self.after_request)
+
+    def after_request(self, response: Response) -> Response:
+        """Compress the response if it is JSON, large enough and accepted."""
+        if (response.direct_passthrough or response.is_streamed
+                or response.mimetype != 'application/json'
+                or response.status_code in (204, 206, 304)
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        # The encoding depends on the request header from here on
+        response.vary.add('Accept-Encoding')
+        if not request.accept_encodings['gzip'] or response.calculate_content_length() < self.min_size:
+            return response
+
+        response.set_data(gzip.compress(response.get_data(), self.level, mtime=0))
+        response.headers['Content-Encoding'] = 'gzip'
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def setup_compression(app: Flask) -> None:
+    """
+    Setup response compression for Flask app.
+
+    Args:
+        app: Flask application instance
+    """
+    app._compression = CompressionMiddleware(app)
@@ -0,0 +1,304 @@
+"""Rate limit state stores: process memory, a shared-memory table or SQLite."""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+STORE_KINDS = ('memory', 'shm', 'sqlite')
+
+# Limits per policy a shared store can hold (one theoretical arrival time each)
+MAX_LIMITS = 4
+
+Limits = List[Tuple[int, float]]
+
+
+def gcra_update(limits: Limits, tats: List[float], now: float) -> Tuple[bool, List[float], float]:
+    """
+    Apply one request to GCRA state.
+
+    Args:
+        limits: (requests, period seconds) pairs of the policy
+        tats: Theoretical arrival time per limit
+        now: Time of the request, on the store's clock
+
+    Returns:
+        (allowed, theoretical arrival times afterwards, seconds until allowed)
+    """
+    # Too early if the request would arrive before its burst allowance
+    retry_after = 0.0
+    for (count, period), tat in zip(limits, tats):
+        interval = period / count
+        retry_after = max(retry_after, max(tat, now) - now - (period - interval))
+    if retry_after > 0:
+        return False, tats, retry_after
+    return True, [max(tat, now) + period / count for (count, period), tat in zip(limits, tats)], 0.0
+
+
+class MemoryStore:
+    """Per-process state in an LRU bounded by max_keys (one worker only)."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._state: 'OrderedDict[str, List[float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now() -> float:
+        """Clock of the stored times."""
+        return time.monotonic()
+
+    def update(self, key: str, limits: Limits, now: float) -> Tuple[bool, List[float], float]:
+        """Atomically apply one request to a key's state."""
+        with self._lock:
+            tats = self._state.get(key)
+            if tats is None:
+                tats = [now] * len(limits)
+            allowed, tats, retry_after = gcra_update(limits, tats, now)
+            self._state[key] = tats
+            self._state.move_to_end(key)
+            if len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+        return allowed, tats, retry_after
+
+    def peek(self, key: str, size: int) -> Optional[List[float]]:
+        """State of a key, None if unknown."""
+        with self._lock:
+            tats = self._state.get(key)
+            return list(tats) if tats is not None else None
+
+    def cleanup(self, now: float) -> None:
+        """Forget keys whose buckets are full again (their state equals a new key's)."""
+        with self._lock:
+            for key in [key for key, tats in self._state.items() if all(tat <= now for tat in tats)]:
+                del self._state[key]
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+
+class SharedMemoryStore:
+    """
+    Fixed-size table in a memory-mapped file shared by every process of the host.
+
+    Keys are hashed to 64 bits and placed in 8-way buckets; a full bucket
+    reuses its least recently seen slot. A bucket is locked with an fcntl
+    byte-range lock (between processes) under a process-wide mutex (fcntl
+    locks do not exclude threads of the same process).
+    """
+
+    MAGIC = b'DPRL'
+    VERSION = 1
+    WAYS = 8
+    HEADER = struct.Struct('<4sII')
+    # key hash, last seen, theoretical arrival times
+    SLOT = struct.Struct(f'<Qd{MAX_LIMITS}d')
+
+    def __init__(self, path: Path, max_keys: int):
+        self.path = Path(path)
+        self.buckets = max(-(-max_keys // self.WAYS), 1)
+        self.bucket_size = self.SLOT.size * self.WAYS
+        self.size = self.HEADER.size + self.buckets * self.bucket_size
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, self.HEADER.size, 0)
+            expected = self.HEADER.pack(self.MAGIC, self.VERSION, self.buckets)
+            if header != expected or os.fstat(self._fd).st_size != self.size:
+                # New file or another geometry: start from an empty table
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, self.size)
+                os.pwrite(self._fd, expected, 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, self.size)
+
+    @staticmethod
+    def now() -> float:
+        """Clock of the stored times (wall clock: shared by processes and restarts)."""
+        return time.time()
+
+    def update(self, key: str, limits: Limits, now: float) -> Tuple[bool, List[float], float]:
+        """Atomically apply one request to a key's state."""
+        if len(limits) > MAX_LIMITS:
+            raise ValueError(f"A shared rate limit policy holds at most {MAX_LIMITS} limits")
+        key_hash = self._hash(key)
+        base = self._bucket_offset(key_hash)
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, self.bucket_size, base)
+            try:
+                offset, tats = self._find(base, key_hash, len(limits))
+                if tats is None:
+                    tats = [now] * len(limits)
+                allowed, tats, retry_after = gcra_update(limits, tats, now)
+                padded = tats + [0.0] * (MAX_LIMITS - len(tats))
+                self.SLOT.pack_into(self._map, offset, key_hash, now, *padded)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, self.bucket_size, base)
+        return allowed, tats, retry_after
+
+    def peek(self, key: str, size: int) -> Optional[List[float]]:
+        """State of a key, None if unknown."""
+        key_hash = self._hash(key)
+        base = self._bucket_offset(key_hash)
+        for way in range(self.WAYS):
+            slot_key, _seen, *tats = self.SLOT.unpack_from(self._map, base + way * self.SLOT.size)
+            if slot_key == key_hash:
+                return tats[:size]
+        return None
+
+    def cleanup(self, now: float) -> None:
+        """Nothing to do: slots are reused in place."""
+
+    def __len__(self) -> int:
+        return sum(1 for offset in range(self.HEADER.size, self.size, self.SLOT.size)
+                   if self.SLOT.unpack_from(self._map, offset)[0])
+
+    def _find(self, base: int, key_hash: int, size: int) -> Tuple[int, Optional[List[float]]]:
+        """Slot of a key in its bucket, or the slot to reuse for it (caller holds the lock)."""
+        victim, victim_seen = base, None
+        for way in range(self.WAYS):
+            offset = base + way * self.SLOT.size
+            slot_key, seen, *tats = self.SLOT.unpack_from(self._map, offset)
+            if slot_key == key_hash:
+                return offset, tats[:size]
+            if slot_key == 0:
+                seen = float('-inf')
+            if victim_seen is None or seen < victim_seen:
+                victim, victim_seen = offset, seen
+        return victim, None
+
+    def _bucket_offset(self, key_hash: int) -> int:
+        """File offset of the bucket a key hash belongs to."""
+        return self.HEADER.size + (key_hash % self.buckets) * self.bucket_size
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        """Non-zero 64-bit hash of a key (zero marks an empty slot)."""
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+
+
+class SQLiteStore:
+    """
+    SQLite table shared by every process of the host.
+
+    Each request is one IMMEDIATE transaction (read, compute, upsert), so
+    concurrent workers serialize on the database write lock. The database
+    runs in WAL mode without fsync: losing recent rate limit state is harmless.
+    """
+
+    CLEANUP_EVERY = 1024
+
+    def __init__(self, path: Path, max_keys: int):
+        self.path = Path(path)
+        self.max_keys = max_keys
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._updates = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        columns = ', '.join(f't{i} REAL' for i in range(MAX_LIMITS))
+        connection = self._connection()
+        connection.execute(f'CREATE TABLE IF NOT EXISTS rate_limits '
+                           f'(key TEXT PRIMARY KEY, seen REAL NOT NULL, {columns})')
+        connection.execute('CREATE INDEX IF NOT EXISTS rate_limits_seen ON rate_limits (seen)')
+
+    @staticmethod
+    def now() -> float:
+        """Clock of the stored times (wall clock: shared by processes and restarts)."""
+        return time.time()
+
+    def update(self, key: str, limits: Limits, now: float) -> Tuple[bool, List[float], float]:
+        """Atomically apply one request to a key's state."""
+        if len(limits) > MAX_LIMITS:
+            raise ValueError(f"A shared rate limit policy holds at most {MAX_LIMITS} limits")
+        connection = self._connection()
+        columns = [f't{i}' for i in range(len(limits))]
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(f"SELECT {', '.join(columns)} FROM rate_limits WHERE key = ?",
+                                     (key,)).fetchone()
+            tats = [now if tat is None else tat for tat in row] if row else [now] * len(limits)
+            allowed, tats, retry_after = gcra_update(limits, tats, now)
+            if allowed or row is None:
+                connection.execute(
+                    f"INSERT INTO rate_limits (key, seen, {', '.join(columns)}) "
+                    f"VALUES (?, ?, {', '.join('?' for _ in columns)}) "
+                    f"ON CONFLICT(key) DO UPDATE SET seen = excluded.seen, "
+                    f"{', '.join(f'{c} = excluded.{c}' for c in columns)}",
+                    (key, now, *tats)
+                )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+        self._updates += 1
+        if self._updates % self.CLEANUP_EVERY == 0:
+            self.cleanup(now)
+        return allowed, tats, retry_after
+
+    def peek(self, key: str, size: int) -> Optional[List[float]]:
+        """State of a key, None if unknown."""
+        columns = ', '.join(f't{i}' for i in range(size))
+        row = self._connection().execute(f'SELECT {columns} FROM rate_limits WHERE key = ?',
+                                         (key,)).fetchone()
+        return list(row) if row else None
+
+    def cleanup(self, now: float) -> None:
+        """Delete full buckets, then the least recently seen keys beyond max_keys."""
+        connection = self._connection()
+        idle = ' AND '.join(f'(t{i} IS NULL OR t{i} <= ?)' for i in range(MAX_LIMITS))
+        connection.execute(f'DELETE FROM rate_limits WHERE {idle}', (now,) * MAX_LIMITS)
+        connection.execute(
+            'DELETE FROM rate_limits WHERE key IN (SELECT key FROM rate_limits ORDER BY seen '
+            'LIMIT max((SELECT count(*) FROM rate_limits) - ?, 0))', (self.max_keys,)
+        )
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT count(*) FROM rate_limits').fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the calling thread."""
+        if self._pid != os.getpid():
+            # Forked (Gunicorn worker): never reuse the parent's connections
+            self._local, self._pid = threading.local(), os.getpid()
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            self._local.connection = connection
+        return connection
+
+
+def create_store(kind: str, path: Optional[Path], max_keys: int):
+    """
+    Create a rate limit store.
+
+    Args:
+        kind: memory, shm or sqlite
+        path: File of the shm and sqlite stores
+        max_keys: Keys kept before the least recently used are forgotten
+
+    Raises:
+        ValueError: If the kind is unknown or a shared store has no path
+    """
+    if kind not in STORE_KINDS:
+        raise ValueError(f"RATE_LIMIT_STORE must be one of: {', '.join(STORE_KINDS)}")
+    if kind == 'memory':
+        return MemoryStore(max_keys)
+    if not path:
+        raise ValueError(f"The {kind} rate limit store needs RATE_LIMIT_STORE_PATH")
+    if kind == 'shm':
+        return SharedMemoryStore(Path(path), max_keys)
+    return SQLiteStore(Path(path), max_keys)
@@ -1,17 +1,81 @@
 """Rate limiting middleware for API protection."""
 
+import math
+import re
 import time
-from collections import defaultdict, deque
-from typing import Dict, Optional, Tuple
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from flask import Flask, request, jsonify, current_app, g
 
+from .rate_limit_store import MemoryStore, create_store
+
 # Auth removed - using IP-based rate limiting only
 
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Route groups, first match wins: (group, methods or None for any, path pattern)
+ROUTE_GROUPS: List[Tuple[str, Optional[frozenset], 're.Pattern']] = [
+    # Clone, start and the jobs that build environments are the expensive calls
+    ('heavy', frozenset({'POST'}), re.compile(r'^/api/projects/?$')),
+    ('heavy', frozenset({'POST'}),
+     re.compile(r'^/api/projects/[^/]+/(start|restart|scale|install|venv|update|prepare)$')),
+    ('write', frozenset({'POST', 'PUT', 'PATCH', 'DELETE'}), re.compile(r'^/api/')),
+    ('read', None, re.compile(r'^/api/')),
+]
+
+# Default files of the shared stores, in STORAGE_PATH
+SHARED_STORE_FILES = {'shm': 'rate_limits.shm', 'sqlite': 'rate_limits.db'}
+
+DEFAULT_POLICIES = {
+    'read': '300/minute',
+    'write': '60/minute',
+    'heavy': '10/minute,100/hour',
+}
+
+
+def parse_limits(spec: str) -> List[Tuple[int, float]]:
+    """
+    Parse a policy such as ``10/minute,100/hour``.
+    
+    Returns:
+        (requests, period in seconds) pairs
+    
+    Raises:
+        ValueError: If the policy is malformed
+    """
+    limits = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        count, _, unit = part.partition('/')
+        unit = unit.strip().lower().rstrip('s')
+        if unit not in PERIODS or not count.strip().isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid rate limit: {part!r} (expected e.g. 60/minute)")
+        limits.append((int(count), float(PERIODS[unit])))
+    return limits
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of one rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
 
 class RateLimitMiddleware:
     """
     Rate limiting middleware to protect against abuse.
-    Uses in-memory storage for simplicity (use Redis in production).
+    
+    Uses GCRA (the generic cell rate algorithm, a token bucket stored as a
+    single timestamp): each client and route group keeps one "theoretical
+    arrival time" per limit, so memory does not grow with the request rate.
+    The state lives in a store chosen by RATE_LIMIT_STORE: process memory,
+    or a shared-memory table or SQLite database that every worker of the
+    host updates atomically, so they enforce one limit together. Every store
+    keeps at most about RATE_LIMIT_MAX_KEYS client keys.
     """
     
     def __init__(self, app: Optional[Flask] = None):
@@ -23,15 +87,15 @@ class RateLimitMiddleware:
         """
         self.app = app
         
-        # In-memory storage for rate limiting
-        # Structure: {key: deque([timestamp1, timestamp2, ...])}
-        self._requests: Dict[str, deque] = defaultdict(lambda: deque())
-        
-        # Default rate limits (can be overridden in config)
-        self.default_limits = {
-            'per_minute': 60,
-            'per_hour': 1000
+        # Policies per route group: [(requests, period seconds), ...]
+        self.policies: Dict[str, List[Tuple[int, float]]] = {
+            group: parse_limits(spec) for group, spec in DEFAULT_POLICIES.items()
         }
+        self.max_keys = 10000
+        self.enabled = True
+        
+        # "group:client key" -> theoretical arrival time per limit
+        self.store = MemoryStore(self.max_keys)
         
         if app is not None:
             self.init_app(app)
@@ -43,11 +107,21 @@ class RateLimitMiddleware:
         Args:
             app: Flask application instance
         """
-        # Update limits from config
-        config_limits = app.config.get('RATE_LIMITS', {})
-        self.default_limits.update(config_limits)
+        # Update policies from config
+        for group in DEFAULT_POLICIES:
+            spec = app.config.get(f'RATE_LIMIT_{group.upper()}')
+            if spec:
+                self.policies[group] = parse_limits(spec)
+        self.max_keys = max(app.config.get('RATE_LIMIT_MAX_KEYS', self.max_keys), 1)
+        self.enabled = not app.config.get('DISABLE_RATE_LIMITING', False)
+        kind = app.config.get('RATE_LIMIT_STORE', 'memory')
+        path = app.config.get('RATE_LIMIT_STORE_PATH')
+        if not path and kind in SHARED_STORE_FILES and app.config.get('STORAGE_PATH'):
+            path = Path(app.config['STORAGE_PATH']) / SHARED_STORE_FILES[kind]
+        self.store = create_store(kind, path, self.max_keys)
         
         app.before_request(self.before_request)
+        app.after_request(self.after_request)
     
     def before_request(self) -> Optional[tuple]:
         """
@@ -60,23 +134,73 @@ class RateLimitMiddleware:
         if self._should_skip_rate_limiting():
             return None
         
-        # Get client identifier
-        client_key = self._get_client_key()
+        group = self.route_group(request.method, request.path)
+        if group is None:
+            return None
         
-        # Check different rate limits
-        rate_limit_checks = [
-            self._check_per_minute_limit(client_key),
-            self._check_per_hour_limit(client_key)
-        ]
+        result = self.consume(self._get_client_key(), group)
+        g.rate_limit = result
+        if result.allowed:
+            return None
         
-        for check_result in rate_limit_checks:
-            if check_result is not None:
-                return check_result
+        retry_after = max(int(math.ceil(result.retry_after)), 1)
+        response = jsonify({
+            'error': 'Rate limit exceeded',
+            'message': f'Too many {group} requests. Limit: {result.limit}',
+            'retry_after': retry_after
+        })
+        response.headers['Retry-After'] = str(retry_after)
+        return response, 429
+    
+    def after_request(self, response):
+        """Add the rate limit headers of the request's route group."""
+        result = g.get('rate_limit')
+        if result is not None:
+            headers = response.headers
+            headers.add('X-RateLimit-Limit', str(result.limit))
+            headers.add('X-RateLimit-Remaining', str(result.remaining))
+            headers.add('X-RateLimit-Reset', str(int(time.time() + result.reset_after)))
+        return response
+    
+    @staticmethod
+    def route_group(method: str, path: str) -> Optional[str]:
+        """Route group of a request, None if it is not rate limited."""
+        for group, methods, pattern in ROUTE_GROUPS:
+            if (methods is None or method in methods) and pattern.match(path):
+                return group
+        return None
+    
+    def consume(self, client_key: str, group: str, now: Optional[float] = None) -> RateLimitResult:
+        """
+        Count one request of a client against a route group's policy.
         
-        # Record this request
-        self._record_request(client_key)
+        A request is accepted only if every limit of the policy accepts it,
+        and only accepted requests are counted.
         
-        return None
+        Args:
+            client_key: Client identifier
+            group: Route group
+            now: Time of the request on the store's clock (defaults to now)
+        
+        Returns:
+            Whether the request is allowed, with the most restrictive limit's
+            remaining requests and times
+        """
+        limits = self.policies[group]
+        if now is None:
+            now = self.store.now()
+        allowed, tats, retry_after = self.store.update(f"{group}:{client_key}", limits, now)
+        
+        # Report the limit with the fewest requests left
+        best = None
+        for (count, period), tat in zip(limits, tats):
+            interval = period / count
+            backlog = max(tat - now, 0.0)
+            remaining = max(int((period - backlog) / interval + 1e-9), 0)
+            if best is None or remaining < best[1]:
+                best = (count, remaining, backlog)
+        
+        return RateLimitResult(allowed, best[0], best[1], best[2], max(retry_after, 0.0))
     
     def _get_client_key(self) -> str:
         """
@@ -90,18 +214,14 @@ class RateLimitMiddleware:
         return f"ip_{client_ip}"
     
     def _get_client_ip(self) -> str:
-        """Get client IP address."""
-        # Check for forwarded IP first
-        forwarded_for = request.headers.get('X-Forwarded-For')
-        if forwarded_for:
-            return forwarded_for.split(',')[0].strip()
-        
-        # Check other common headers
-        real_ip = request.headers.get('X-Real-IP')
-        if real_ip:
-            return real_ip
+        """
+        Get client IP address.
         
-        return request.remote_addr or 'unknown'
+        The peer address of the connection: forwarded headers are set by the
+        client and are only honored through ProxyFix, for TRUSTED_PROXIES hops.
+        """
+        # Read the WSGI environ directly: Headers.get scans the whole environ
+        return request.environ.get('REMOTE_ADDR') or 'unknown'
     
     def _should_skip_rate_limiting(self) -> bool:
         """
@@ -110,6 +230,10 @@ class RateLimitMiddleware:
         Returns:
             True if rate limiting should be skipped
         """
+        # Skip if disabled in config
+        if not self.enabled:
+            return True
+        
         # Skip for static files
         if request.endpoint == 'static':
             return True
@@ -118,127 +242,13 @@ class RateLimitMiddleware:
         if request.path in ['/health', '/ping', '/status']:
             return True
         
-        # Skip if disabled in config
-        if current_app.config.get('DISABLE_RATE_LIMITING', False):
-            return True
-        
         return False
     
-    def _check_per_minute_limit(self, client_key: str) -> Optional[tuple]:
-        """
-        Check per-minute rate limit.
-        
-        Args:
-            client_key: Client identifier
-            
-        Returns:
-            Error response if limit exceeded
-        """
-        now = time.time()
-        minute_ago = now - 60
-        
-        limit = self.default_limits['per_minute']
-        
-        key = f"{client_key}_minute"
-        return self._check_limit(key, minute_ago, limit, "minute")
-    
-    def _check_per_hour_limit(self, client_key: str) -> Optional[tuple]:
-        """
-        Check per-hour rate limit.
-        
-        Args:
-            client_key: Client identifier
-            
-        Returns:
-            Error response if limit exceeded
-        """
-        now = time.time()
-        hour_ago = now - 3600
-        
-        limit = self.default_limits['per_hour']
-        key = f"{client_key}_hour"
-        return self._check_limit(key, hour_ago, limit, "hour")
-    
-    
-    def _check_limit(
-        self, 
-        key: str, 
-        window_start: float, 
-        limit: int, 
-        window_name: str,
-        endpoint_type: str = "general"
-    ) -> Optional[tuple]:
-        """
-        Check if request count exceeds limit for given window.
-        
-        Args:
-            key: Storage key
-            window_start: Start of time window
-            limit: Maximum requests allowed
-            window_name: Name of time window (for error message)
-            endpoint_type: Type of endpoint (for error message)
-            
-        Returns:
-            Error response if limit exceeded
-        """
-        requests_queue = self._requests[key]
-        
-        # Remove old requests outside the window
-        while requests_queue and requests_queue[0] < window_start:
-            requests_queue.popleft()
-        
-        # Check if limit exceeded
-        if len(requests_queue) >= limit:
-            retry_after = int(requests_queue[0] - window_start + 1)
-            
-            response = jsonify({
-                'error': 'Rate limit exceeded',
-                'message': f'Too many {endpoint_type} requests. Limit: {limit} per {window_name}',
-                'retry_after': retry_after
-            })
-            response.status_code = 429
-            response.headers['Retry-After'] = str(retry_after)
-            response.headers['X-RateLimit-Limit'] = str(limit)
-            response.headers['X-RateLimit-Remaining'] = '0'
-            response.headers['X-RateLimit-Reset'] = str(int(requests_queue[0] + (60 if window_name == 'minute' else 3600)))
-            
-            return response, 429
-        
-        return None
-    
-    def _record_request(self, client_key: str) -> None:
-        """
-        Record current request timestamp.
-        
-        Args:
-            client_key: Client identifier
-        """
-        now = time.time()
-        
-        # Record for different time windows
-        self._requests[f"{client_key}_minute"].append(now)
-        self._requests[f"{client_key}_hour"].append(now)
-    
     def cleanup_old_requests(self) -> None:
-        """Clean up old request records to free memory."""
-        now = time.time()
-        hour_ago = now - 3600
-        
-        keys_to_remove = []
-        
-        for key, requests_queue in self._requests.items():
-            # Remove old requests
-            while requests_queue and requests_queue[0] < hour_ago:
-                requests_queue.popleft()
-            
-            # Remove empty queues
-            if not requests_queue:
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del self._requests[key]
+        """Forget clients whose buckets are full again (their state equals a new client's)."""
+        self.store.cleanup(self.store.now())
     
-    def get_client_stats(self, client_key: str) -> Dict[str, int]:
+    def get_client_stats(self, client_key: str) -> Dict[str, Dict]:
         """
         Get rate limiting stats for a client.
         
@@ -246,24 +256,17 @@ class RateLimitMiddleware:
             client_key: Client identifier
             
         Returns:
-            Dictionary with current request counts
+            Remaining requests per route group and limit
         """
-        now = time.time()
-        minute_ago = now - 60
-        hour_ago = now - 3600
-        
-        # Count requests in different windows
-        minute_requests = sum(1 for t in self._requests[f"{client_key}_minute"] if t > minute_ago)
-        hour_requests = sum(1 for t in self._requests[f"{client_key}_hour"] if t > hour_ago)
-        
-        return {
-            'requests_last_minute': minute_requests,
-            'requests_last_hour': hour_requests,
-            'limits': {
-                'per_minute': self.default_limits['per_minute'],
-                'per_hour': self.default_limits['per_hour']
+        now = self.store.now()
+        stats = {}
+        for group, limits in self.policies.items():
+            tats = self.store.peek(f"{group}:{client_key}", len(limits)) or [now] * len(limits)
+            stats[group] = {
+                f"{count}/{int(period)}s": max(int((period - max(tat - now, 0.0)) / (period / count) + 1e-9), 0)
+                for (count, period), tat in zip(limits, tats)
             }
-        }
+        return {'remaining': stats, 'tracked_clients': len(self.store)}
 
 
 def setup_rate_limiting(app: Flask) -> None:
@@ -277,21 +280,6 @@ def setup_rate_limiting(app: Flask) -> None:
     
     # Store reference in app for access
     app._rate_limiter = rate_limiter
-    
-    # Set up periodic cleanup
-    import threading
-    import time
-    
-    def cleanup_worker():
-        while True:
-            time.sleep(300)  # Clean up every 5 minutes
-            try:
-                rate_limiter.cleanup_old_requests()
-            except Exception as e:
-                app.logger.error(f"Rate limiter cleanup error: {e}")
-    
-    cleanup_thread = threading.Thread(target=cleanup_worker, daemon=True)
-    cleanup_thread.start()
 
 
 def get_rate_limiter() -> Optional[RateLimitMiddleware]:
@@ -301,4 +289,4 @@ def get_rate_limiter() -> Optional[RateLimitMiddleware]:
     Returns:
         RateLimitMiddleware instance or None
     """
-    return getattr(current_app, '_rate_limiter', None)
\ No newline at end of file
+    return getattr(current_app, '_rate_limiter', None)
@@ -4,7 +4,7 @@ import os
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from dataclasses import dataclass, asdict
 
 
@@ -12,6 +12,9 @@ from dataclasses import dataclass, asdict
 class Project:
     """Project model using JSON storage."""
     
+    # Properties computed from the filesystem on every access
+    COMPUTED_FIELDS = ('is_git', 'has_init', 'has_venv', 'has_requirements')
+    
     name: str
     path: str
     github_url: Optional[str] = None
@@ -89,16 +92,23 @@ class Project:
         
         return None
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert project to dictionary."""
-        data = asdict(self)
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Convert project to dictionary.
+        
+        Args:
+            fields: Fields to include, all of them if None; computed properties
+                are only evaluated when included
+        """
+        if fields is None:
+            data = asdict(self)
+            computed = self.COMPUTED_FIELDS
+        else:
+            fields = set(fields)
+            data = {name: getattr(self, name) for name in self.__dataclass_fields__ if name in fields}
+            computed = [name for name in self.COMPUTED_FIELDS if name in fields]
         # Add computed properties
-        data.update({
-            'is_git': self.is_git,
-            'has_init': self.has_init,
-            'has_venv': self.has_venv,
-            'has_requirements': self.has_requirements
-        })
+        data.update({name: getattr(self, name) for name in computed})
         return data
     
     @classmethod
@@ -129,6 +139,7 @@ class LogEntry:
     level: str
     source: str = 'system'
     project_name: Optional[str] = None
+    replica: Optional[int] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert log entry to dictionary."""
@@ -141,7 +152,7 @@ class LogEntry:
     
     @classmethod
     def create(cls, message: str, level: str = 'INFO', source: str = 'system',
-               project_name: Optional[str] = None) -> 'LogEntry':
+               project_name: Optional[str] = None, replica: Optional[int] = None) -> 'LogEntry':
         """Create a new log entry with auto-generated ID and timestamp."""
         timestamp = datetime.now().isoformat()
         log_id = f"{project_name or 'system'}_{int(datetime.now().timestamp() * 1000)}"
@@ -152,5 +163,6 @@ class LogEntry:
             message=message,
             level=level.upper(),
             source=source,
-            project_name=project_name
+            project_name=project_name,
+            replica=replica
         )
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""Production server: Gunicorn threaded worker serving Flask and Socket.IO."""
+
+import logging
+from typing import Dict, Any
+
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+
+class ServerError(Exception):
+    """Production server specific error."""
+    pass
+
+
+def run_production(app: Flask, server_config: Dict[str, Any]) -> None:
+    """
+    Serve the application with Gunicorn instead of the Werkzeug dev server.
+
+    The worker uses the gthread model: keep-alive connections wait in a
+    poller instead of holding a thread, and Socket.IO runs in threading mode
+    with WebSocket support through simple-websocket. Background tasks start
+    in the worker once it has forked, never in the master.
+
+    Args:
+        app: Application created by create_app (background tasks not started)
+        server_config: Result of get_server_config()
+
+    Raises:
+        ServerError: If Gunicorn is missing or the worker count is invalid
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise ServerError("Production mode needs gunicorn: pip install -r requirements.txt")
+
+    workers = server_config['SERVER_WORKERS']
+    if workers != 1:
+        # Project processes, the proxy, the vault watcher and the Socket.IO
+        # rooms live in the worker: a second worker would supervise the same
+        # projects again and miss the other's broadcasts
+        raise ServerError("SERVER_WORKERS must be 1, scale with SERVER_THREADS")
+
+    def post_worker_init(worker):
+        from deployer import start_background_tasks
+        start_background_tasks(app.socketio)
+
+    def worker_exit(server, worker):
+        from deployer.services.process_service import ProcessService
+        try:
+            ProcessService.get_instance().shutdown_all()
+        except Exception as e:
+            print(f"Error stopping projects: {e}")
+
+    options = {
+        'bind': f"{server_config['HOST']}:{server_config['PORT']}",
+        'workers': workers,
+        'worker_class': 'gthread',
+        'threads': server_config['SERVER_THREADS'],
+        'keepalive': server_config['SERVER_KEEPALIVE'],
+        # WebSocket and long-polling requests stay open longer than any timeout
+        'timeout': 0,
+        'graceful_timeout': 30,
+        'accesslog': '-' if server_config['DEBUG'] else None,
+        'post_worker_init': post_worker_init,
+        'worker_exit': worker_exit
+    }
+
+    class DeployerServer(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    logger.info(f"Starting Gunicorn on {options['bind']} "
+                f"({workers} worker, {options['threads']} threads)")
+    DeployerServer().run()
@@ -0,0 +1,218 @@
+"""CPU affinity placement for project processes."""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Any, Callable, Iterable, Set
+
+logger = logging.getLogger(__name__)
+
+PLACEMENT_MODES = ('off', 'weight', 'usage')
+
+
+def parse_cpu_list(value: str) -> Set[int]:
+    """
+    Parse a CPU list such as ``0,2-3``.
+
+    Args:
+        value: CPU list in the kernel's cpuset syntax
+
+    Returns:
+        Set of CPU numbers
+    """
+    cpus = set()
+    for part in str(value).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            cpus.update(range(int(start), int(end) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+def compute_placement(weights: Dict[str, float], cpus: List[int]) -> Dict[str, List[int]]:
+    """
+    Split CPUs between units proportionally to their weight.
+
+    With at least as many CPUs as units, each unit gets a contiguous,
+    exclusive block of at least one CPU. Otherwise units are packed onto
+    the least loaded CPU, heaviest first.
+
+    Args:
+        weights: Weight per unit name
+        cpus: CPUs available for placement
+
+    Returns:
+        CPU list per unit name
+    """
+    if not weights or not cpus:
+        return {}
+
+    names = sorted(weights)
+    total_weight = sum(max(weights[name], 0.0) for name in names) or float(len(names))
+
+    if len(names) > len(cpus):
+        load = {cpu: 0.0 for cpu in cpus}
+        placement = {}
+        for name in sorted(names, key=lambda n: (-weights[n], n)):
+            cpu = min(cpus, key=lambda c: (load[c], c))
+            load[cpu] += max(weights[name], 1e-3)
+            placement[name] = [cpu]
+        return placement
+
+    # Largest remainder apportionment with a floor of one CPU per unit
+    quotas = {name: max(weights[name], 0.0) / total_weight * len(cpus) for name in names}
+    shares = {name: max(1, int(quotas[name])) for name in names}
+    while sum(shares.values()) > len(cpus):
+        name = max((n for n in names if shares[n] > 1), key=lambda n: shares[n] - quotas[n])
+        shares[name] -= 1
+    while sum(shares.values()) < len(cpus):
+        name = max(names, key=lambda n: quotas[n] - shares[n])
+        shares[name] += 1
+
+    placement = {}
+    index = 0
+    for name in names:
+        placement[name] = cpus[index:index + shares[name]]
+        index += shares[name]
+    return placement
+
+
+class CpuPlacer:
+    """Assigns CPU sets to running projects and keeps them balanced."""
+
+    def __init__(self, mode: str = 'weight', reserved: Optional[str] = None,
+                 pin_deployer: bool = False,
+                 weight_getter: Optional[Callable[[str], float]] = None):
+        """
+        Initialize the placer.
+
+        Args:
+            mode: 'weight' (declared weights) or 'usage' (measured CPU usage)
+            reserved: CPU list kept for the deployer, defaults to the first CPU
+            pin_deployer: Also restrict the deployer itself to the reserved CPUs
+            weight_getter: Returns the declared weight for a project
+        """
+        if mode not in PLACEMENT_MODES:
+            raise ValueError(f"Unknown CPU placement mode: {mode}")
+
+        self.mode = mode
+        self.available_cpus = sorted(os.sched_getaffinity(0))
+        reserved_cpus = parse_cpu_list(reserved) if reserved else set(self.available_cpus[:1])
+        self.reserved_cpus = sorted(reserved_cpus & set(self.available_cpus))
+        self.project_cpus = [c for c in self.available_cpus if c not in reserved_cpus]
+        if not self.project_cpus:
+            # Nothing left to hand out (e.g. single CPU host): share everything
+            self.project_cpus = list(self.available_cpus)
+
+        self.placement: Dict[str, List[int]] = {}
+        self.weights: Dict[str, float] = {}
+        self.last_rebalance: Optional[float] = None
+        self._weight_getter = weight_getter or (lambda name: 100.0)
+        self._cpu_samples: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+        if pin_deployer and self.reserved_cpus:
+            self._set_affinity(os.getpid(), self.reserved_cpus)
+
+    def rebalance(self, units: Dict[str, List[int]]) -> Dict[str, List[int]]:
+        """
+        Recompute placement for the running units and apply it.
+
+        Args:
+            units: Root PIDs per unit name
+
+        Returns:
+            New placement map
+        """
+        with self._lock:
+            weights = {name: self._unit_weight(name, pids) for name, pids in units.items()}
+            placement = compute_placement(weights, self.project_cpus)
+
+            for name, pids in units.items():
+                cpus = placement.get(name)
+                if cpus and cpus != self.placement.get(name):
+                    for pid in pids:
+                        self._set_affinity(pid, cpus)
+
+            for name in set(self._cpu_samples) - set(units):
+                del self._cpu_samples[name]
+
+            self.placement = placement
+            self.weights = weights
+            self.last_rebalance = time.time()
+            return dict(placement)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current placement map."""
+        return {
+            'mode': self.mode,
+            'available_cpus': self.available_cpus,
+            'reserved_cpus': self.reserved_cpus,
+            'project_cpus': self.project_cpus,
+            'placement': dict(self.placement),
+            'weights': {name: round(weight, 3) for name, weight in self.weights.items()},
+            'last_rebalance': self.last_rebalance
+        }
+
+    def _unit_weight(self, name: str, pids: List[int]) -> float:
+        """Weight of a unit: declared weight, or measured CPU cores in usage mode."""
+        if self.mode != 'usage':
+            return float(self._weight_getter(name))
+
+        cpu_seconds = sum(self._cpu_seconds(pid) for pid in pids)
+        now = time.time()
+        previous = self._cpu_samples.get(name)
+        self._cpu_samples[name] = (cpu_seconds, now)
+
+        if previous is None or now <= previous[1]:
+            # No measurement yet: assume one busy core
+            return 1.0
+        return max((cpu_seconds - previous[0]) / (now - previous[1]), 0.01)
+
+    @staticmethod
+    def _cpu_seconds(pid: int) -> float:
+        """Read user+system CPU time of a process."""
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                stat = f.read().rsplit(')', 1)[1].split()
+            return (int(stat[11]) + int(stat[12])) / os.sysconf('SC_CLK_TCK')
+        except (OSError, IndexError, ValueError):
+            return 0.0
+
+    @classmethod
+    def _set_affinity(cls, pid: int, cpus: Iterable[int]) -> None:
+        """Set the affinity of every thread of a process and its descendants."""
+        cpus = set(cpus)
+        for tid in cls._iter_tasks(pid):
+            try:
+                os.sched_setaffinity(tid, cpus)
+            except OSError as e:
+                logger.debug(f"Could not set affinity of {tid}: {e}")
+
+    @staticmethod
+    def _iter_tasks(pid: int) -> List[int]:
+        """List thread IDs of a process tree."""
+        tasks = []
+        pending = [pid]
+        seen = set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            try:
+                for tid in os.listdir(f'/proc/{current}/task'):
+                    tasks.append(int(tid))
+                    try:
+                        with open(f'/proc/{current}/task/{tid}/children') as f:
+                            pending.extend(int(child) for child in f.read().split())
+                    except OSError:
+                        pass
+            except OSError:
+                tasks.append(current)
+        return tasks
@@ -0,0 +1,379 @@
+"""Disk usage accounting for the vault, per project and per category."""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Set
+
+from deployer.services.resource_service import ResourceServiceError, parse_size
+from deployer.storage.json_storage import get_log_storage, get_project_storage
+
+logger = logging.getLogger(__name__)
+
+# Categories walked inside a project directory ('logs' is a single file stat)
+WALKED_CATEGORIES = ('code', 'git', 'venv')
+
+VENV_NAMES = frozenset({'venv', '.venv', 'env'})
+
+# Vault entries that are not projects, reported as system usage
+SYSTEM_ENTRIES = {'.mirrors': 'mirrors', '.envs': 'environments', '.trash': 'trash', 'data': 'data'}
+
+# Pause briefly after this many entries so a walk never hogs the disk
+WALK_BATCH = 2000
+
+
+class DiskUsageServiceError(Exception):
+    """Disk usage service specific error."""
+    pass
+
+
+def category_of(entry_name: str) -> str:
+    """Category of a top-level entry of a project directory."""
+    if entry_name == '.git':
+        return 'git'
+    if entry_name in VENV_NAMES:
+        return 'venv'
+    return 'code'
+
+
+def tree_usage(path: str, seen: Optional[Set] = None) -> int:
+    """
+    Bytes allocated on disk by a file or directory tree.
+
+    Uses ``os.scandir`` without following symlinks, counts allocated blocks
+    like ``du`` and counts each hardlinked inode once per ``seen`` set.
+    """
+    seen = set() if seen is None else seen
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return 0
+    total = st.st_blocks * 512
+    if not os.path.isdir(path) or os.path.islink(path):
+        return total
+
+    stack = [path]
+    visited = 0
+    while stack:
+        try:
+            iterator = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with iterator:
+            for entry in iterator:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if st.st_nlink > 1 and not entry.is_dir(follow_symlinks=False):
+                    key = (st.st_dev, st.st_ino)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                total += st.st_blocks * 512
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                visited += 1
+                if visited % WALK_BATCH == 0:
+                    time.sleep(0.001)
+    return total
+
+
+class DiskUsageService:
+    """
+    Keeps disk usage totals without walking the whole vault on every query.
+
+    One full walk runs in a background thread at startup. After that, only
+    the categories touched by Deployer's own operations (clone, install,
+    update, delete) or reported by the vault watcher are walked again, a
+    few seconds after the change. Log usage is a single stat per query.
+    """
+
+    _instance: Optional['DiskUsageService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.vault_path = Path(self._config.get('VAULT_PATH', 'vault'))
+        self.debounce = self._config.get('DISK_USAGE_DEBOUNCE', 5.0)
+        self.rescan_interval = self._config.get('DISK_USAGE_RESCAN_INTERVAL', 3600)
+        try:
+            self.default_quota = parse_size(self._config.get('DISK_QUOTA_PROJECT'))
+            self.vault_quota = parse_size(self._config.get('DISK_QUOTA_VAULT'))
+        except ResourceServiceError as e:
+            raise DiskUsageServiceError(str(e))
+
+        # project -> category -> bytes
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self._system: Dict[str, int] = {}
+        self._scanned_at: Optional[str] = None
+        self._scan_seconds: Optional[float] = None
+        # project (or None for system entries) -> (categories, due time)
+        self._dirty: Dict[Optional[str], List] = {}
+        self._over_quota: Set[str] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the disk usage service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'DiskUsageService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise DiskUsageServiceError("DiskUsageService not initialized")
+        return cls._instance
+
+    def start(self) -> None:
+        """Run the initial walk and the incremental updates in a background thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True, name='disk-usage')
+        self._thread.start()
+
+    def mark_changed(self, project_name: Optional[str],
+                     categories: Optional[List[str]] = None) -> None:
+        """
+        Schedule a re-walk after a change.
+
+        Args:
+            project_name: Changed project, or None for the system entries
+            categories: Changed categories, all walked ones by default
+        """
+        categories = set(categories or WALKED_CATEGORIES) & set(WALKED_CATEGORIES)
+        with self._lock:
+            # Changes within the debounce window share one walk
+            pending, due = self._dirty.get(project_name, (set(), time.monotonic() + self.debounce))
+            self._dirty[project_name] = [pending | categories, due]
+        self._wakeup.set()
+
+    def on_vault_change(self, project_name: Optional[str]) -> None:
+        """Vault watcher listener: a project's top-level entries changed."""
+        if project_name is None:
+            self.mark_all_changed()
+        else:
+            self.mark_changed(project_name)
+
+    def mark_all_changed(self) -> None:
+        """Schedule a full re-walk."""
+        with self._lock:
+            self._dirty.clear()
+            self._dirty['*'] = [set(WALKED_CATEGORIES), time.monotonic()]
+        self._wakeup.set()
+
+    def get_system_usage(self, label: str) -> Optional[int]:
+        """Bytes of one system entry (mirrors, environments, trash, data), None before the first walk."""
+        with self._lock:
+            return self._system.get(label)
+
+    def forget(self, project_name: str) -> None:
+        """Drop a deleted project (its files are now accounted as trash)."""
+        with self._lock:
+            self._usage.pop(project_name, None)
+            self._dirty.pop(project_name, None)
+            self._over_quota.discard(project_name)
+        self.mark_changed(None)
+
+    def get_project_usage(self, project_name: str) -> Dict[str, Any]:
+        """Get a project's usage per category and its quota state."""
+        with self._lock:
+            usage = dict(self._usage.get(project_name, {}))
+            pending = project_name in self._dirty or '*' in self._dirty
+        categories = {category: usage.get(category) for category in WALKED_CATEGORIES}
+        categories['logs'] = self._log_usage(project_name)
+        total = sum(value for value in categories.values() if value)
+        quota = self.get_quota(project_name)
+        return {
+            'project_name': project_name,
+            'total_bytes': total,
+            'categories': categories,
+            'quota_bytes': quota,
+            'over_quota': quota is not None and total > quota,
+            'scanned': bool(usage),
+            'pending': pending
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get vault totals, per-project usage and quota warnings."""
+        with self._lock:
+            projects = list(self._usage)
+            system = dict(self._system)
+        project_usage = [self.get_project_usage(name) for name in sorted(projects)]
+        projects_total = sum(item['total_bytes'] for item in project_usage)
+        total = projects_total + sum(system.values())
+
+        warnings = [f"Project '{item['project_name']}' uses {item['total_bytes']} bytes, "
+                    f"quota is {item['quota_bytes']}" for item in project_usage if item['over_quota']]
+        if self.vault_quota is not None and total > self.vault_quota:
+            warnings.insert(0, f"Vault uses {total} bytes, quota is {self.vault_quota}")
+
+        return {
+            'path': str(self.vault_path),
+            'total_bytes': total,
+            'projects_bytes': projects_total,
+            'system': system,
+            'quota_bytes': self.vault_quota,
+            'default_project_quota_bytes': self.default_quota,
+            'projects': project_usage,
+            'warnings': warnings,
+            'scanned_at': self._scanned_at,
+            'scan_seconds': self._scan_seconds
+        }
+
+    def get_quota(self, project_name: str) -> Optional[int]:
+        """Quota of a project: its own setting, else DISK_QUOTA_PROJECT."""
+        project_data = get_project_storage().get_project(project_name) or {}
+        return project_data.get('disk_quota') or self.default_quota
+
+    def set_quota(self, project_name: str, quota: Any) -> Optional[int]:
+        """
+        Set a project's quota.
+
+        Args:
+            project_name: Name of project
+            quota: Bytes or a size such as ``2G``; None to use the default
+
+        Returns:
+            Stored quota in bytes
+
+        Raises:
+            DiskUsageServiceError: If the size is invalid
+        """
+        try:
+            value = parse_size(quota)
+        except ResourceServiceError as e:
+            raise DiskUsageServiceError(str(e))
+        if value is not None and value <= 0:
+            raise DiskUsageServiceError("quota must be positive")
+
+        get_project_storage().update_project_fields(project_name, disk_quota=value)
+        self._check_quota(project_name)
+        return value
+
+    def _run(self) -> None:
+        """Initial walk, then debounced incremental walks and periodic full rescans."""
+        try:
+            self._lower_priority()
+            self._full_scan()
+        except Exception as e:
+            logger.error(f"Error walking the vault: {e}")
+
+        last_full = time.monotonic()
+        while True:
+            self._wakeup.wait(timeout=1.0)
+            self._wakeup.clear()
+            try:
+                if self.rescan_interval and time.monotonic() - last_full > self.rescan_interval:
+                    self.mark_all_changed()
+                    last_full = time.monotonic()
+                self._process_due()
+            except Exception as e:
+                logger.error(f"Error updating disk usage: {e}")
+
+    def _process_due(self) -> None:
+        """Walk whatever changed and is past its debounce delay."""
+        now = time.monotonic()
+        with self._lock:
+            due = {name: categories for name, (categories, at) in self._dirty.items() if at <= now}
+            for name in due:
+                del self._dirty[name]
+
+        if '*' in due:
+            self._full_scan()
+            return
+        for name, categories in due.items():
+            if name is None:
+                self._scan_system()
+            else:
+                self._scan_project(name, categories)
+
+    def _full_scan(self) -> None:
+        """Walk every project and system entry."""
+        started = time.monotonic()
+        names = []
+        if self.vault_path.exists():
+            for entry in os.scandir(self.vault_path):
+                if entry.is_dir(follow_symlinks=False) and entry.name not in SYSTEM_ENTRIES \
+                        and not entry.name.startswith('.'):
+                    names.append(entry.name)
+        for name in names:
+            self._scan_project(name, set(WALKED_CATEGORIES))
+        with self._lock:
+            for name in set(self._usage) - set(names):
+                del self._usage[name]
+        self._scan_system()
+        self._scan_seconds = round(time.monotonic() - started, 3)
+        self._scanned_at = datetime.now().isoformat()
+        logger.info(f"Disk usage of {len(names)} projects computed in {self._scan_seconds}s")
+
+    def _scan_project(self, project_name: str, categories: Set[str]) -> None:
+        """Walk the given categories of one project."""
+        project_path = self.vault_path / project_name
+        if not project_path.is_dir():
+            with self._lock:
+                self._usage.pop(project_name, None)
+            return
+
+        totals = {category: 0 for category in categories}
+        seen: Set = set()
+        try:
+            entries = list(os.scandir(project_path))
+        except OSError:
+            return
+        for entry in entries:
+            category = category_of(entry.name)
+            if category in totals:
+                totals[category] += tree_usage(entry.path, seen)
+
+        with self._lock:
+            self._usage.setdefault(project_name, {}).update(totals)
+        self._check_quota(project_name)
+
+    def _scan_system(self) -> None:
+        """Walk mirrors, shared environments, trash and data."""
+        system = {}
+        for entry_name, label in SYSTEM_ENTRIES.items():
+            system[label] = tree_usage(str(self.vault_path / entry_name))
+        with self._lock:
+            self._system = system
+
+    def _check_quota(self, project_name: str) -> None:
+        """Log a warning when a project crosses its quota (once per crossing)."""
+        usage = self.get_project_usage(project_name)
+        with self._lock:
+            was_over = project_name in self._over_quota
+            if usage['over_quota']:
+                self._over_quota.add(project_name)
+            else:
+                self._over_quota.discard(project_name)
+        if usage['over_quota'] and not was_over:
+            message = (f"Disk usage {usage['total_bytes']} bytes exceeds the quota of "
+                       f"{usage['quota_bytes']} bytes")
+            logger.warning(f"{project_name}: {message}")
+            get_log_storage().add_log_entry(project_name, message, 'WARNING', 'disk_usage')
+
+    @staticmethod
+    def _log_usage(project_name: str) -> int:
+        """Size of a project's log file and log history."""
+        log_storage = get_log_storage()
+        archived = log_storage.archive.usage(project_name) if log_storage.archive else 0
+        try:
+            return log_storage.get_log_file_path(project_name).stat().st_size + archived
+        except OSError:
+            return archived
+
+    @staticmethod
+    def _lower_priority() -> None:
+        """Run the walker thread at the lowest CPU priority (Linux)."""
+        if hasattr(os, 'setpriority') and hasattr(threading, 'get_native_id'):
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+            except OSError:
+                pass
@@ -0,0 +1,389 @@
+"""Content-addressed virtual environments shared between projects."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from deployer.storage.json_storage import get_project_storage
+from deployer.utils.requirements import requirement_lines, has_local_references
+
+logger = logging.getLogger(__name__)
+
+# off: every project builds its own venv
+# symlink: projects link to the shared environment
+# copy: projects get a hardlinked copy, isolated from later changes
+SHARING_MODES = ('off', 'symlink', 'copy')
+
+ENV_METADATA = 'deployer-env.json'
+
+
+class EnvironmentServiceError(Exception):
+    """Environment service specific error."""
+    pass
+
+
+def normalize_requirements(text: str) -> Optional[str]:
+    """
+    Normalize a requirements file so equivalent files hash the same.
+
+    Args:
+        text: Requirements file contents
+
+    Returns:
+        Sorted normalized lines, or None if the file references local paths
+        or other files and therefore cannot be shared
+    """
+    lines = requirement_lines(text)
+    if has_local_references(lines):
+        return None
+    return '\n'.join(sorted(set(lines))) + '\n' if lines else ''
+
+
+class EnvironmentService:
+    """Builds each distinct dependency set once and attaches it to projects."""
+
+    _instance: Optional['EnvironmentService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.mode = self._config.get('ENV_SHARING', 'symlink')
+        if self.mode not in SHARING_MODES:
+            raise EnvironmentServiceError(f"ENV_SHARING must be one of: {', '.join(SHARING_MODES)}")
+
+        self.store_path = Path(self._config.get('VAULT_PATH', 'vault')) / '.envs'
+        self.cache_path = self.store_path / '.cache'
+        self.base_python = self._config.get('ENV_BASE_PYTHON', 'python3')
+        self.gc_grace = self._config.get('ENV_GC_GRACE', 3600)
+        self.gc_interval = self._config.get('ENV_GC_INTERVAL', 600)
+        self._python_tag: Optional[str] = None
+        self._last_gc = time.time()
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_lock = threading.Lock()
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the environment service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'EnvironmentService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise EnvironmentServiceError("EnvironmentService not initialized")
+        return cls._instance
+
+    @property
+    def enabled(self) -> bool:
+        """Whether environments are shared at all."""
+        return self.mode != 'off'
+
+    def pip_env(self) -> Dict[str, str]:
+        """Environment for pip commands, pointing every install at the shared wheel cache."""
+        env = dict(os.environ)
+        env['PIP_CACHE_DIR'] = str(self.cache_path / 'pip')
+        env['PIP_DISABLE_PIP_VERSION_CHECK'] = '1'
+        return env
+
+    def environment_key(self, requirements_file: Optional[Path]) -> Optional[str]:
+        """
+        Compute the content address of a dependency set.
+
+        Args:
+            requirements_file: Requirements file, or None for an empty environment
+
+        Returns:
+            Hex key, or None if the requirements cannot be shared
+        """
+        text = requirements_file.read_text(errors='replace') if requirements_file else ''
+        normalized = normalize_requirements(text)
+        if normalized is None:
+            return None
+        digest = hashlib.sha256(f"{self.python_tag()}\n{normalized}".encode()).hexdigest()
+        return digest[:20]
+
+    def python_tag(self) -> str:
+        """Identify the base interpreter (path and full version)."""
+        if self._python_tag is None:
+            result = subprocess.run(
+                [self.base_python, '-c', 'import sys; print(sys.executable); print(sys.version)'],
+                capture_output=True, text=True, timeout=30
+            )
+            if result.returncode != 0:
+                raise EnvironmentServiceError(f"Cannot run {self.base_python}: {result.stderr.strip()}")
+            self._python_tag = result.stdout.strip()
+        return self._python_tag
+
+    def can_share(self, requirements_file: Optional[Path]) -> bool:
+        """Whether a project with this requirements file can use a shared environment."""
+        return self.enabled and self.environment_key(requirements_file) is not None
+
+    def is_attached(self, project_name: str) -> bool:
+        """Whether a project currently uses a shared environment."""
+        project_data = get_project_storage().get_project(project_name) or {}
+        return bool(project_data.get('environment'))
+
+    def attach(self, project_name: str, project_path: Path,
+               requirements_file: Optional[Path], job) -> Dict[str, Any]:
+        """
+        Give a project the shared environment matching its requirements.
+
+        The environment is built first if no project used this dependency set
+        before. An existing attachment is swapped atomically.
+
+        Args:
+            project_name: Name of project
+            project_path: Project directory
+            requirements_file: Requirements file, or None
+            job: Job used to run and stream commands
+
+        Returns:
+            Attachment info (key, mode, whether it was built)
+
+        Raises:
+            EnvironmentServiceError: If the requirements cannot be shared
+        """
+        key = self.environment_key(requirements_file)
+        if key is None:
+            raise EnvironmentServiceError("Requirements reference local files and cannot be shared")
+
+        current = (get_project_storage().get_project(project_name) or {}).get('environment') or {}
+        venv_path = project_path / 'venv'
+        if current.get('key') == key and current.get('mode') == self.mode and venv_path.exists():
+            self._touch(self.store_path / key)
+            job.log(f"Shared environment {key} already attached")
+            return dict(current, built=False)
+
+        # Held until the reference is stored: garbage collection cannot delete
+        # the environment between finding it and linking it
+        with self._key_lock(key):
+            env_path, built = self.ensure_environment(key, requirements_file, job)
+
+            staging = project_path / '.venv-attach'
+            self._remove_path(staging)
+            if self.mode == 'symlink':
+                staging.symlink_to(env_path, target_is_directory=True)
+            else:
+                shutil.copytree(env_path, staging, symlinks=True, copy_function=os.link)
+
+            if venv_path.is_symlink() or not venv_path.exists():
+                os.replace(staging, venv_path)
+            else:
+                # Swap a real directory: move the old one aside first
+                old_path = project_path / '.venv-old'
+                self._remove_path(old_path)
+                venv_path.rename(old_path)
+                staging.rename(venv_path)
+                self._remove_path(old_path)
+
+            info = {'key': key, 'mode': self.mode, 'attached_at': datetime.now().isoformat()}
+            get_project_storage().update_project_fields(project_name, environment=info)
+        job.log(f"Attached shared environment {key} ({self.mode}{', built' if built else ', reused'})")
+        return dict(info, built=built)
+
+    def detach(self, project_name: str, project_path: Path) -> None:
+        """Remove a project's link to its shared environment."""
+        venv_path = project_path / 'venv'
+        self._remove_path(venv_path)
+        get_project_storage().update_project_fields(project_name, environment=None)
+
+    def ensure_environment(self, key: str, requirements_file: Optional[Path], job) -> tuple:
+        """
+        Build the environment for a key unless it already exists.
+
+        Returns:
+            Tuple of (environment path, whether it was built now)
+        """
+        env_path = self.store_path / key
+        with self._key_lock(key):
+            if (env_path / ENV_METADATA).exists():
+                # Under the lock, so garbage collection sees the environment in use
+                self._touch(env_path)
+                return env_path, False
+
+            partial = self.store_path / f'.{key}.partial'
+            self._remove_path(partial)
+            self.store_path.mkdir(parents=True, exist_ok=True)
+            started = time.monotonic()
+            try:
+                job.run_command([self.base_python, '-m', 'venv', str(partial)])
+                if requirements_file is not None:
+                    shutil.copyfile(requirements_file, partial / 'requirements.txt')
+                    job.run_command(
+                        [str(partial / 'bin' / 'python'), '-m', 'pip', 'install', '--progress-bar', 'off',
+                         '-r', str(partial / 'requirements.txt')],
+                        env=self.pip_env()
+                    )
+                # Scripts and pyvenv.cfg must name the final location
+                self._relocate(partial, env_path)
+                metadata = {
+                    'key': key,
+                    'python': self.python_tag().splitlines()[-1],
+                    'requirements': (partial / 'requirements.txt').read_text()
+                    if (partial / 'requirements.txt').exists() else '',
+                    'created_at': datetime.now().isoformat(),
+                    'build_seconds': round(time.monotonic() - started, 3)
+                }
+                (partial / ENV_METADATA).write_text(json.dumps(metadata, indent=2))
+                partial.rename(env_path)
+            finally:
+                self._remove_path(partial)
+            return env_path, True
+
+    def get_references(self) -> Dict[str, List[str]]:
+        """Map each environment key to the projects attached to it."""
+        references: Dict[str, List[str]] = {}
+        vault_path = self.store_path.parent
+        for project_name, data in get_project_storage().get_all_projects().items():
+            info = (data or {}).get('environment') or {}
+            if info.get('key') and (vault_path / project_name).exists():
+                references.setdefault(info['key'], []).append(project_name)
+        return references
+
+    def list_environments(self) -> List[Dict[str, Any]]:
+        """List stored environments with their references and disk usage."""
+        references = self.get_references()
+        environments = []
+        for env_path in self._iter_environments():
+            try:
+                metadata = json.loads((env_path / ENV_METADATA).read_text())
+            except (OSError, ValueError):
+                metadata = {}
+            environments.append({
+                'key': env_path.name,
+                'python': metadata.get('python'),
+                'created_at': metadata.get('created_at'),
+                'build_seconds': metadata.get('build_seconds'),
+                'requirements': metadata.get('requirements', '').splitlines(),
+                'projects': references.get(env_path.name, []),
+                'size_bytes': self._disk_usage(env_path),
+                'idle_seconds': round(time.time() - self._last_used(env_path), 1)
+            })
+        return environments
+
+    def collect_garbage(self, grace: Optional[float] = None) -> List[str]:
+        """
+        Delete environments no project references.
+
+        Args:
+            grace: Seconds an environment must have been unused, defaults to ENV_GC_GRACE
+
+        Returns:
+            Keys of deleted environments
+        """
+        grace = self.gc_grace if grace is None else grace
+        references = self.get_references()
+        removed = []
+        for env_path in self._iter_environments():
+            key = env_path.name
+            if references.get(key) or time.time() - self._last_used(env_path) < grace:
+                continue
+            with self._key_lock(key):
+                # Checked again under the lock: an attach may have finished since
+                if (self.get_references().get(key)
+                        or time.time() - self._last_used(env_path) < grace):
+                    continue
+                # Move aside first so a concurrent attach never sees half a tree
+                doomed = self.store_path / f'.{key}.deleting'
+                env_path.rename(doomed)
+                self._remove_path(doomed)
+            removed.append(key)
+            logger.info(f"Removed unused shared environment {key}")
+        self._last_gc = time.time()
+        return removed
+
+    def collect_garbage_if_due(self) -> None:
+        """Run garbage collection every ENV_GC_INTERVAL seconds."""
+        if self.enabled and self.gc_interval and time.time() - self._last_gc >= self.gc_interval:
+            self.collect_garbage()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get sharing mode, store location and stored environments."""
+        environments = self.list_environments()
+        return {
+            'mode': self.mode,
+            'path': str(self.store_path),
+            'gc_grace_seconds': self.gc_grace,
+            'environments': environments,
+            'total_size_bytes': sum(env['size_bytes'] for env in environments),
+            'cache_size_bytes': self._disk_usage(self.cache_path)
+        }
+
+    @staticmethod
+    def _relocate(partial: Path, env_path: Path) -> None:
+        """Rewrite absolute paths of a venv built under a temporary name."""
+        old, new = str(partial), str(env_path)
+        candidates = [partial / 'pyvenv.cfg'] + list((partial / 'bin').iterdir())
+        for path in candidates:
+            if path.is_symlink() or not path.is_file():
+                continue
+            try:
+                content = path.read_bytes()
+            except OSError:
+                continue
+            if old.encode() in content:
+                path.write_bytes(content.replace(old.encode(), new.encode()))
+
+    def _key_lock(self, key: str) -> threading.RLock:
+        """Lock serializing builds, attachments and deletion of one environment."""
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.RLock())
+
+    def _iter_environments(self) -> List[Path]:
+        """List complete environments."""
+        if not self.store_path.exists():
+            return []
+        return sorted(p for p in self.store_path.iterdir()
+                      if not p.name.startswith('.') and (p / ENV_METADATA).exists())
+
+    @staticmethod
+    def _touch(env_path: Path) -> None:
+        """Record that an environment was used."""
+        try:
+            os.utime(env_path / ENV_METADATA)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _last_used(env_path: Path) -> float:
+        """Time an environment was last attached."""
+        try:
+            return (env_path / ENV_METADATA).stat().st_mtime
+        except OSError:
+            return 0.0
+
+    @staticmethod
+    def _remove_path(path: Path) -> None:
+        """Remove a file, symlink or directory tree if present."""
+        if path.is_symlink() or path.is_file():
+            path.unlink()
+        elif path.exists():
+            shutil.rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def _disk_usage(path: Path) -> int:
+        """Bytes used by a directory tree, counting hardlinked files once."""
+        total = 0
+        seen = set()
+        if not path.exists():
+            return 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    stat = os.lstat(os.path.join(root, name))
+                except OSError:
+                    continue
+                if (stat.st_dev, stat.st_ino) in seen:
+                    continue
+                seen.add((stat.st_dev, stat.st_ino))
+                total += stat.st_size
+        return total
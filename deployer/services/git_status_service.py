@@ -0,0 +1,226 @@
+"""Cached per-project git status (HEAD, branch, dirty state, ahead/behind)."""
+
+import logging
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+from deployer.services.state_version_service import StateVersionService
+from deployer.utils.git_refs import git_dir, read_head, ref_files, resolve_ref, upstream_ref
+
+logger = logging.getLogger(__name__)
+
+
+class GitStatusServiceError(Exception):
+    """Git status service specific error."""
+    pass
+
+
+class GitStatusService:
+    """
+    Serves git status without forking git on the request path.
+
+    HEAD, branch and upstream are read from the repository files and cached
+    until one of those files changes. The dirty state and ahead/behind counts
+    need git itself: they are computed in a small background pool and reused
+    for GIT_STATUS_TTL seconds, so a request may see the previous values.
+    A project's state version is bumped whenever a check finds new values.
+    """
+
+    _instance: Optional['GitStatusService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.ttl = self._config.get('GIT_STATUS_TTL', 10)
+        self.pool = ThreadPoolExecutor(
+            max_workers=max(self._config.get('GIT_STATUS_WORKERS', 2), 1),
+            thread_name_prefix='git-status'
+        )
+        # project -> (file stat key, refs the key covers, head info)
+        self._heads: Dict[str, Tuple[Tuple, List[str], Dict[str, Any]]] = {}
+        # project -> last dirty/ahead/behind result
+        self._details: Dict[str, Dict[str, Any]] = {}
+        self._paths: Dict[str, Path] = {}
+        self._pending: set = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the git status service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'GitStatusService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise GitStatusServiceError("GitStatusService not initialized")
+        return cls._instance
+
+    def get_status(self, project_name: str, project_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Get the git status of a project.
+
+        Args:
+            project_name: Name of project
+            project_path: Project working tree
+
+        Returns:
+            Status dict, or None if the project is not a git repository. dirty,
+            ahead and behind are None until the first background check ends.
+        """
+        repo = git_dir(project_path)
+        if repo is None:
+            return None
+
+        head = self._head_info(project_name, repo)
+        key = (head['commit'], head['upstream_commit'], self._mtime(repo / 'index'))
+
+        with self._lock:
+            self._paths[project_name] = Path(project_path)
+            details = self._details.get(project_name)
+            fresh = (details is not None and details['key'] == key
+                     and time.monotonic() - details['checked'] < self.ttl)
+            if not fresh and project_name not in self._pending:
+                self._pending.add(project_name)
+                self.pool.submit(self._refresh, project_name, Path(project_path), head, key)
+
+        details = details or {}
+        return {
+            'branch': head['branch'],
+            'commit': head['commit'],
+            'detached': head['branch'] is None,
+            'upstream': head['upstream'],
+            'dirty': details.get('dirty'),
+            'modified_files': details.get('modified_files'),
+            'ahead': details.get('ahead'),
+            'behind': details.get('behind'),
+            'checked_at': details.get('checked_at'),
+            'stale': not fresh
+        }
+
+    def refresh_expired(self, project_name: Optional[str] = None) -> None:
+        """
+        Re-check projects whose status is older than the TTL, in the background.
+
+        Lets requests answered from a validator alone (304) keep the status
+        moving without reading any file themselves.
+
+        Args:
+            project_name: Only this project, default every known project
+        """
+        now = time.monotonic()
+        with self._lock:
+            names = [project_name] if project_name is not None else list(self._details)
+            for name in names:
+                details = self._details.get(name)
+                if (details is None or name in self._pending or name not in self._paths
+                        or now - details['checked'] < self.ttl):
+                    continue
+                self._pending.add(name)
+                self.pool.submit(self._revalidate, name, self._paths[name])
+
+    def forget(self, project_name: str) -> None:
+        """Drop the cached status of a deleted project."""
+        with self._lock:
+            self._heads.pop(project_name, None)
+            self._details.pop(project_name, None)
+            self._paths.pop(project_name, None)
+
+    def _head_info(self, project_name: str, repo: Path) -> Dict[str, Any]:
+        """HEAD, branch and upstream, re-read only when their files changed."""
+        cached = self._heads.get(project_name)
+        if cached is not None:
+            stat_key, refs, info = cached
+            if self._stat_key(repo, refs) == stat_key:
+                return info
+
+        branch, commit = read_head(repo)
+        upstream = upstream_ref(repo, branch)
+        upstream_name = upstream
+        if upstream and upstream.startswith('refs/remotes/'):
+            upstream_name = upstream[len('refs/remotes/'):]
+        info = {
+            'branch': branch,
+            'commit': commit,
+            'upstream': upstream_name,
+            'upstream_commit': resolve_ref(repo, upstream) if upstream else None
+        }
+        refs = [f'refs/heads/{branch}' if branch else None, upstream]
+        self._heads[project_name] = (self._stat_key(repo, refs), refs, info)
+        return info
+
+    def _revalidate(self, project_name: str, project_path: Path) -> None:
+        """Re-read HEAD and refresh the details of an expired project (pool thread)."""
+        repo = git_dir(project_path)
+        if repo is None:
+            with self._lock:
+                self._pending.discard(project_name)
+            return
+        try:
+            head = self._head_info(project_name, repo)
+        except Exception as e:
+            with self._lock:
+                self._pending.discard(project_name)
+            logger.warning(f"Could not read git HEAD of {project_name}: {e}")
+            return
+        key = (head['commit'], head['upstream_commit'], self._mtime(repo / 'index'))
+        self._refresh(project_name, project_path, head, key)
+
+    def _refresh(self, project_name: str, project_path: Path, head: Dict[str, Any],
+                 key: Tuple) -> None:
+        """Compute dirty state and ahead/behind counts with git (pool thread)."""
+        result: Dict[str, Any] = {'key': key, 'checked': time.monotonic(),
+                                  'checked_at': datetime.now().isoformat()}
+        previous = self._details.get(project_name) or {}
+        try:
+            status = self._git(project_path, 'status', '--porcelain', '--untracked-files=no')
+            modified = [line for line in status.splitlines() if line.strip()]
+            result.update(dirty=bool(modified), modified_files=len(modified))
+
+            if head['upstream_commit'] and head['commit']:
+                counts = self._git(project_path, 'rev-list', '--left-right', '--count',
+                                   f"{head['commit']}...{head['upstream_commit']}")
+                ahead, behind = (int(n) for n in counts.split())
+                result.update(ahead=ahead, behind=behind)
+        except Exception as e:
+            logger.warning(f"Could not compute git status of {project_name}: {e}")
+            result['error'] = str(e)
+        finally:
+            result['signature'] = (head['branch'], head['commit'], head['upstream'],
+                                   result.get('dirty'), result.get('modified_files'),
+                                   result.get('ahead'), result.get('behind'))
+            with self._lock:
+                self._details[project_name] = result
+                self._pending.discard(project_name)
+            if result['signature'] != previous.get('signature'):
+                StateVersionService.get_instance().bump_project(project_name)
+
+    @staticmethod
+    def _git(project_path: Path, *args: str) -> str:
+        """Run a read-only git command without taking optional locks."""
+        env = dict(os.environ, GIT_OPTIONAL_LOCKS='0')
+        completed = subprocess.run(['git'] + list(args), cwd=project_path, env=env,
+                                   capture_output=True, text=True, timeout=30)
+        if completed.returncode != 0:
+            raise GitStatusServiceError(completed.stderr.strip() or f"git {args[0]} failed")
+        return completed.stdout
+
+    @classmethod
+    def _stat_key(cls, repo: Path, refs: List[str]) -> Tuple:
+        """Modification times of the files HEAD and the refs are read from."""
+        return tuple(cls._mtime(path) for path in ref_files(repo, refs))
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        """Modification time in nanoseconds, None if the file is missing."""
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
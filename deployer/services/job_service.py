@@ -0,0 +1,423 @@
+"""Background jobs for long-running project operations (clone, venv, install, update)."""
+
+import logging
+import os
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ('queued', 'running', 'succeeded', 'failed', 'cancelled', 'timed_out')
+FINISHED_STATES = ('succeeded', 'failed', 'cancelled', 'timed_out')
+
+
+class JobServiceError(Exception):
+    """Job service specific error."""
+    pass
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it is cancelled or runs out of time."""
+    pass
+
+
+def parse_kind_settings(value: Any) -> Dict[str, int]:
+    """
+    Parse per-kind settings such as ``clone=2,install=1``.
+
+    Args:
+        value: Comma separated ``kind=number`` pairs
+
+    Returns:
+        Number per job kind
+    """
+    settings = {}
+    for part in str(value or '').split(','):
+        kind, _, number = part.partition('=')
+        if kind.strip() and number.strip():
+            settings[kind.strip()] = int(number)
+    return settings
+
+
+class Job:
+    """A unit of background work attached to a project."""
+
+    def __init__(self, kind: str, project_name: str, target: Callable[['Job'], Any],
+                 timeout: Optional[float] = None, description: str = ''):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.project_name = project_name
+        self.description = description or kind
+        self.timeout = timeout
+        self.status = 'queued'
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.output: deque = deque(maxlen=200)
+        self._target = target
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._cancel_event = threading.Event()
+        self._timed_out = False
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has reached a final state."""
+        return self.status in FINISHED_STATES
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds spent running, up to now for running jobs."""
+        if self._started is None:
+            return None
+        end = self._finished if self._finished is not None else time.monotonic()
+        return round(end - self._started, 3)
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Monotonic time at which the job times out."""
+        if self._started is None or not self.timeout:
+            return None
+        return self._started + self.timeout
+
+    def log(self, message: str, level: str = 'INFO') -> None:
+        """Add a line to the job output and the project's log stream."""
+        self.output.append(message)
+        try:
+            from deployer.services.log_service import LogService
+            LogService.add_log_entry(self.project_name, f"[{self.kind}] {message}", level)
+        except Exception as e:
+            logger.error(f"Error streaming job output for {self.project_name}: {e}")
+
+    def check_cancelled(self) -> None:
+        """
+        Stop the job if it was cancelled or its time is up.
+
+        Raises:
+            JobCancelled: If the job must stop
+        """
+        deadline = self.deadline
+        if deadline is not None and time.monotonic() >= deadline:
+            self._timed_out = True
+            self._cancel_event.set()
+        if self._cancel_event.is_set():
+            raise JobCancelled("timed out" if self._timed_out else "cancelled")
+
+    def run_command(self, command: List[str], cwd: Optional[str] = None,
+                    env: Optional[Dict[str, str]] = None) -> int:
+        """
+        Run a command, streaming its output line by line.
+
+        Args:
+            command: Command and arguments
+            cwd: Working directory
+            env: Environment, defaults to the deployer's
+
+        Returns:
+            Exit code (always 0, failures raise)
+
+        Raises:
+            JobCancelled: If the job is cancelled or times out meanwhile
+            JobServiceError: If the command exits with an error
+        """
+        self.check_cancelled()
+
+        process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            universal_newlines=True,
+            bufsize=1,
+            start_new_session=True
+        )
+        with self._lock:
+            self._process = process
+
+        # Watchdog: enforce the deadline even while the command is silent
+        deadline = self.deadline
+        watchdog = None
+        if deadline is not None:
+            watchdog = threading.Timer(max(deadline - time.monotonic(), 0), self._expire)
+            watchdog.daemon = True
+            watchdog.start()
+
+        try:
+            for line in process.stdout:
+                line = line.rstrip()
+                if line:
+                    self.log(line)
+            returncode = process.wait()
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+            with self._lock:
+                self._process = None
+
+        self.check_cancelled()
+        if returncode != 0:
+            tail = self.output[-1] if self.output else ''
+            raise JobServiceError(f"{os.path.basename(command[0])} exited with code {returncode}: {tail}")
+        return returncode
+
+    def cancel(self) -> None:
+        """Request cancellation, killing the running command if any."""
+        self._cancel_event.set()
+        self._kill_process()
+
+    def _expire(self) -> None:
+        """Timeout handler for the running command."""
+        self._timed_out = True
+        self.cancel()
+
+    def _kill_process(self) -> None:
+        """Terminate the running command and its children."""
+        with self._lock:
+            process = self._process
+        if process is None or process.poll() is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+    def to_dict(self, include_output: bool = False) -> Dict[str, Any]:
+        """Convert job to dictionary."""
+        data = {
+            'id': self.id,
+            'kind': self.kind,
+            'project_name': self.project_name,
+            'description': self.description,
+            'status': self.status,
+            'error': self.error,
+            'result': self.result,
+            'timeout': self.timeout,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'duration': self.duration
+        }
+        if include_output:
+            data['output'] = list(self.output)
+        return data
+
+
+class JobService:
+    """Runs jobs on a bounded set of worker threads with per-kind limits."""
+
+    _instance: Optional['JobService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.max_workers = self._config.get('JOB_WORKERS', 4)
+        self.kind_limits = parse_kind_settings(self._config.get('JOB_CONCURRENCY', 'clone=2,venv=2,install=2,update=2'))
+        self.kind_timeouts = parse_kind_settings(self._config.get('JOB_TIMEOUTS', 'clone=300,venv=300,install=1800,update=1800'))
+        self.default_timeout = self._config.get('JOB_TIMEOUT', 1800)
+        self.retention = self._config.get('JOB_RETENTION', 200)
+        self.jobs: Dict[str, Job] = {}
+        self._pending: deque = deque()
+        self._running: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the job service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'JobService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise JobServiceError("JobService not initialized")
+        return cls._instance
+
+    def submit(self, kind: str, project_name: str, target: Callable[[Job], Any],
+               timeout: Optional[float] = None, description: str = '') -> Job:
+        """
+        Queue a job.
+
+        Jobs of one project run one at a time, in submission order.
+
+        Args:
+            kind: Job kind, used for concurrency limits and timeouts
+            project_name: Project the job works on
+            target: Callable receiving the job, its return value is the job result
+            timeout: Seconds before the job is stopped, defaults to the kind's timeout
+            description: Human readable summary
+
+        Returns:
+            Queued job
+        """
+        if timeout is None:
+            timeout = self.kind_timeouts.get(kind, self.default_timeout)
+
+        job = Job(kind, project_name, target, timeout=timeout, description=description)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._pending.append(job)
+            self._prune()
+        self._broadcast(job)
+        self._dispatch()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """Get a job by id."""
+        return self.jobs.get(job_id)
+
+    def list_jobs(self, project_name: Optional[str] = None,
+                  status: Optional[str] = None) -> List[Job]:
+        """List jobs, newest first."""
+        jobs = [
+            job for job in list(self.jobs.values())
+            if (project_name is None or job.project_name == project_name)
+            and (status is None or job.status == status)
+        ]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancel a queued or running job.
+
+        Raises:
+            JobServiceError: If the job does not exist or already finished
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                raise JobServiceError("Job not found")
+            if job.finished:
+                raise JobServiceError(f"Job already {job.status}")
+            if job in self._pending:
+                self._pending.remove(job)
+                self._finish(job, 'cancelled')
+                return job
+
+        job.cancel()
+        return job
+
+    def cancel_project_jobs(self, project_name: str) -> int:
+        """Cancel every unfinished job of a project."""
+        cancelled = 0
+        for job in self.list_jobs(project_name):
+            if not job.finished:
+                try:
+                    self.cancel(job.id)
+                    cancelled += 1
+                except JobServiceError:
+                    pass
+        return cancelled
+
+    def has_active_job(self, project_name: str, kind: Optional[str] = None) -> bool:
+        """Whether a project has a queued or running job (of a kind)."""
+        return any(
+            not job.finished and (kind is None or job.kind == kind)
+            for job in self.list_jobs(project_name)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue and worker statistics."""
+        with self._lock:
+            running = list(self._running.values())
+            return {
+                'workers': self.max_workers,
+                'running': len(running),
+                'queued': len(self._pending),
+                'kind_limits': dict(self.kind_limits),
+                'running_by_kind': {
+                    kind: sum(1 for job in running if job.kind == kind)
+                    for kind in {job.kind for job in running}
+                }
+            }
+
+    def _dispatch(self) -> None:
+        """Start queued jobs while workers and kind limits allow."""
+        to_start = []
+        with self._lock:
+            busy_projects = {job.project_name for job in self._running.values()}
+            for job in list(self._pending):
+                if len(self._running) >= self.max_workers:
+                    break
+                running_of_kind = sum(1 for j in self._running.values() if j.kind == job.kind)
+                if running_of_kind >= self.kind_limits.get(job.kind, self.max_workers):
+                    continue
+                if job.project_name in busy_projects:
+                    continue
+                self._pending.remove(job)
+                self._running[job.id] = job
+                busy_projects.add(job.project_name)
+                job.status = 'running'
+                job.started_at = datetime.now().isoformat()
+                job._started = time.monotonic()
+                to_start.append(job)
+
+        for job in to_start:
+            self._broadcast(job)
+            threading.Thread(target=self._run_job, args=(job,), daemon=True,
+                             name=f"job-{job.kind}-{job.id}").start()
+
+    def _run_job(self, job: Job) -> None:
+        """Worker body: run a job and record its outcome."""
+        job.log(f"{job.description} started (job {job.id})")
+        try:
+            job.check_cancelled()
+            job.result = job._target(job)
+            status = 'succeeded'
+        except JobCancelled:
+            status = 'timed_out' if job._timed_out else 'cancelled'
+            job.error = f"Job timed out after {job.timeout:g}s" if job._timed_out else "Job cancelled"
+        except Exception as e:
+            status = 'failed'
+            job.error = str(e)
+            logger.error(f"Job {job.id} ({job.kind} {job.project_name}) failed: {e}")
+
+        level = 'INFO' if status == 'succeeded' else 'ERROR'
+        summary = f"{job.description} {status.replace('_', ' ')} after {job.duration:.1f}s"
+        job.log(summary if not job.error else f"{summary}: {job.error}", level)
+
+        with self._lock:
+            self._running.pop(job.id, None)
+            self._finish(job, status)
+        self._dispatch()
+
+    def _finish(self, job: Job, status: str) -> None:
+        """Mark a job finished (caller holds the lock)."""
+        job.status = status
+        job.finished_at = datetime.now().isoformat()
+        job._finished = time.monotonic()
+        if status == 'cancelled' and job.error is None:
+            job.error = "Job cancelled"
+        threading.Thread(target=self._broadcast, args=(job,), daemon=True).start()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond the retention limit (caller holds the lock)."""
+        finished = [job for job in self.jobs.values() if job.finished]
+        excess = len(finished) - self.retention
+        if excess > 0:
+            for job in sorted(finished, key=lambda j: j.created_at)[:excess]:
+                del self.jobs[job.id]
+
+    @staticmethod
+    def _broadcast(job: Job) -> None:
+        """Send the job status to clients watching the project."""
+        try:
+            from deployer.websocket.events import broadcast_job_status
+            broadcast_job_status(job.project_name, job.to_dict())
+        except Exception as e:
+            logger.debug(f"Could not broadcast job status: {e}")
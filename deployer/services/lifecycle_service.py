@@ -0,0 +1,147 @@
+"""Project lifecycle event bus, delivered to subscribers in coalesced batches."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ('started', 'stopped', 'exited', 'created', 'deleted', 'venv_created', 'install_finished')
+
+# Events kept per project and batch; older ones are dropped and counted
+MAX_EVENTS_PER_PROJECT = 100
+
+Batch = Dict[str, List['LifecycleEvent']]
+
+
+class LifecycleServiceError(Exception):
+    """Lifecycle service specific error."""
+    pass
+
+
+@dataclass
+class LifecycleEvent:
+    """One change of a project's lifecycle."""
+
+    type: str
+    project_name: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert event to dictionary."""
+        return asdict(self)
+
+
+class LifecycleService:
+    """
+    Collects lifecycle events published by the services and hands them to
+    subscribers (the WebSocket layer) from one dispatcher thread.
+
+    Events published within LIFECYCLE_COALESCE_WINDOW seconds of the first
+    pending one are delivered together, grouped per project, so a burst
+    (scaling to ten replicas, a restart, a stop-all on shutdown) costs one
+    message per project instead of one per event. Publishing never blocks
+    on delivery.
+    """
+
+    _instance: Optional['LifecycleService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.window = max(self._config.get('LIFECYCLE_COALESCE_WINDOW', 0.2), 0.0)
+        self._pending: 'OrderedDict[str, List[LifecycleEvent]]' = OrderedDict()
+        self._dropped = 0
+        self._published = 0
+        self._batches = 0
+        self._subscribers: List[Callable[[Batch], None]] = []
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the lifecycle service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'LifecycleService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise LifecycleServiceError("LifecycleService not initialized")
+        return cls._instance
+
+    def subscribe(self, callback: Callable[[Batch], None]) -> None:
+        """Call back with every batch: project name -> its events, oldest first."""
+        self._subscribers.append(callback)
+
+    def publish(self, event_type: str, project_name: str, **data: Any) -> LifecycleEvent:
+        """
+        Queue a lifecycle event for delivery.
+
+        Args:
+            event_type: One of EVENT_TYPES
+            project_name: Project the event belongs to
+            **data: Event details, e.g. replica or exit code
+
+        Raises:
+            LifecycleServiceError: If the event type is unknown
+        """
+        if event_type not in EVENT_TYPES:
+            raise LifecycleServiceError(f"Unknown lifecycle event: {event_type}")
+
+        event = LifecycleEvent(event_type, project_name, data)
+        with self._condition:
+            events = self._pending.setdefault(project_name, [])
+            events.append(event)
+            if len(events) > MAX_EVENTS_PER_PROJECT:
+                del events[0]
+                self._dropped += 1
+            self._published += 1
+            self._condition.notify()
+        return event
+
+    def start(self) -> None:
+        """Deliver events from a background thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._dispatch_loop, daemon=True, name='lifecycle-events')
+        self._thread.start()
+
+    def flush(self) -> Batch:
+        """Take the pending events and deliver them now."""
+        with self._condition:
+            batch = dict(self._pending)
+            self._pending.clear()
+        if batch:
+            self._batches += 1
+            for callback in self._subscribers:
+                try:
+                    callback(batch)
+                except Exception as e:
+                    logger.error(f"Error delivering lifecycle events: {e}")
+        return batch
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get published and delivered counters."""
+        return {
+            'published': self._published,
+            'batches': self._batches,
+            'dropped': self._dropped,
+            'coalesce_window': self.window
+        }
+
+    def _dispatch_loop(self) -> None:
+        """Wait for a first event, let the window fill, deliver the batch."""
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            if self.window:
+                time.sleep(self.window)
+            self.flush()
@@ -1,12 +1,14 @@
 """Service for managing project logs and real-time streaming."""
 
+import itertools
 import logging
 import os
+import threading
 import time
 from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 from deployer.storage.json_storage import get_log_storage
 
@@ -20,6 +22,73 @@ project_logs = {}
 # Format: {project_name: {'file_path': str, 'last_position': int}}
 log_watchers = {}
 
+# Disambiguates log ids created within the same millisecond
+_log_sequence = itertools.count()
+
+# Live subscribers of each project's log lines (Server-Sent Events streams)
+# Format: {project_name: set(LogSubscription)}
+log_subscribers = {}
+
+# Guards appends to project_logs against subscribers taking their snapshot
+_subscribers_lock = threading.Lock()
+
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+
+class LogServiceError(Exception):
+    """Log service specific error."""
+    pass
+
+
+def _level_rank(level: Optional[str]) -> int:
+    """Severity of a level name (unknown levels count as INFO)."""
+    try:
+        return LOG_LEVELS.index((level or 'INFO').upper())
+    except ValueError:
+        return LOG_LEVELS.index('INFO')
+
+
+class LogSubscription:
+    """Bounded queue of the log entries one stream has not sent yet."""
+    
+    def __init__(self, project_name: str, max_entries: int, min_level: str = 'DEBUG'):
+        self.project_name = project_name
+        self.max_entries = max(max_entries, 1)
+        self.min_rank = _level_rank(min_level)
+        self.dropped = 0
+        self._entries = deque()
+        self._condition = threading.Condition()
+    
+    def accepts(self, entry: Dict) -> bool:
+        """Check an entry against the level filter."""
+        return _level_rank(entry.get('level')) >= self.min_rank
+    
+    def push(self, entry: Dict) -> None:
+        """Queue an entry, dropping the oldest one when the queue is full."""
+        if not self.accepts(entry):
+            return
+        with self._condition:
+            if len(self._entries) >= self.max_entries:
+                self._entries.popleft()
+                self.dropped += 1
+            self._entries.append(entry)
+            self._condition.notify()
+    
+    def get(self, timeout: float) -> Tuple[List[Dict], int]:
+        """
+        Wait up to timeout for entries.
+        
+        Returns:
+            (queued entries, entries dropped since the last call)
+        """
+        with self._condition:
+            if not self._entries:
+                self._condition.wait(timeout)
+            entries = list(self._entries)
+            self._entries.clear()
+            dropped, self.dropped = self.dropped, 0
+        return entries, dropped
+
 
 class LogService:
     """Service for managing project logs and real-time streaming."""
@@ -90,8 +159,9 @@ class LogService:
             return []
     
     @staticmethod
-    def add_log_entry(project_name: str, message: str, level: str = 'INFO', timestamp: Optional[datetime] = None):
-        """Add a log entry for a project."""
+    def add_log_entry(project_name: str, message: str, level: str = 'INFO', timestamp: Optional[datetime] = None,
+                      replica: Optional[int] = None):
+        """Add a log entry for a project, optionally tagged with the replica that produced it."""
         try:
             if timestamp is None:
                 timestamp = datetime.now()
@@ -99,12 +169,14 @@ class LogService:
             timestamp_str = timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp
             
             log_entry = {
-                'id': f"{project_name}_{int(datetime.now().timestamp() * 1000)}",
+                'id': f"{project_name}_{int(datetime.now().timestamp() * 1000)}_{next(_log_sequence)}",
                 'timestamp': timestamp_str,
                 'level': level.upper(),
                 'message': message,
                 'project': project_name
             }
+            if replica is not None:
+                log_entry['replica'] = replica
             
             # Add to JSON storage
             log_storage = get_log_storage()
@@ -113,14 +185,18 @@ class LogService:
                 message, 
                 level, 
                 'log_service',
-                timestamp_str
+                timestamp_str,
+                replica
             )
             
-            # Add to in-memory storage for real-time updates
-            if project_name not in project_logs:
-                project_logs[project_name] = deque(maxlen=100)  # Smaller memory cache
-            
-            project_logs[project_name].append(log_entry)
+            # Add to in-memory storage for real-time updates, and to live streams
+            with _subscribers_lock:
+                if project_name not in project_logs:
+                    project_logs[project_name] = deque(maxlen=100)  # Smaller memory cache
+                
+                project_logs[project_name].append(log_entry)
+                for subscription in log_subscribers.get(project_name, ()):
+                    subscription.push(log_entry)
             
             # Broadcast to WebSocket clients
             from deployer.websocket.events import broadcast_log_message
@@ -132,6 +208,58 @@ class LogService:
             logger.error(f"Error adding log entry for {project_name}: {e}")
             return None
     
+    @staticmethod
+    def subscribe(project_name: str, max_entries: int, min_level: str = 'DEBUG',
+                  last_event_id: Optional[str] = None, tail: int = 0,
+                  max_streams: Optional[int] = None) -> Tuple[LogSubscription, List[Dict]]:
+        """
+        Follow a project's new log entries from the in-memory buffer.
+        
+        Args:
+            project_name: Project to follow
+            max_entries: Entries queued for a slow reader before the oldest are dropped
+            min_level: Lowest level delivered
+            last_event_id: Id of the last entry the client has; entries after it
+                are replayed. If it left the buffer, the whole buffer is replayed
+            tail: Without last_event_id, number of buffered entries to replay
+            max_streams: Live subscriptions allowed across all projects, None for no cap
+        
+        Returns:
+            (subscription, entries to send before the live ones)
+        
+        Raises:
+            LogServiceError: If max_streams subscriptions are already live
+        """
+        subscription = LogSubscription(project_name, max_entries, min_level)
+        with _subscribers_lock:
+            # Counted and added under one lock so concurrent connects cannot exceed the cap
+            if max_streams is not None and LogService.stream_count() >= max_streams:
+                raise LogServiceError(f"Too many log streams (maximum {max_streams})")
+            buffered = list(project_logs.get(project_name, ()))
+            log_subscribers.setdefault(project_name, set()).add(subscription)
+        
+        if last_event_id is not None:
+            ids = [entry.get('id') for entry in buffered]
+            backlog = buffered[ids.index(last_event_id) + 1:] if last_event_id in ids else buffered
+        else:
+            backlog = buffered[-tail:] if tail > 0 else []
+        return subscription, [entry for entry in backlog if subscription.accepts(entry)]
+    
+    @staticmethod
+    def unsubscribe(subscription: LogSubscription) -> None:
+        """Stop delivering entries to a subscription."""
+        with _subscribers_lock:
+            subscriptions = log_subscribers.get(subscription.project_name)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del log_subscribers[subscription.project_name]
+    
+    @staticmethod
+    def stream_count() -> int:
+        """Count live log subscriptions."""
+        return sum(len(subscriptions) for subscriptions in log_subscribers.values())
+    
     @staticmethod
     def clear_logs(project_name: str):
         """Clear all logs for a project."""
@@ -249,5 +377,6 @@ class LogService:
         return {
             'total_projects': len(project_logs),
             'active_watchers': len(log_watchers),
+            'active_streams': LogService.stream_count(),
             'total_log_entries': sum(len(logs) for logs in project_logs.values())
         }
\ No newline at end of file
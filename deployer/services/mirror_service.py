@@ -0,0 +1,277 @@
+"""Bare git mirror cache used to create projects without re-downloading repositories."""
+
+import hashlib
+import logging
+import re
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from deployer.services.disk_usage_service import DiskUsageService, DiskUsageServiceError, tree_usage
+
+logger = logging.getLogger(__name__)
+
+# mirror: hardlinked clone from a shared bare mirror
+# partial: per-project clone without blobs (--filter=blob:none)
+# shallow: per-project clone of the latest commit only (--depth 1)
+# direct: plain per-project clone
+CLONE_MODES = ('mirror', 'partial', 'shallow', 'direct')
+
+FETCH_MARKER = 'deployer-fetched'
+
+
+class MirrorServiceError(Exception):
+    """Mirror service specific error."""
+    pass
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a repository URL so equivalent spellings share a mirror."""
+    url = url.strip().rstrip('/')
+    if url.endswith('.git'):
+        url = url[:-4]
+    return re.sub(r'^(\w+://)([^/]+)', lambda m: m.group(1) + m.group(2).lower(), url)
+
+
+def is_local_url(url: str) -> bool:
+    """Whether a repository URL points to the local filesystem."""
+    return url.startswith('file://') or url.startswith('/')
+
+
+class MirrorService:
+    """Maintains bare mirrors under the vault and clones projects from them."""
+
+    _instance: Optional['MirrorService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.mode = self._config.get('GIT_CLONE_MODE', 'mirror')
+        if self.mode not in CLONE_MODES:
+            raise MirrorServiceError(f"GIT_CLONE_MODE must be one of: {', '.join(CLONE_MODES)}")
+
+        self.mirrors_path = Path(self._config.get('VAULT_PATH', 'vault')) / '.mirrors'
+        self.max_age = self._config.get('GIT_MIRROR_MAX_AGE', 60)
+        self.refresh_interval = self._config.get('GIT_MIRROR_REFRESH_INTERVAL', 600)
+        self.fetch_timeout = self._config.get('GIT_FETCH_TIMEOUT', 300)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        # Mirror name -> bytes, measured after each clone or fetch, never on request
+        self._sizes: Dict[str, int] = {}
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the mirror service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'MirrorService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise MirrorServiceError("MirrorService not initialized")
+        return cls._instance
+
+    def clone(self, url: str, target_path: Path, job) -> str:
+        """
+        Clone a repository into a project directory.
+
+        Args:
+            url: Remote URL or local repository path
+            target_path: Directory to create
+            job: Job used to run and stream git commands
+
+        Returns:
+            How the clone was made ('local', 'mirror', 'partial', 'shallow' or 'direct')
+        """
+        if is_local_url(url):
+            # A local repository is its own mirror: hardlink its objects
+            source = url[len('file://'):] if url.startswith('file://') else url
+            job.run_command(['git', 'clone', '--local', source, str(target_path)])
+            return 'local'
+
+        if self.mode == 'mirror':
+            mirror = self.ensure_mirror(url, job)
+            job.run_command(['git', 'clone', '--local', str(mirror), str(target_path)])
+            # Point the project at the real remote so fetches bypass the mirror
+            job.run_command(['git', 'remote', 'set-url', 'origin', url], cwd=str(target_path))
+            return 'mirror'
+
+        options = {
+            'partial': ['--filter=blob:none'],
+            'shallow': ['--depth', '1', '--no-single-branch'],
+            'direct': []
+        }[self.mode]
+        job.run_command(['git', 'clone'] + options + [url, str(target_path)])
+        return self.mode
+
+    def ensure_mirror(self, url: str, job=None) -> Path:
+        """
+        Get an up-to-date mirror of a repository, creating it if needed.
+
+        The mirror is fetched first when its last fetch is older than
+        GIT_MIRROR_MAX_AGE seconds.
+
+        Args:
+            url: Remote repository URL
+            job: Job used to run and stream git commands
+
+        Returns:
+            Path of the bare mirror
+        """
+        mirror = self.mirror_path(url)
+        with self._mirror_lock(mirror.name):
+            if not (mirror / 'HEAD').exists():
+                partial = mirror.with_name(mirror.name + '.partial')
+                if partial.exists():
+                    shutil.rmtree(partial)
+                self.mirrors_path.mkdir(parents=True, exist_ok=True)
+                try:
+                    self._git(['clone', '--mirror', url, str(partial)], job)
+                    partial.rename(mirror)
+                finally:
+                    if partial.exists():
+                        shutil.rmtree(partial, ignore_errors=True)
+                self._touch(mirror)
+                self._measure(mirror)
+            elif self._age(mirror) > self.max_age:
+                self._git(['remote', 'update', '--prune'], job, cwd=mirror)
+                self._touch(mirror)
+                self._measure(mirror)
+        return mirror
+
+    def mirror_path(self, url: str) -> Path:
+        """Path of the mirror for a repository URL."""
+        normalized = normalize_url(url)
+        digest = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', normalized.rsplit('/', 1)[-1])[:40] or 'repo'
+        return self.mirrors_path / f'{name}-{digest}.git'
+
+    def refresh_all(self, max_age: Optional[float] = None) -> int:
+        """
+        Fetch every mirror whose last fetch is older than max_age.
+
+        Returns:
+            Number of mirrors fetched
+        """
+        max_age = self.refresh_interval if max_age is None else max_age
+        refreshed = 0
+        for mirror in self._iter_mirrors():
+            if self._age(mirror) < max_age:
+                continue
+            lock = self._mirror_lock(mirror.name)
+            if not lock.acquire(blocking=False):
+                continue  # A project creation is using it right now
+            try:
+                self._git(['remote', 'update', '--prune'], cwd=mirror)
+                self._touch(mirror)
+                self._measure(mirror)
+                refreshed += 1
+            except Exception as e:
+                logger.warning(f"Could not refresh mirror {mirror.name}: {e}")
+            finally:
+                lock.release()
+        return refreshed
+
+    def start_refresher(self) -> None:
+        """Refresh mirrors in a background thread every GIT_MIRROR_REFRESH_INTERVAL seconds."""
+        if self.mode != 'mirror' or not self.refresh_interval or self._refresher is not None:
+            return
+
+        def refresh_loop():
+            # Sizes of the mirrors already on disk at startup
+            for mirror in self._iter_mirrors():
+                if mirror.name not in self._sizes:
+                    self._measure(mirror)
+            while True:
+                time.sleep(min(self.refresh_interval, 60))
+                try:
+                    self.refresh_all()
+                except Exception as e:
+                    logger.error(f"Error refreshing git mirrors: {e}")
+
+        self._refresher = threading.Thread(target=refresh_loop, daemon=True, name='mirror-refresher')
+        self._refresher.start()
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the configured mode and the cached mirrors.
+
+        Sizes come from the last clone or fetch (None until a mirror was
+        measured) and the total from the disk usage walker: nothing is
+        walked on the request thread.
+        """
+        mirrors = []
+        for mirror in self._iter_mirrors():
+            mirrors.append({
+                'name': mirror.name,
+                'url': self._remote_url(mirror),
+                'size_bytes': self._sizes.get(mirror.name),
+                'last_fetch_age_seconds': round(self._age(mirror), 1)
+            })
+        try:
+            total = DiskUsageService.get_instance().get_system_usage('mirrors')
+        except DiskUsageServiceError:
+            total = None
+        return {
+            'mode': self.mode,
+            'path': str(self.mirrors_path),
+            'total_bytes': total,
+            'max_age_seconds': self.max_age,
+            'refresh_interval_seconds': self.refresh_interval,
+            'mirrors': mirrors
+        }
+
+    def _git(self, args: List[str], job=None, cwd: Optional[Path] = None) -> None:
+        """Run a git command, through the job when there is one."""
+        command = ['git'] + args
+        if job is not None:
+            job.run_command(command, cwd=str(cwd) if cwd else None)
+            return
+        result = subprocess.run(command, cwd=cwd, capture_output=True, text=True,
+                                timeout=self.fetch_timeout)
+        if result.returncode != 0:
+            raise MirrorServiceError(result.stderr.strip() or f"git {args[0]} failed")
+
+    def _mirror_lock(self, name: str) -> threading.Lock:
+        """Lock serializing operations on one mirror."""
+        with self._locks_lock:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _iter_mirrors(self) -> List[Path]:
+        """List complete mirrors."""
+        if not self.mirrors_path.exists():
+            return []
+        return sorted(p for p in self.mirrors_path.iterdir()
+                      if p.suffix == '.git' and (p / 'HEAD').exists())
+
+    @staticmethod
+    def _touch(mirror: Path) -> None:
+        """Record a successful fetch."""
+        (mirror / FETCH_MARKER).touch()
+
+    @staticmethod
+    def _age(mirror: Path) -> float:
+        """Seconds since the last successful fetch."""
+        try:
+            return time.time() - (mirror / FETCH_MARKER).stat().st_mtime
+        except OSError:
+            return float('inf')
+
+    @staticmethod
+    def _remote_url(mirror: Path) -> Optional[str]:
+        """Remote URL of a mirror, read from its config."""
+        try:
+            config = (mirror / 'config').read_text()
+        except OSError:
+            return None
+        match = re.search(r'\[remote "origin"\][^\[]*?url\s*=\s*(\S+)', config)
+        return match.group(1) if match else None
+
+    def _measure(self, mirror: Path) -> None:
+        """Record the bytes a mirror uses on disk."""
+        self._sizes[mirror.name] = tree_usage(str(mirror))
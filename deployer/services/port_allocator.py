@@ -0,0 +1,72 @@
+"""Port allocation for project process replicas."""
+
+import socket
+import threading
+from typing import Dict, Optional
+
+
+class PortAllocationError(Exception):
+    """Raised when no port is available."""
+    pass
+
+
+class PortAllocator:
+    """Hands out distinct free TCP ports from a configured range."""
+
+    def __init__(self, port_range: str = '20000-20999', host: str = '0.0.0.0'):
+        """
+        Initialize the allocator.
+
+        Args:
+            port_range: Inclusive range such as ``20000-20999``
+            host: Interface used to probe whether a port is free
+        """
+        start, _, end = str(port_range).partition('-')
+        self.start = int(start)
+        self.end = int(end or start)
+        if not 0 < self.start <= self.end < 65536:
+            raise ValueError(f"Invalid port range: {port_range}")
+
+        self.host = host
+        self.allocated: Dict[int, str] = {}
+        self._next = self.start
+        self._lock = threading.Lock()
+
+    def allocate(self, owner: str) -> int:
+        """
+        Allocate a free port.
+
+        Args:
+            owner: Label of the replica using the port
+
+        Returns:
+            Allocated port number
+
+        Raises:
+            PortAllocationError: If every port in the range is taken
+        """
+        with self._lock:
+            size = self.end - self.start + 1
+            for _ in range(size):
+                port = self._next
+                self._next = self.start if port >= self.end else port + 1
+                if port not in self.allocated and self._is_free(port):
+                    self.allocated[port] = owner
+                    return port
+        raise PortAllocationError(f"No free port in range {self.start}-{self.end}")
+
+    def release(self, port: Optional[int]) -> None:
+        """Return a port to the pool."""
+        if port is None:
+            return
+        with self._lock:
+            self.allocated.pop(port, None)
+
+    def _is_free(self, port: int) -> bool:
+        """Check that nothing else is listening on a port."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind((self.host, port))
+                return True
+            except OSError:
+                return False
@@ -4,14 +4,24 @@ import json
 import signal
 import subprocess
 import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Any, List
 
 from deployer.models.project_json import Project, LogEntry
-from deployer.storage.json_storage import get_log_storage
+from deployer.services.cpu_placement import CpuPlacer
+from deployer.services.lifecycle_service import LifecycleService
+from deployer.services.port_allocator import PortAllocator, PortAllocationError
+from deployer.services.readiness import ReadinessProbe, ReadinessError
+from deployer.services.resource_service import ResourceService
+from deployer.services.state_version_service import StateVersionService
+from deployer.services.warmup_service import WarmupService
+from deployer.storage.json_storage import get_log_storage, get_project_storage
 from deployer.utils.security import sanitize_environment_variables
 
+RESTART_STRATEGIES = ('bluegreen', 'stop')
+
 
 class ProcessServiceError(Exception):
     """Process service specific error."""
@@ -19,15 +29,24 @@ class ProcessServiceError(Exception):
 
 
 class ProcessInfo:
-    """Information about a running process."""
+    """Information about a running process (one replica of a project)."""
     
-    def __init__(self, project_name: str, process: subprocess.Popen, started_at: str):
+    def __init__(self, project_name: str, process: subprocess.Popen, started_at: str,
+                 replica: int = 0, port: Optional[int] = None, generation: int = 0):
         self.project_name = project_name
         self.process = process
         self.started_at = started_at
+        self.replica = replica
+        self.port = port
+        self.generation = generation
         self.logs: List[LogEntry] = []
         self._log_lock = threading.Lock()
     
+    @property
+    def instance_name(self) -> str:
+        """Unique name of this replica, e.g. ``api#1``."""
+        return f"{self.project_name}#{self.replica}"
+    
     def add_log(self, message: str, level: str = 'INFO') -> None:
         """Add log entry thread-safely and persist to storage."""
         with self._log_lock:
@@ -35,9 +54,11 @@ class ProcessInfo:
                 message=message,
                 level=level,
                 source='process',
-                project_name=self.project_name
+                project_name=self.project_name,
+                replica=self.replica
             )
             self.logs.append(log_entry)
+            StateVersionService.get_instance().bump_logs(self.project_name)
             
             # Persist to JSON storage
             try:
@@ -46,7 +67,8 @@ class ProcessInfo:
                     project_name=self.project_name,
                     message=message,
                     level=level,
-                    source='process'
+                    source='process',
+                    replica=self.replica
                 )
             except Exception as e:
                 print(f"Error saving log to storage: {e}")
@@ -60,14 +82,20 @@ class ProcessInfo:
         with self._log_lock:
             return self.logs[-count:] if self.logs else []
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, include_logs: bool = True) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
-        return {
+        data = {
             'project_name': self.project_name,
+            'replica': self.replica,
+            'port': self.port,
+            'generation': self.generation,
             'pid': self.process.pid if self.process else None,
             'started_at': self.started_at,
-            'logs': [log.to_dict() for log in self.get_recent_logs()]
+            'alive': self.process.poll() is None if self.process else False
         }
+        if include_logs:
+            data['logs'] = [log.to_dict() for log in self.get_recent_logs()]
+        return data
 
 
 class ProcessService:
@@ -77,11 +105,24 @@ class ProcessService:
     _config: Dict[str, Any] = {}
     
     def __init__(self):
-        self.running_processes: Dict[str, ProcessInfo] = {}
+        # {project_name: {replica_id: ProcessInfo}}
+        self.running_processes: Dict[str, Dict[int, ProcessInfo]] = {}
         self.max_concurrent = self._config.get('MAX_CONCURRENT_PROJECTS', 10)
+        self.max_replicas = self._config.get('MAX_REPLICAS_PER_PROJECT', 16)
         self.process_timeout = self._config.get('PROCESS_TIMEOUT', 300)
         self.processes_file = Path(self._config.get('PROCESSES_FILE', 'running_processes.json'))
-        self._lock = threading.Lock()
+        self.ports = PortAllocator(self._config.get('PROJECT_PORT_RANGE', '20000-20999'))
+        self.placement_interval = self._config.get('CPU_PLACEMENT_INTERVAL', 30)
+        self.placer = self._create_placer()
+        self.default_probe = ReadinessProbe(
+            type=self._config.get('READINESS_PROBE', 'tcp'),
+            timeout=self._config.get('READINESS_TIMEOUT', 30)
+        )
+        self.drain_timeout = self._config.get('DRAIN_TIMEOUT', 30)
+        # Replica generation that receives traffic, per project
+        self.active_generation: Dict[str, int] = {}
+        self._restarting: set = set()
+        self._lock = threading.RLock()
     
     @classmethod
     def initialize(cls, config: Dict[str, Any]) -> None:
@@ -98,13 +139,14 @@ class ProcessService:
             raise ProcessServiceError("ProcessService not initialized")
         return cls._instance
     
-    def start_project(self, project: Project) -> bool:
+    def start_project(self, project: Project, replicas: Optional[int] = None) -> bool:
         """
-        Start a project process.
+        Start a project's processes.
         
         Args:
             project: Project to start
-            
+            replicas: Number of instances to run, defaults to the stored count or 1
+        
         Returns:
             True if started successfully
             
@@ -116,91 +158,272 @@ class ProcessService:
             if project.name in self.running_processes:
                 raise ProcessServiceError("Project is already running")
             
+            if replicas is None:
+                replicas = self.get_desired_replicas(project.name)
+            self._validate_replica_count(replicas)
+            
             # Check concurrent limit
-            if len(self.running_processes) >= self.max_concurrent:
-                raise ProcessServiceError(f"Maximum of {self.max_concurrent} concurrent projects allowed")
+            if self._process_count() + replicas > self.max_concurrent:
+                raise ProcessServiceError(f"Maximum of {self.max_concurrent} concurrent processes allowed")
             
             # Check if project has executable
             if not project.has_init:
                 raise ProcessServiceError("Project does not have __init__.py file")
             
-            # Determine Python executable
-            if project.has_venv:
-                python_executable = str(project.get_venv_python())
-            else:
-                python_executable = 'python3'
+            self.running_processes[project.name] = {}
+            try:
+                for replica in range(replicas):
+                    self._spawn_replica(project, replica)
+            except Exception as e:
+                # Cleanup on failure
+                for process_info in list(self.running_processes.get(project.name, {}).values()):
+                    self._terminate(process_info)
+                    self.ports.release(process_info.port)
+                    self._forget_upstream(process_info)
+                self.running_processes.pop(project.name, None)
+                ResourceService.get_instance().release(project.name)
+                raise ProcessServiceError(f"Failed to start project: {e}")
             
-            # Prepare environment
-            env = sanitize_environment_variables({})
+            self._store_desired_replicas(project.name, replicas)
             
-            try:
-                # Start process
-                process = subprocess.Popen(
-                    [python_executable, '-u', '__init__.py'],
-                    cwd=project.path,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    universal_newlines=True,
-                    bufsize=0,
-                    env=env
-                )
-                
-                # Create process info
-                process_info = ProcessInfo(
-                    project_name=project.name,
-                    process=process,
-                    started_at=datetime.now().isoformat()
-                )
-                
-                self.running_processes[project.name] = process_info
-                
-                # Update project status
-                project.running = True
-                project.pid = process.pid
-                project.started_at = process_info.started_at
-                
-                # Add startup log to storage
+            first = min(self.running_processes[project.name].values(), key=lambda i: i.replica)
+            
+            # Update project status
+            project.running = True
+            project.pid = first.process.pid
+            project.started_at = first.started_at
+            
+            # Start WebSocket log monitoring
+            from deployer.services.log_service import LogService
+            LogService.start_log_monitoring(project.name)
+            
+            # Save state
+            self._save_processes()
+            
+            # Give the new processes their own CPU sets
+            self._rebalance_cpus()
+            
+            return True
+    
+    def scale_project(self, project: Project, replicas: int) -> Dict[str, Any]:
+        """
+        Change the number of running replicas of a project.
+        
+        Args:
+            project: Project to scale
+            replicas: Desired number of replicas
+        
+        Returns:
+            Project process status after scaling
+        
+        Raises:
+            ProcessServiceError: If scaling fails
+        """
+        self._validate_replica_count(replicas)
+        
+        with self._lock:
+            if project.name in self._restarting:
+                raise ProcessServiceError("Project is being restarted")
+            
+            current = self.running_processes.get(project.name)
+            if not current:
+                self._store_desired_replicas(project.name, replicas)
+                self.start_project(project, replicas)
+                return self.get_project_status(project.name)
+            
+            if self._process_count() - len(current) + replicas > self.max_concurrent:
+                raise ProcessServiceError(f"Maximum of {self.max_concurrent} concurrent processes allowed")
+            
+            # Scale up with new replica ids, scale down from the highest id
+            next_replica = max(current) + 1
+            while len(current) < replicas:
                 try:
-                    log_storage = get_log_storage()
-                    log_storage.add_log_entry(
-                        project_name=project.name,
-                        message=f"Project started (PID: {process.pid})",
-                        level="INFO",
-                        source="process_service"
-                    )
+                    self._spawn_replica(project, next_replica,
+                                        self.active_generation.get(project.name, 0))
                 except Exception as e:
-                    print(f"Error saving startup log: {e}")
-                
-                # Start WebSocket log monitoring
-                from deployer.services.log_service import LogService
-                LogService.start_log_monitoring(project.name)
-                
-                # Save state
-                self._save_processes()
-                
-                # Start log monitoring thread
-                log_thread = threading.Thread(
-                    target=self._monitor_process_output,
-                    args=(process_info,),
-                    daemon=True
+                    raise ProcessServiceError(f"Failed to start replica {next_replica}: {e}")
+                next_replica += 1
+            
+            for replica in sorted(current, reverse=True)[:max(len(current) - replicas, 0)]:
+                self._stop_replica(project.name, replica)
+            
+            self._store_desired_replicas(project.name, replicas)
+            self._save_processes()
+            self._rebalance_cpus()
+            
+            return self.get_project_status(project.name)
+    
+    def restart_project(self, project: Project, strategy: str = 'stop') -> Dict[str, Any]:
+        """
+        Restart a running project.
+        
+        With the ``bluegreen`` strategy a new generation of replicas is started
+        next to the running one on fresh ports. Traffic switches to it once every
+        new replica passes the readiness probe, then the old generation is
+        drained and stopped. If the new generation never becomes ready it is
+        stopped and the old one keeps serving. The ``stop`` strategy stops the
+        project and starts it again. Blue/green suits projects that listen on
+        ``$PORT`` or have a readiness probe configured: with the default tcp
+        probe any other project is rolled back after READINESS_TIMEOUT.
+        
+        Args:
+            project: Project to restart
+            strategy: 'bluegreen' or 'stop'
+        
+        Returns:
+            Restart report with timings
+        
+        Raises:
+            ProcessServiceError: If the restart fails or was rolled back
+        """
+        if strategy not in RESTART_STRATEGIES:
+            raise ProcessServiceError(f"strategy must be one of: {', '.join(RESTART_STRATEGIES)}")
+        
+        started = time.monotonic()
+        
+        if strategy == 'stop' or not self.is_project_running(project.name):
+            if self.is_project_running(project.name):
+                self.stop_project(project.name)
+            self.start_project(project)
+            return {
+                'strategy': strategy,
+                'duration_seconds': round(time.monotonic() - started, 3),
+                'status': self.get_project_status(project.name)
+            }
+        
+        probe = self.get_readiness_probe(project.name)
+        
+        with self._lock:
+            replicas = self.running_processes.get(project.name)
+            if not replicas:
+                raise ProcessServiceError("Project is not running")
+            if project.name in self._restarting:
+                raise ProcessServiceError("Project is already being restarted")
+            
+            old = list(replicas.values())
+            if self._process_count() + len(old) > self.max_concurrent:
+                raise ProcessServiceError(
+                    f"Blue/green restart needs {len(old)} extra process slot(s), "
+                    f"maximum of {self.max_concurrent} concurrent processes allowed"
                 )
-                log_thread.start()
-                
-                return True
             
+            generation = self.active_generation.get(project.name, 0) + 1
+            next_replica = max(replicas) + 1
+            new = []
+            try:
+                for offset in range(len(old)):
+                    new.append(self._spawn_replica(project, next_replica + offset, generation))
             except Exception as e:
-                # Cleanup on failure
-                if project.name in self.running_processes:
-                    del self.running_processes[project.name]
-                raise ProcessServiceError(f"Failed to start project: {e}")
+                self._discard_replicas(new)
+                raise ProcessServiceError(f"Failed to start new replicas: {e}")
+            
+            self._restarting.add(project.name)
+            self._save_processes()
+            self._rebalance_cpus()
+        
+        try:
+            # Probe without holding the lock: the old generation keeps serving
+            try:
+                for process_info in new:
+                    probe.wait_until_ready(process_info.process, '127.0.0.1', process_info.port)
+            except ReadinessError as e:
+                with self._lock:
+                    self._discard_replicas(new)
+                    self._save_processes()
+                    self._rebalance_cpus()
+                self._add_service_log(project.name, f"Restart rolled back: new replica not ready ({e})",
+                                      'ERROR')
+                raise ProcessServiceError(f"Restart rolled back: new replica not ready ({e})")
+            
+            ready_seconds = time.monotonic() - started
+            
+            with self._lock:
+                current = self.running_processes.get(project.name, {})
+                if any(current.get(info.replica) is not info for info in new):
+                    self._discard_replicas(new)
+                    self._save_processes()
+                    raise ProcessServiceError("Restart rolled back: a new replica exited before the switch")
+                
+                # Single assignment: the proxy sees either the old or the new set
+                self.active_generation[project.name] = generation
+            
+            self._add_service_log(project.name, f"Traffic switched to generation {generation} "
+                                                f"(ports {', '.join(str(i.port) for i in new)})")
+            
+            drained = self._drain(project.name, [info.port for info in old])
+            
+            with self._lock:
+                current = self.running_processes.get(project.name, {})
+                for process_info in old:
+                    if current.get(process_info.replica) is process_info:
+                        self._stop_replica(project.name, process_info.replica)
+                self._save_processes()
+                self._rebalance_cpus()
+        
+        finally:
+            with self._lock:
+                self._restarting.discard(project.name)
+        
+        first = min(new, key=lambda i: i.replica)
+        project.pid = first.process.pid
+        project.started_at = first.started_at
+        
+        return {
+            'strategy': strategy,
+            'generation': generation,
+            'replicas': [info.replica for info in new],
+            'stopped': [info.replica for info in old],
+            'ready_seconds': round(ready_seconds, 3),
+            'drained': drained,
+            'duration_seconds': round(time.monotonic() - started, 3),
+            'status': self.get_project_status(project.name)
+        }
+    
+    def get_readiness_probe(self, project_name: str) -> ReadinessProbe:
+        """Get the readiness probe configured for a project."""
+        project_data = get_project_storage().get_project(project_name) or {}
+        try:
+            return ReadinessProbe.from_dict(project_data.get('readiness'), self.default_probe)
+        except ReadinessError as e:
+            print(f"Invalid readiness probe for {project_name}, using default: {e}")
+            return self.default_probe
+    
+    def has_readiness_probe(self, project_name: str) -> bool:
+        """Whether a readiness probe was configured for a project (not just the default)."""
+        project_data = get_project_storage().get_project(project_name) or {}
+        return bool(project_data.get('readiness'))
     
-    def stop_project(self, project_name: str) -> bool:
+    def set_readiness_probe(self, project_name: str, data: Dict[str, Any]) -> ReadinessProbe:
         """
-        Stop a running project.
+        Configure the readiness probe of a project.
+        
+        Args:
+            project_name: Name of project
+            data: Probe settings, unset fields keep their defaults
+        
+        Returns:
+            Stored probe
+        
+        Raises:
+            ProcessServiceError: If a setting is invalid
+        """
+        try:
+            probe = ReadinessProbe.from_dict(data, self.default_probe)
+        except ReadinessError as e:
+            raise ProcessServiceError(str(e))
+        
+        if not get_project_storage().update_project_fields(project_name, readiness=probe.to_dict()):
+            raise ProcessServiceError("Failed to save readiness probe")
+        return probe
+    
+    def stop_project(self, project_name: str, replica: Optional[int] = None) -> bool:
+        """
+        Stop a running project, or a single replica of it.
         
         Args:
             project_name: Name of project to stop
-            
+            replica: Replica id to stop, or None for every replica
+        
         Returns:
             True if stopped successfully
             
@@ -211,61 +434,102 @@ class ProcessService:
             if project_name not in self.running_processes:
                 raise ProcessServiceError("Project is not running")
             
-            process_info = self.running_processes[project_name]
+            replicas = self.running_processes[project_name]
+            if replica is not None and replica not in replicas:
+                raise ProcessServiceError(f"Replica {replica} is not running")
+            
+            targets = [replica] if replica is not None else sorted(replicas)
             
             try:
-                # Terminate process gracefully
-                process_info.process.terminate()
-                
-                try:
-                    # Wait for graceful shutdown
-                    process_info.process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    # Force kill if graceful shutdown fails
-                    process_info.process.kill()
-                    process_info.process.wait()
-                
-                # Add shutdown log to storage
-                try:
-                    log_storage = get_log_storage()
-                    log_storage.add_log_entry(
-                        project_name=project_name,
-                        message="Project stopped",
-                        level="INFO",
-                        source="process_service"
-                    )
-                except Exception as e:
-                    print(f"Error saving shutdown log: {e}")
+                for target in targets:
+                    self._stop_replica(project_name, target)
                 
-                # Stop WebSocket log monitoring
-                from deployer.services.log_service import LogService
-                LogService.stop_log_monitoring(project_name)
-                
-                # Remove from running processes
-                del self.running_processes[project_name]
+                if replica is None:
+                    # Add shutdown log to storage
+                    try:
+                        log_storage = get_log_storage()
+                        log_storage.add_log_entry(
+                            project_name=project_name,
+                            message="Project stopped",
+                            level="INFO",
+                            source="process_service"
+                        )
+                    except Exception as e:
+                        print(f"Error saving shutdown log: {e}")
                 
                 # Save state
                 self._save_processes()
+                self._rebalance_cpus()
                 
                 return True
             
             except Exception as e:
                 raise ProcessServiceError(f"Failed to stop project: {e}")
     
-    def get_project_logs(self, project_name: str) -> List[LogEntry]:
+    def get_project_logs(self, project_name: str, replica: Optional[int] = None,
+                         count: int = 50) -> List[LogEntry]:
         """
         Get logs for a running project.
         
         Args:
             project_name: Name of project
-            
+            replica: Only return logs of this replica
+            count: Most recent entries taken from each replica's buffer
+        
         Returns:
-            List of log entries
+            List of log entries, oldest first
         """
-        if project_name not in self.running_processes:
-            return []
+        replicas = self.running_processes.get(project_name, {})
+        if replica is not None:
+            process_info = replicas.get(replica)
+            return process_info.get_recent_logs(count) if process_info else []
         
-        return self.running_processes[project_name].get_recent_logs()
+        logs = [log for info in list(replicas.values()) for log in info.get_recent_logs(count)]
+        logs.sort(key=lambda log: log.timestamp)
+        return logs
+    
+    def get_project_status(self, project_name: str) -> Dict[str, Any]:
+        """Get process status of a project and each of its replicas."""
+        replicas = self.running_processes.get(project_name, {})
+        return {
+            'project_name': project_name,
+            'running': bool(replicas),
+            'restarting': project_name in self._restarting,
+            'active_generation': self.active_generation.get(project_name, 0),
+            'desired_replicas': self.get_desired_replicas(project_name),
+            'replicas': [replicas[r].to_dict(include_logs=False) for r in sorted(replicas)]
+        }
+    
+    def get_project_pids(self, project_name: str) -> List[int]:
+        """Get root PIDs of a running project's processes."""
+        return [
+            info.process.pid
+            for info in self.running_processes.get(project_name, {}).values()
+            if info.process is not None
+        ]
+    
+    def get_project_ports(self, project_name: str) -> List[int]:
+        """Get the ports allocated to a running project's replicas."""
+        replicas = self.running_processes.get(project_name, {})
+        return [replicas[r].port for r in sorted(replicas) if replicas[r].port]
+    
+    def get_active_ports(self, project_name: str) -> List[int]:
+        """Get the ports that should receive traffic for a project."""
+        replicas = self.running_processes.get(project_name, {})
+        generation = self.active_generation.get(project_name, 0)
+        return [
+            info.port for _, info in sorted(replicas.items())
+            if info.port and info.generation == generation and info.process.poll() is None
+        ]
+    
+    def get_desired_replicas(self, project_name: str) -> int:
+        """Get the stored replica count of a project."""
+        project_data = get_project_storage().get_project(project_name) or {}
+        return int(project_data.get('replicas') or 1)
+    
+    def get_replica_count(self, project_name: str) -> int:
+        """Count running replicas of a project."""
+        return len(self.running_processes.get(project_name, {}))
     
     def is_project_running(self, project_name: str) -> bool:
         """Check if project is currently running."""
@@ -278,11 +542,12 @@ class ProcessService:
     def get_system_stats(self) -> Dict[str, Any]:
         """Get system statistics."""
         total_logs = sum(
-            len(info.logs) for info in self.running_processes.values()
+            len(info.logs) for info in self._iter_processes()
         )
         
         return {
             'active_projects': len(self.running_processes),
+            'active_processes': self._process_count(),
             'total_logs': total_logs,
             'max_projects_recommended': self.max_concurrent
         }
@@ -290,28 +555,32 @@ class ProcessService:
     def cleanup_finished_processes(self) -> None:
         """Clean up processes that have finished."""
         with self._lock:
-            finished_projects = []
+            finished = [
+                info for info in self._iter_processes()
+                if info.process.poll() is not None
+            ]
             
-            for project_name, process_info in self.running_processes.items():
-                if process_info.process.poll() is not None:
-                    finished_projects.append(project_name)
-            
-            for project_name in finished_projects:
+            for process_info in finished:
                 # Add finished log to storage
                 try:
                     log_storage = get_log_storage()
                     log_storage.add_log_entry(
-                        project_name=project_name,
+                        project_name=process_info.project_name,
                         message="Project process finished",
                         level="INFO",
-                        source="process_service"
+                        source="process_service",
+                        replica=process_info.replica
                     )
                 except Exception as e:
                     print(f"Error saving finished log: {e}")
-                del self.running_processes[project_name]
+                ResourceService.get_instance().record_exit(
+                    process_info.project_name, process_info.process.returncode
+                )
+                self._remove_replica(process_info, exited=True)
             
-            if finished_projects:
+            if finished:
                 self._save_processes()
+                self._rebalance_cpus()
     
     def shutdown_all(self) -> None:
         """Shutdown all running processes."""
@@ -322,6 +591,247 @@ class ProcessService:
                 except Exception as e:
                     print(f"Error stopping project {project_name}: {e}")
     
+    def _spawn_replica(self, project: Project, replica: int, generation: int = 0) -> ProcessInfo:
+        """Start one replica of a project (caller holds the lock)."""
+        # Determine Python executable
+        if project.has_venv:
+            python_executable = str(project.get_venv_python())
+        else:
+            python_executable = 'python3'
+        
+        try:
+            port = self.ports.allocate(f"{project.name}#{replica}")
+        except PortAllocationError as e:
+            raise ProcessServiceError(str(e))
+        
+        # Prepare environment
+        env = sanitize_environment_variables({})
+        env.update({
+            'PORT': str(port),
+            'DEPLOYER_PROJECT': project.name,
+            'DEPLOYER_REPLICA': str(replica)
+        })
+        
+        # Cold unless the current commit was precompiled or already started once
+        start_kind = WarmupService.get_instance().start_kind(project.project_path, project.name)
+        spawned = time.monotonic()
+        
+        try:
+            # Apply resource limits (cgroup or rlimit fallback) at spawn time
+            launch = ResourceService.get_instance().prepare_launch(project.name)
+            
+            # Start process
+            process = subprocess.Popen(
+                launch.wrap_command([python_executable, '-u', '__init__.py']),
+                cwd=project.path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                bufsize=0,
+                env=env,
+                preexec_fn=launch.preexec_fn
+            )
+        except Exception:
+            self.ports.release(port)
+            raise
+        
+        # Create process info
+        process_info = ProcessInfo(
+            project_name=project.name,
+            process=process,
+            started_at=datetime.now().isoformat(),
+            replica=replica,
+            port=port,
+            generation=generation
+        )
+        
+        self.running_processes.setdefault(project.name, {})[replica] = process_info
+        StateVersionService.get_instance().bump_project(project.name)
+        LifecycleService.get_instance().publish('started', project.name, replica=replica, pid=process.pid,
+                                                port=port, generation=generation)
+        
+        # Add startup log to storage
+        try:
+            log_storage = get_log_storage()
+            log_storage.add_log_entry(
+                project_name=project.name,
+                message=f"Project started (PID: {process.pid}, replica {replica}, port {port})",
+                level="INFO",
+                source="process_service",
+                replica=replica
+            )
+        except Exception as e:
+            print(f"Error saving startup log: {e}")
+        
+        # Start log monitoring thread
+        log_thread = threading.Thread(
+            target=self._monitor_process_output,
+            args=(process_info,),
+            daemon=True
+        )
+        log_thread.start()
+        
+        # Measure how long the replica takes to become ready
+        threading.Thread(
+            target=self._time_startup,
+            args=(process_info, project.project_path, start_kind, spawned),
+            daemon=True
+        ).start()
+        
+        return process_info
+    
+    def _time_startup(self, process_info: ProcessInfo, project_path: Path, start_kind: str,
+                      spawned: float) -> None:
+        """
+        Record the time until a replica passes its readiness probe.
+        
+        Only projects with a configured probe are measured: the default tcp
+        probe would poll a project that never binds ``$PORT`` for
+        READINESS_TIMEOUT seconds per replica.
+        """
+        if not self.has_readiness_probe(process_info.project_name):
+            return
+        probe = self.get_readiness_probe(process_info.project_name)
+        if probe.type == 'process':
+            return  # Nothing to measure: ready as soon as it is spawned
+        
+        try:
+            probe.wait_until_ready(process_info.process, '127.0.0.1', process_info.port)
+        except ReadinessError:
+            return
+        try:
+            WarmupService.get_instance().record_start(
+                process_info.project_name, project_path, start_kind, time.monotonic() - spawned
+            )
+        except Exception as e:
+            print(f"Error recording startup time: {e}")
+    
+    def _stop_replica(self, project_name: str, replica: int) -> None:
+        """Terminate one replica and forget it (caller holds the lock)."""
+        process_info = self.running_processes[project_name][replica]
+        self._terminate(process_info)
+        self._remove_replica(process_info)
+    
+    @staticmethod
+    def _terminate(process_info: ProcessInfo) -> None:
+        """Terminate a process gracefully, killing it if needed."""
+        process_info.process.terminate()
+        
+        try:
+            # Wait for graceful shutdown
+            process_info.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            # Force kill if graceful shutdown fails
+            process_info.process.kill()
+            process_info.process.wait()
+    
+    def _remove_replica(self, process_info: ProcessInfo, exited: bool = False) -> None:
+        """
+        Drop a replica from the running set (caller holds the lock).
+        
+        Args:
+            process_info: Replica to drop
+            exited: The process ended on its own instead of being stopped
+        """
+        replicas = self.running_processes.get(process_info.project_name)
+        if not replicas or replicas.get(process_info.replica) is not process_info:
+            return
+        
+        del replicas[process_info.replica]
+        self.ports.release(process_info.port)
+        self._forget_upstream(process_info)
+        StateVersionService.get_instance().bump_project(process_info.project_name)
+        if exited:
+            LifecycleService.get_instance().publish('exited', process_info.project_name,
+                                                    replica=process_info.replica,
+                                                    code=process_info.process.returncode)
+        else:
+            LifecycleService.get_instance().publish('stopped', process_info.project_name,
+                                                    replica=process_info.replica)
+        
+        if not replicas:
+            # Last replica gone: the project is no longer running
+            del self.running_processes[process_info.project_name]
+            self.active_generation.pop(process_info.project_name, None)
+            ResourceService.get_instance().release(process_info.project_name)
+            
+            # Stop WebSocket log monitoring
+            from deployer.services.log_service import LogService
+            LogService.stop_log_monitoring(process_info.project_name)
+    
+    def _discard_replicas(self, replicas: List[ProcessInfo]) -> None:
+        """Stop replicas that are still registered (caller holds the lock)."""
+        for process_info in replicas:
+            current = self.running_processes.get(process_info.project_name, {})
+            if current.get(process_info.replica) is process_info:
+                self._terminate(process_info)
+                self._remove_replica(process_info)
+    
+    def _drain(self, project_name: str, ports: List[int]) -> bool:
+        """
+        Wait until the reverse proxy has no request in flight to the given ports of a project.
+        
+        Returns:
+            True if drained, False if the drain timeout expired first
+        """
+        try:
+            from deployer.services.proxy_service import ProxyService
+            proxy = ProxyService.get_instance()
+        except Exception:
+            return True
+        
+        deadline = time.monotonic() + self.drain_timeout
+        while proxy.get_inflight(project_name, ports) > 0:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+        return True
+    
+    @staticmethod
+    def _forget_upstream(process_info: ProcessInfo) -> None:
+        """Drop the reverse proxy's pool of a replica whose port is given back."""
+        try:
+            from deployer.services.proxy_service import ProxyService
+            ProxyService.get_instance().remove_upstream(process_info.project_name, process_info.port)
+        except Exception:
+            pass
+    
+    @staticmethod
+    def _add_service_log(project_name: str, message: str, level: str = 'INFO') -> None:
+        """Record a process service event in the project's log."""
+        try:
+            get_log_storage().add_log_entry(
+                project_name=project_name,
+                message=message,
+                level=level,
+                source="process_service"
+            )
+        except Exception as e:
+            print(f"Error saving log: {e}")
+    
+    def _validate_replica_count(self, replicas: int) -> None:
+        """Validate a requested replica count."""
+        if not isinstance(replicas, int) or isinstance(replicas, bool):
+            raise ProcessServiceError("Replica count must be an integer")
+        if not 1 <= replicas <= self.max_replicas:
+            raise ProcessServiceError(f"Replica count must be between 1 and {self.max_replicas}")
+    
+    def _store_desired_replicas(self, project_name: str, replicas: int) -> None:
+        """Remember a project's replica count for the next start."""
+        try:
+            get_project_storage().update_project_fields(project_name, replicas=replicas)
+        except Exception as e:
+            print(f"Error saving replica count: {e}")
+    
+    def _iter_processes(self) -> List[ProcessInfo]:
+        """List every running replica of every project."""
+        return [info for replicas in list(self.running_processes.values())
+                for info in list(replicas.values())]
+    
+    def _process_count(self) -> int:
+        """Count running replicas across projects."""
+        return sum(len(replicas) for replicas in self.running_processes.values())
+    
     def _monitor_process_output(self, process_info: ProcessInfo) -> None:
         """Monitor process output and collect logs."""
         try:
@@ -336,28 +846,97 @@ class ProcessService:
                     
                     # Also send to WebSocket clients
                     from deployer.services.log_service import LogService
-                    LogService.add_log_entry(process_info.project_name, line)
+                    LogService.add_log_entry(process_info.project_name, line,
+                                             replica=process_info.replica)
         
         except Exception as e:
             process_info.add_log(f"Error reading output: {e}", 'ERROR')
         
         finally:
+            try:
+                returncode = process_info.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                returncode = None
+            
             # Clean up when process finishes
             with self._lock:
-                if process_info.project_name in self.running_processes:
-                    del self.running_processes[process_info.project_name]
+                replicas = self.running_processes.get(process_info.project_name, {})
+                if replicas.get(process_info.replica) is process_info:
+                    # Exited on its own: surface OOM kills and free its resources
+                    ResourceService.get_instance().record_exit(process_info.project_name, returncode)
+                    self._remove_replica(process_info, exited=True)
                     self._save_processes()
+                    self._rebalance_cpus()
+    
+    def get_placement(self) -> Dict[str, Any]:
+        """Get the CPU placement map of running projects."""
+        if self.placer is None:
+            return {'mode': 'off', 'placement': {}}
+        return self.placer.get_status()
+    
+    def rebalance_if_due(self) -> None:
+        """Periodically re-place projects when placing by measured usage."""
+        if self.placer is None or self.placer.mode != 'usage':
+            return
+        last = self.placer.last_rebalance or 0
+        if time.time() - last >= self.placement_interval:
+            with self._lock:
+                self._rebalance_cpus()
+    
+    def _create_placer(self) -> Optional[CpuPlacer]:
+        """Create the CPU placer if a placement mode is configured."""
+        mode = self._config.get('CPU_PLACEMENT', 'off')
+        if mode == 'off':
+            return None
+        
+        def declared_weight(instance_name: str) -> float:
+            project_name = instance_name.split('#', 1)[0]
+            limits = ResourceService.get_instance().get_effective_limits(project_name)
+            return float(limits.cpu_weight or 100)
+        
+        try:
+            return CpuPlacer(
+                mode=mode,
+                reserved=self._config.get('CPU_RESERVED') or None,
+                pin_deployer=self._config.get('CPU_PIN_DEPLOYER', False),
+                weight_getter=declared_weight
+            )
+        except (ValueError, AttributeError, OSError) as e:
+            print(f"CPU placement disabled: {e}")
+            return None
+    
+    def _rebalance_cpus(self) -> None:
+        """Recompute CPU placement for running replicas (caller holds the lock)."""
+        if self.placer is None:
+            return
+        try:
+            units = {
+                info.instance_name: [info.process.pid]
+                for info in self._iter_processes()
+                if info.process and info.process.poll() is None
+            }
+            self.placer.rebalance(units)
+        except Exception as e:
+            print(f"Error rebalancing CPU placement: {e}")
     
     def _save_processes(self) -> None:
         """Save running processes state to file."""
         try:
             # Create serializable data (exclude process objects)
             serializable_data = {}
-            for name, info in self.running_processes.items():
+            for name, replicas in self.running_processes.items():
                 serializable_data[name] = {
-                    'pid': info.process.pid if info.process else None,
-                    'started_at': info.started_at,
-                    'project_name': info.project_name
+                    'project_name': name,
+                    'replicas': [
+                        {
+                            'replica': info.replica,
+                            'pid': info.process.pid if info.process else None,
+                            'port': info.port,
+                            'generation': info.generation,
+                            'started_at': info.started_at
+                        }
+                        for info in replicas.values()
+                    ]
                 }
             
             with open(self.processes_file, 'w') as f:
@@ -375,17 +954,18 @@ class ProcessService:
                 
                 # Check if processes are still running
                 for project_name, proc_info in data.items():
-                    pid = proc_info.get('pid')
-                    if pid:
-                        try:
-                            # Check if process still exists
-                            import os
-                            os.kill(pid, 0)  # Signal 0 to check existence
-                            # Process exists but we don't have the reference
-                            # Skip it - it will be cleaned up
-                        except OSError:
-                            # Process doesn't exist anymore
-                            pass
+                    for replica_info in proc_info.get('replicas', [proc_info]):
+                        pid = replica_info.get('pid')
+                        if pid:
+                            try:
+                                # Check if process still exists
+                                import os
+                                os.kill(pid, 0)  # Signal 0 to check existence
+                                # Process exists but we don't have the reference
+                                # Skip it - it will be cleaned up
+                            except OSError:
+                                # Process doesn't exist anymore
+                                pass
                 
                 # Start with empty processes since we can't recover references
                 self.running_processes = {}
@@ -405,4 +985,4 @@ def setup_signal_handlers(process_service: ProcessService) -> None:
         exit(0)
     
     signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
\ No newline at end of file
+    signal.signal(signal.SIGTERM, signal_handler)
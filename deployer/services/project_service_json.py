@@ -1,20 +1,40 @@
 """JSON-based project service."""
 
+import hashlib
 import os
 import shutil
 import subprocess
+import threading
 import time
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import logging
 
 from deployer.models.project_json import Project
+from deployer.services.disk_usage_service import DiskUsageService
+from deployer.services.environment_service import EnvironmentService
+from deployer.services.git_status_service import GitStatusService
+from deployer.services.job_service import Job, JobService
+from deployer.services.lifecycle_service import LifecycleService
+from deployer.services.mirror_service import MirrorService
+from deployer.services.state_version_service import StateVersionService
+from deployer.services.trash_service import TrashService
+from deployer.services.vault_watcher import VaultWatcher
+from deployer.services.warmup_service import WarmupService
 from deployer.storage.json_storage import get_project_storage, get_log_storage
+from deployer.utils.git_refs import git_dir, remote_url
+from deployer.utils.requirements import (
+    needs_full_install, parse_freeze, pinned_version, requirement_lines, requirement_name
+)
 from deployer.utils.security import SecurityContext
 
 logger = logging.getLogger(__name__)
 
+# Files whose change requires reinstalling dependencies on update
+DEPENDENCY_FILES = {'requirements.txt', 'requirements.in', 'pyproject.toml', 'setup.py', 'setup.cfg'}
+
 
 class ProjectServiceError(Exception):
     """Project service specific error."""
@@ -27,9 +47,7 @@ class ProjectService:
     _instance: Optional['ProjectService'] = None
     _vault_path: Optional[Path] = None
     _security_context: Optional[SecurityContext] = None
-    _projects_cache: List[Project] = []
-    _cache_timestamp: Optional[float] = None
-    _cache_ttl: int = 30  # Cache TTL in seconds
+    _config: Dict[str, Any] = {}
     
     def __init__(self):
         if self._vault_path is None:
@@ -39,12 +57,27 @@ class ProjectService:
         self.security_context = self._security_context
         self.project_storage = get_project_storage()
         self.log_storage = get_log_storage()
+        
+        # Projects by name, kept fresh by the vault watcher instead of a TTL
+        self._projects_cache: Dict[str, Project] = {}
+        self._cache_loaded = False
+        self._stale: set = set()
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
+        self.watcher = VaultWatcher(
+            self.vault_path,
+            self._invalidate_project,
+            mode=self._config.get('VAULT_WATCH', 'auto'),
+            poll_interval=self._config.get('VAULT_WATCH_POLL_INTERVAL', 2.0)
+        )
     
     @classmethod
-    def initialize(cls, vault_path: Path, security_context: SecurityContext) -> None:
+    def initialize(cls, vault_path: Path, security_context: SecurityContext,
+                   config: Optional[Dict[str, Any]] = None) -> None:
         """Initialize the project service."""
         cls._vault_path = vault_path
         cls._security_context = security_context
+        cls._config = config or {}
         if cls._instance is None:
             cls._instance = cls()
     
@@ -55,84 +88,123 @@ class ProjectService:
             raise ProjectServiceError("ProjectService not initialized")
         return cls._instance
     
-    def _invalidate_cache(self) -> None:
-        """Invalidate the projects cache."""
-        self._projects_cache.clear()
-        self._cache_timestamp = None
+    def start_watcher(self) -> None:
+        """Watch the vault so the project cache follows changes made on disk."""
+        self.watcher.start()
+        if self.watcher.running:
+            logger.info(f"Watching vault for changes ({self.watcher.backend})")
+    
+    def _invalidate_project(self, project_name: Optional[str]) -> None:
+        """Drop one cached project (or all of them with None) so it is reloaded from disk."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            if project_name is None:
+                self._projects_cache.clear()
+                self._stale.clear()
+                self._cache_loaded = False
+            else:
+                self._projects_cache.pop(project_name, None)
+                self._stale.add(project_name)
+        StateVersionService.get_instance().bump_project(project_name)
     
     def get_all_projects(self) -> List[Project]:
-        """Get all projects by scanning vault directory with caching."""
+        """Get all projects, from the cache while the vault watcher runs."""
         try:
-            # Check if cache is valid
-            current_time = time.time()
-            if (self._cache_timestamp and 
-                current_time - self._cache_timestamp < self._cache_ttl and 
-                self._projects_cache):
-                return self._projects_cache.copy()
-            
-            projects = []
-            
-            # Scan vault directory for project folders
-            if not self.vault_path.exists():
-                return projects
-            
-            for item in self.vault_path.iterdir():
-                # Skip data directory and files
-                if item.name == 'data' or item.is_file():
-                    continue
-                    
-                if item.is_dir():
-                    try:
-                        project = self._create_project_from_directory(item)
-                        if project:
-                            projects.append(project)
-                    except Exception as e:
-                        logger.warning(f"Could not load project from {item.name}: {e}")
-                        continue
-            
-            # Update cache
-            self._projects_cache = projects.copy()
-            self._cache_timestamp = current_time
-            
-            return projects
+            if not self.watcher.running:
+                return self._scan_vault()
+            
+            with self._cache_lock:
+                loaded = self._cache_loaded
+                stale = list(self._stale)
+                generation = self._cache_generation
+            
+            if not loaded:
+                projects = self._scan_vault()
+                with self._cache_lock:
+                    if generation == self._cache_generation:
+                        self._projects_cache = {project.name: project for project in projects}
+                        self._stale.clear()
+                        self._cache_loaded = True
+                return [replace(project) for project in projects]
+            
+            # Reload only the projects that changed since the last call
+            for project_name in stale:
+                self.get_project(project_name)
+            
+            with self._cache_lock:
+                return [replace(project) for project in self._projects_cache.values()]
         except Exception as e:
             logger.error(f"Error getting projects: {e}")
             return []
     
     def get_project(self, project_name: str) -> Optional[Project]:
-        """Get a specific project by scanning vault directory."""
+        """Get a specific project, a dictionary lookup once it is cached."""
         try:
-            project_path = self.vault_path / project_name
-            if project_path.exists() and project_path.is_dir():
-                return self._create_project_from_directory(project_path)
-            return None
+            if not self.watcher.running:
+                return self._load_project(project_name)
+            
+            with self._cache_lock:
+                project = self._projects_cache.get(project_name)
+                if project is not None:
+                    return replace(project)
+                if self._cache_loaded and project_name not in self._stale:
+                    return None
+                generation = self._cache_generation
+            
+            project = self._load_project(project_name)
+            with self._cache_lock:
+                # Keep it only if nothing was invalidated while reading the disk
+                if generation == self._cache_generation:
+                    self._stale.discard(project_name)
+                    if project is not None:
+                        self._projects_cache[project_name] = project
+            return replace(project) if project is not None else None
         except Exception as e:
             logger.error(f"Error getting project {project_name}: {e}")
             return None
     
+    def _scan_vault(self) -> List[Project]:
+        """Load every project by scanning the vault directory."""
+        projects = []
+        
+        if not self.vault_path.exists():
+            return projects
+        
+        for item in self.vault_path.iterdir():
+            # Skip data directory, hidden directories (partial clones, trash) and files
+            if item.name == 'data' or item.name.startswith('.') or item.is_file():
+                continue
+            
+            if item.is_dir():
+                try:
+                    project = self._create_project_from_directory(item)
+                    if project:
+                        projects.append(project)
+                except Exception as e:
+                    logger.warning(f"Could not load project from {item.name}: {e}")
+                    continue
+        
+        return projects
+    
+    def _load_project(self, project_name: str) -> Optional[Project]:
+        """Load one project from its directory."""
+        if not project_name or project_name.startswith('.') or project_name == 'data':
+            return None
+        project_path = self.vault_path / project_name
+        if project_path.exists() and project_path.is_dir():
+            return self._create_project_from_directory(project_path)
+        return None
+    
     def _create_project_from_directory(self, project_path: Path) -> Optional[Project]:
         """Create a Project object from a directory."""
         try:
             project_name = project_path.name
             
-            # Only try to get GitHub URL if really needed and cache it
+            # Read the remote URL from .git/config instead of forking git
             github_url = "unknown"
-            if (project_path / '.git').exists():
-                # For performance, we could cache this or load it lazily
-                # For now, we'll keep it simple but add timeout and error handling
-                try:
-                    result = subprocess.run(
-                        ['git', 'config', '--get', 'remote.origin.url'],
-                        cwd=project_path,
-                        capture_output=True,
-                        text=True,
-                        timeout=5  # Add timeout to prevent hanging
-                    )
-                    if result.returncode == 0:
-                        github_url = result.stdout.strip()
-                except (subprocess.TimeoutExpired, subprocess.CalledProcessError, Exception):
-                    # Don't fail the whole operation if git command fails
-                    github_url = "git-repository"
+            repo = git_dir(project_path)
+            if repo is not None:
+                github_url = remote_url(repo) or "git-repository"
             
             # Create project object
             project = Project(
@@ -147,8 +219,23 @@ class ProjectService:
             logger.error(f"Error creating project from directory {project_path}: {e}")
             return None
     
-    def create_project(self, github_url: str, project_name: Optional[str] = None) -> Project:
-        """Create a new project from GitHub URL."""
+    def create_project(self, github_url: str, project_name: Optional[str] = None) -> Job:
+        """
+        Create a new project from a repository URL.
+        
+        The project name is resolved and reserved right away, the clone runs
+        as a background job.
+        
+        Args:
+            github_url: Repository URL or local repository path
+            project_name: Project name, defaults to the repository name
+        
+        Returns:
+            Clone job, its project_name is the final project name
+        
+        Raises:
+            ProjectServiceError: If the URL or name is invalid
+        """
         try:
             # Validate repository URL
             from deployer.utils.validators import validate_github_url
@@ -166,62 +253,73 @@ class ProjectService:
                 raise ProjectServiceError("Project name is required")
             
             project_name = project_name.strip()
-            original_project_name = project_name
             
             # Create project directory
             project_path = self.vault_path / project_name
+            needs_clone = True
+            
+            if project_path.exists() and project_path.is_dir() and (project_path / '.git').exists():
+                # This looks like an existing git repository: register it without cloning
+                logger.info(f"Found existing repository at {project_path}, importing it")
+                needs_clone = False
+            elif self._name_taken(project_name):
+                # Generate a unique name
+                counter = 1
+                original_name = project_name
+                while self._name_taken(project_name):
+                    project_name = f"{original_name}-{counter}"
+                    counter += 1
+                
+                project_path = self.vault_path / project_name
+                logger.info(f"Directory '{original_name}' exists, using '{project_name}' instead")
             
-            if project_path.exists():
-                # If directory exists but project is not registered, offer to import it
-                if project_path.is_dir() and (project_path / '.git').exists():
-                    # This looks like an existing git repository
-                    logger.info(f"Found existing repository at {project_path}, importing it")
-                    # Don't clone, just register the existing project
-                else:
-                    # Generate a unique name
-                    counter = 1
-                    original_name = project_name
-                    while project_path.exists():
-                        project_name = f"{original_name}-{counter}"
-                        project_path = self.vault_path / project_name
-                        counter += 1
-                    
-                    logger.info(f"Directory '{original_name}' exists, using '{project_name}' instead")
-                    # Clone repository with new name
-                    self._clone_repository(github_url, project_path)
-            else:
-                # Clone repository normally
-                self._clone_repository(github_url, project_path)
-            
-            # Create project object
-            project = Project(
-                name=project_name,
-                path=str(project_path),
-                github_url=github_url
-            )
-            
-            # Add creation log
-            self.log_storage.add_log_entry(
-                project_name,
-                f"Project created from {github_url}",
-                'INFO',
-                'project_service'
+            def clone(job: Job) -> Dict[str, Any]:
+                if needs_clone:
+                    self._clone_repository(github_url, project_path, job)
+                
+                # Add creation log
+                self.log_storage.add_log_entry(
+                    project_name,
+                    f"Project created from {github_url}",
+                    'INFO',
+                    'project_service'
+                )
+                
+                logger.info(f"Project '{project_name}' created successfully")
+                
+                # Invalidate cache since we added a new project
+                self._invalidate_project(project_name)
+                self._disk_changed(project_name)
+                LifecycleService.get_instance().publish('created', project_name, github_url=github_url)
+                
+                return {
+                    'project_name': project_name,
+                    'path': str(project_path),
+                    'warmup': self._prepare(job, project_name, project_path)
+                }
+            
+            return JobService.get_instance().submit(
+                'clone', project_name, clone, description=f"Clone {github_url}"
             )
-            
-            logger.info(f"Project '{project_name}' created successfully")
-            
-            # Invalidate cache since we added a new project
-            self._invalidate_cache()
-            
-            return project
-            
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Git clone failed: {e}")
-            raise ProjectServiceError(f"Failed to clone repository: {e}")
+        
+        except ProjectServiceError:
+            raise
         except Exception as e:
             logger.error(f"Error creating project: {e}")
             raise ProjectServiceError(f"Failed to create project: {e}")
     
+    def _name_taken(self, project_name: str) -> bool:
+        """Check whether a project name is used by a directory or a pending clone."""
+        return (
+            (self.vault_path / project_name).exists()
+            or self._partial_path(project_name).exists()
+            or JobService.get_instance().has_active_job(project_name, 'clone')
+        )
+    
+    def _partial_path(self, project_name: str) -> Path:
+        """Directory a project is cloned into before it becomes visible."""
+        return self.vault_path / f'.{project_name}.partial'
+    
     def delete_project(self, project_name: str) -> bool:
         """Delete a project."""
         try:
@@ -229,6 +327,9 @@ class ProjectService:
             if not project_path.exists():
                 raise ProjectServiceError(f"Project '{project_name}' not found")
             
+            # Cancel queued and running jobs of the project
+            JobService.get_instance().cancel_project_jobs(project_name)
+            
             # Stop project if running
             from deployer.services.process_service import ProcessService
             try:
@@ -238,17 +339,21 @@ class ProjectService:
             except Exception as e:
                 logger.warning(f"Could not stop running project: {e}")
             
-            # Remove project directory
+            # Move the directory to the trash, the reaper deletes it later
             if project_path.exists():
-                shutil.rmtree(project_path)
+                TrashService.get_instance().move_to_trash(project_path, project_name)
+            self._invalidate_project(project_name)
+            LifecycleService.get_instance().publish('deleted', project_name)
             
             # Remove logs
             self.log_storage.delete_project_logs(project_name)
             
-            logger.info(f"Project '{project_name}' deleted successfully")
+            # Forget stored state (replicas, probes, install fingerprint, warm-up)
+            self.project_storage.delete_project(project_name)
+            GitStatusService.get_instance().forget(project_name)
+            DiskUsageService.get_instance().forget(project_name)
             
-            # Invalidate cache since we deleted a project
-            self._invalidate_cache()
+            logger.info(f"Project '{project_name}' deleted successfully")
             
             return True
             
@@ -262,49 +367,70 @@ class ProjectService:
         # Status is now managed in memory by ProcessService, no need to persist
         return True
     
-    def create_venv(self, project_name: str) -> bool:
-        """Create virtual environment for project."""
-        try:
-            project = self.get_project(project_name)
-            if not project:
-                raise ProjectServiceError(f"Project '{project_name}' not found")
-            
-            if project.has_venv:
-                raise ProjectServiceError("Virtual environment already exists")
-            
-            project_path = Path(project.path)
-            venv_path = project_path / 'venv'
-            
-            # Create virtual environment
-            result = subprocess.run(
-                ['python3', '-m', 'venv', str(venv_path)],
-                cwd=project_path,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                raise ProjectServiceError(f"Failed to create venv: {result.stderr}")
-            
-            self.log_storage.add_log_entry(
-                project_name,
-                "Virtual environment created successfully",
-                'INFO',
-                'project_service'
+    def create_venv(self, project_name: str) -> Job:
+        """
+        Create virtual environment for project in a background job.
+        
+        When environment sharing is enabled and the requirements can be
+        shared, the project is attached to the shared environment for its
+        requirements (built with them installed, or reused) instead.
+        
+        Returns:
+            Venv creation job
+        
+        Raises:
+            ProjectServiceError: If the project is missing or already has a venv
+        """
+        project = self.get_project(project_name)
+        if not project:
+            raise ProjectServiceError(f"Project '{project_name}' not found")
+        
+        if project.has_venv:
+            raise ProjectServiceError("Virtual environment already exists")
+        
+        if JobService.get_instance().has_active_job(project_name, 'venv'):
+            raise ProjectServiceError("Virtual environment is already being created")
+        
+        project_path = Path(project.path)
+        venv_path = project_path / 'venv'
+        
+        env_service = EnvironmentService.get_instance()
+        requirements_file = self._find_requirements_file(project_path)
+        if env_service.can_share(requirements_file):
+            def attach(job: Job) -> Dict[str, Any]:
+                environment = env_service.attach(project_name, project_path, requirements_file, job)
+                self._invalidate_project(project_name)
+                LifecycleService.get_instance().publish('venv_created', project_name, shared=True)
+                self._disk_changed(project_name, 'venv')
+                self._disk_changed(None)
+                return {
+                    'venv_path': str(venv_path),
+                    'environment': environment,
+                    'warmup': self._prepare(job, project_name, project_path)
+                }
+            
+            return JobService.get_instance().submit(
+                'venv', project_name, attach, description="Shared environment attach"
             )
+        
+        def create(job: Job) -> Dict[str, Any]:
+            try:
+                job.run_command(['python3', '-m', 'venv', str(venv_path)], cwd=str(project_path))
+            except Exception:
+                # Do not leave a half-created venv behind
+                if venv_path.exists():
+                    shutil.rmtree(venv_path, ignore_errors=True)
+                raise
             
+            self._invalidate_project(project_name)
+            self._disk_changed(project_name, 'venv')
+            LifecycleService.get_instance().publish('venv_created', project_name, shared=False)
             logger.info(f"Virtual environment created for '{project_name}'")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error creating venv for {project_name}: {e}")
-            self.log_storage.add_log_entry(
-                project_name,
-                f"Failed to create virtual environment: {e}",
-                'ERROR',
-                'project_service'
-            )
-            return False
+            return {'venv_path': str(venv_path), 'warmup': self._prepare(job, project_name, project_path)}
+        
+        return JobService.get_instance().submit(
+            'venv', project_name, create, description="Virtual environment creation"
+        )
     
     def delete_venv(self, project_name: str) -> bool:
         """Delete virtual environment for project."""
@@ -317,16 +443,29 @@ class ProjectService:
                 raise ProjectServiceError("Virtual environment does not exist")
             
             project_path = Path(project.path)
-            venv_paths = [
-                project_path / 'venv',
-                project_path / '.venv',
-                project_path / 'env'
-            ]
+            
+            env_service = EnvironmentService.get_instance()
+            if env_service.is_attached(project_name):
+                # Only the link (or hardlinked copy) goes, the shared environment stays
+                env_service.detach(project_name, project_path)
+                venv_paths = []
+            else:
+                venv_paths = [
+                    project_path / 'venv',
+                    project_path / '.venv',
+                    project_path / 'env'
+                ]
             
             for venv_path in venv_paths:
                 if venv_path.exists():
-                    shutil.rmtree(venv_path)
+                    TrashService.get_instance().move_to_trash(venv_path, f"{project_name}-{venv_path.name}")
                     break
+            self._invalidate_project(project_name)
+            self._disk_changed(project_name, 'venv')
+            self._disk_changed(None)
+            
+            # The next install starts from an empty environment
+            self.project_storage.update_project_fields(project_name, install_fingerprint=None)
             
             self.log_storage.add_log_entry(
                 project_name,
@@ -342,67 +481,419 @@ class ProjectService:
             logger.error(f"Error deleting venv for {project_name}: {e}")
             return False
     
-    def install_requirements(self, project_name: str) -> bool:
-        """Install requirements for project."""
+    def install_requirements(self, project_name: str, force: bool = False) -> Job:
+        """
+        Install requirements for project in a background job.
+        
+        Args:
+            project_name: Project name
+            force: Reinstall even when the install fingerprint matches
+        
+        Returns:
+            Install job
+        
+        Raises:
+            ProjectServiceError: If the project or its requirements file is missing
+        """
+        project = self.get_project(project_name)
+        if not project:
+            raise ProjectServiceError(f"Project '{project_name}' not found")
+        
+        project_path = Path(project.path)
+        requirements_file = self._find_requirements_file(project_path)
+        
+        if not requirements_file:
+            raise ProjectServiceError("No requirements file found")
+        
+        def install(job: Job) -> Dict[str, Any]:
+            summary = self._install_dependencies(job, project_name, project_path,
+                                                 requirements_file, force=force)
+            self._disk_changed(project_name, 'venv')
+            self._disk_changed(None)
+            if summary['mode'] != 'skipped':
+                summary['warmup'] = self._prepare(job, project_name, project_path)
+            return {'requirements_file': requirements_file.name, **summary}
+        
+        return JobService.get_instance().submit(
+            'install', project_name, install,
+            description=f"Requirements install from {requirements_file.name}"
+        )
+    
+    @staticmethod
+    def _find_requirements_file(project_path: Path) -> Optional[Path]:
+        """Find the requirements file of a project."""
+        requirements_files = [
+            project_path / 'requirements.txt',
+            project_path / 'requirements.in'
+        ]
+        
+        for req_file in requirements_files:
+            if req_file.exists():
+                return req_file
+        return None
+    
+    def _install_dependencies(self, job: Job, project_name: str, project_path: Path,
+                              requirements_file: Path, force: bool = False) -> Dict[str, Any]:
+        """
+        Install a requirements file inside a job and publish ``install_finished``.
+        
+        Used by the install endpoint and by updates that change dependency
+        files, so every install reaches the lifecycle subscribers.
+        
+        Args:
+            job: Job running the install
+            project_name: Project name
+            project_path: Project directory
+            requirements_file: Requirements file to install
+            force: Reinstall the whole file even when nothing changed
+        
+        Returns:
+            Install summary
+        """
         try:
-            project = self.get_project(project_name)
-            if not project:
-                raise ProjectServiceError(f"Project '{project_name}' not found")
+            summary = self._install_requirements_file(job, project_name, project_path,
+                                                      requirements_file, force=force)
+        except Exception as e:
+            LifecycleService.get_instance().publish('install_finished', project_name,
+                                                    success=False, error=str(e))
+            raise
+        LifecycleService.get_instance().publish('install_finished', project_name,
+                                                success=True, mode=summary['mode'])
+        return summary
+    
+    def _install_requirements_file(self, job: Job, project_name: str, project_path: Path,
+                                   requirements_file: Path, force: bool = False) -> Dict[str, Any]:
+        """
+        Install a requirements file, skipping what is already installed.
+        
+        Project-local environments keep a fingerprint of the last successful
+        install (requirements, interpreter and ``pip freeze``). A matching
+        fingerprint skips pip entirely, and changed requirements only install
+        the lines that are new or no longer satisfied.
+        
+        Args:
+            job: Job running the install
+            project_name: Project name
+            project_path: Project directory
+            requirements_file: Requirements file to install
+            force: Reinstall the whole file even when nothing changed
+        
+        Returns:
+            Install summary
+        """
+        env_service = EnvironmentService.get_instance()
+        if env_service.is_attached(project_name):
+            if env_service.can_share(requirements_file):
+                # Switch to the shared environment matching the new requirements
+                info = env_service.attach(project_name, project_path, requirements_file, job)
+                return {'mode': 'shared', 'environment': info['key'], 'built': info['built']}
+            
+            job.log("Requirements reference local files, switching to a project-local environment")
+            env_service.detach(project_name, project_path)
+            job.run_command(['python3', '-m', 'venv', str(project_path / 'venv')], cwd=str(project_path))
+        
+        # Determine Python executable when the job starts (a venv job may run first)
+        project = self.get_project(project_name)
+        python_executable = str((project and project.get_venv_python()) or 'python3')
+        pip_env = env_service.pip_env()
+        
+        text = requirements_file.read_text(errors='replace')
+        lines = requirement_lines(text)
+        freeze = self._pip_freeze(python_executable, pip_env)
+        fingerprint = {
+            'requirements_hash': hashlib.sha256(text.encode()).hexdigest(),
+            'python': self._python_identity(python_executable),
+            'freeze_hash': hashlib.sha256(freeze.encode()).hexdigest()
+        }
+        previous = (self.project_storage.get_project(project_name) or {}).get('install_fingerprint') or {}
+        
+        if not force and all(previous.get(key) == value for key, value in fingerprint.items()):
+            job.log("Requirements unchanged since the last install, skipping")
+            return {'mode': 'skipped', 'installed': []}
+        
+        pending: Optional[List[str]] = None
+        if (not force and previous.get('python') == fingerprint['python']
+                and not needs_full_install(lines)):
+            installed = parse_freeze(freeze)
+            previous_lines = set(previous.get('lines', []))
+            pending = [line for line in lines
+                       if not self._requirement_satisfied(line, previous_lines, installed)]
+        
+        command = [python_executable, '-m', 'pip', 'install', '--progress-bar', 'off']
+        if pending is None:
+            job.run_command(command + ['-r', str(requirements_file)],
+                            cwd=str(project_path), env=pip_env)
+            mode = 'full'
+        elif pending:
+            job.log(f"Installing {len(pending)} changed requirement(s): {', '.join(pending)}")
+            job.run_command(command + pending, cwd=str(project_path), env=pip_env)
+            mode = 'incremental'
+        else:
+            job.log("All requirements already satisfied")
+            mode = 'incremental'
+        
+        fingerprint['freeze_hash'] = hashlib.sha256(
+            self._pip_freeze(python_executable, pip_env).encode()
+        ).hexdigest()
+        fingerprint['lines'] = lines
+        fingerprint['installed_at'] = datetime.now().isoformat()
+        self.project_storage.update_project_fields(project_name, install_fingerprint=fingerprint)
+        
+        logger.info(f"Requirements installed for '{project_name}' ({mode})")
+        return {'mode': mode, 'installed': lines if pending is None else pending}
+    
+    @staticmethod
+    def _requirement_satisfied(line: str, previous_lines: set, installed: Dict[str, str]) -> bool:
+        """Whether a requirement line is already met by the installed packages."""
+        name = requirement_name(line)
+        if not name or name not in installed:
+            return False
+        version = pinned_version(line)
+        if version:
+            return installed[name] == version
+        # Ranges are trusted only if the same line was installed before
+        return line in previous_lines
+    
+    @staticmethod
+    def _pip_freeze(python_executable: str, env: Dict[str, str]) -> str:
+        """Installed packages of an interpreter, as ``pip freeze`` output."""
+        result = subprocess.run(
+            [python_executable, '-m', 'pip', 'freeze', '--disable-pip-version-check'],
+            capture_output=True, text=True, env=env, timeout=120
+        )
+        return result.stdout if result.returncode == 0 else ''
+    
+    @staticmethod
+    def _python_identity(python_executable: str) -> str:
+        """Interpreter path and version, to notice a recreated or upgraded venv."""
+        result = subprocess.run(
+            [python_executable, '-c', 'import sys; print(sys.executable, sys.version)'],
+            capture_output=True, text=True, timeout=30
+        )
+        return result.stdout.strip() or python_executable
+    
+    def prepare_project(self, project_name: str, force: bool = False) -> Job:
+        """
+        Precompile a project and check its entry point in a background job.
+        
+        Args:
+            project_name: Project name
+            force: Repeat the import check even if it is cached for this commit
+        
+        Returns:
+            Prepare job
+        
+        Raises:
+            ProjectServiceError: If the project is missing or warm-up is disabled
+        """
+        project = self.get_project(project_name)
+        if not project:
+            raise ProjectServiceError(f"Project '{project_name}' not found")
+        
+        if not WarmupService.get_instance().enabled:
+            raise ProjectServiceError("Warm-up is disabled (WARMUP_ENABLED)")
+        
+        project_path = Path(project.path)
+        
+        def prepare(job: Job) -> Dict[str, Any]:
+            return self._prepare(job, project_name, project_path, force)
+        
+        return JobService.get_instance().submit(
+            'prepare', project_name, prepare, description="Bytecode precompilation and import check"
+        )
+    
+    def get_warmup_status(self, project_name: str) -> Dict[str, Any]:
+        """Get preparation state and cold/warm start times of a project."""
+        project = self.get_project(project_name)
+        if not project:
+            raise ProjectServiceError(f"Project '{project_name}' not found")
+        
+        return WarmupService.get_instance().get_status(project_name, Path(project.path))
+    
+    @staticmethod
+    def _disk_changed(project_name: Optional[str], *categories: str) -> None:
+        """Schedule a disk usage re-walk of what an operation touched (None: system entries)."""
+        DiskUsageService.get_instance().mark_changed(project_name, list(categories) or None)
+    
+    def _prepare(self, job: Job, project_name: str, project_path: Path,
+                 force: bool = False) -> Optional[Dict[str, Any]]:
+        """Run the warm-up stage inside a job when it is enabled."""
+        warmup_service = WarmupService.get_instance()
+        if not warmup_service.enabled:
+            return None
+        
+        project = self.get_project(project_name)
+        python_executable = str((project and project.get_venv_python()) or 'python3')
+        return warmup_service.prepare(project_name, project_path, python_executable, job, force)
+    
+    def update_project(self, project_name: str, ref: Optional[str] = None,
+                       restart_strategy: str = 'stop') -> Job:
+        """
+        Update a project from its remote in a background job.
+        
+        Fetches once, fast-forwards the current branch (or checks out ``ref``),
+        reinstalls requirements only if a dependency file changed and restarts
+        the project only if it is running and files changed. Each step's
+        duration is recorded in the job result.
+        
+        Args:
+            project_name: Name of project
+            ref: Branch, tag or commit to check out instead of fast-forwarding
+            restart_strategy: Restart strategy for running projects ('stop' or 'bluegreen')
+        
+        Returns:
+            Update job
+        
+        Raises:
+            ProjectServiceError: If the project is missing or not a git repository,
+                or the ref or restart strategy is invalid
+        """
+        project = self.get_project(project_name)
+        if not project:
+            raise ProjectServiceError(f"Project '{project_name}' not found")
+        
+        if not project.is_git:
+            raise ProjectServiceError("Project is not a git repository")
+        
+        if ref is not None and (not ref.strip() or ref.startswith('-')):
+            raise ProjectServiceError("Invalid ref")
+        
+        # Checked before any step runs: the restart comes last, after the new code is in place
+        from deployer.services.process_service import RESTART_STRATEGIES
+        if restart_strategy not in RESTART_STRATEGIES:
+            raise ProjectServiceError(f"strategy must be one of: {', '.join(RESTART_STRATEGIES)}")
+        
+        project_path = Path(project.path)
+        
+        def update(job: Job) -> Dict[str, Any]:
+            steps = {}
             
-            project_path = Path(project.path)
-            requirements_files = [
-                project_path / 'requirements.txt',
-                project_path / 'requirements.in'
-            ]
-            
-            requirements_file = None
-            for req_file in requirements_files:
-                if req_file.exists():
-                    requirements_file = req_file
-                    break
+            def timed(step: str, started: float) -> None:
+                steps[step] = round(time.monotonic() - started, 3)
             
-            if not requirements_file:
-                raise ProjectServiceError("No requirements file found")
+            started = time.monotonic()
+            job.run_command(['git', 'fetch', '--prune', 'origin'], cwd=str(project_path))
+            timed('fetch', started)
             
-            # Determine Python executable
-            python_executable = project.get_venv_python() or 'python3'
+            started = time.monotonic()
+            old_commit = self._git_output(project_path, 'rev-parse', 'HEAD')
+            if ref:
+                new_commit = self._checkout_ref(project_path, ref, job)
+            else:
+                new_commit = self._fast_forward(project_path, old_commit, job)
+            timed('checkout', started)
+            
+            started = time.monotonic()
+            changed_files = []
+            if new_commit != old_commit:
+                diff = self._git_output(project_path, 'diff', '--name-only', old_commit, new_commit)
+                changed_files = [line for line in diff.splitlines() if line]
+            timed('diff', started)
+            
+            result = {
+                'old_commit': old_commit,
+                'new_commit': new_commit,
+                'changed_files': changed_files[:200],
+                'changed_count': len(changed_files),
+                'dependencies_reinstalled': False,
+                'restarted': False,
+                'steps': steps
+            }
             
-            # Install requirements
-            result = subprocess.run(
-                [python_executable, '-m', 'pip', 'install', '-r', str(requirements_file)],
-                cwd=project_path,
-                capture_output=True,
-                text=True
-            )
+            if not changed_files:
+                job.log(f"Already up to date at {new_commit[:12]}")
+                return result
             
-            if result.returncode != 0:
-                raise ProjectServiceError(f"Failed to install requirements: {result.stderr}")
+            job.log(f"Updated {old_commit[:12]} -> {new_commit[:12]} ({len(changed_files)} files changed)")
             
-            self.log_storage.add_log_entry(
-                project_name,
-                f"Requirements installed from {requirements_file.name}",
-                'INFO',
-                'project_service'
-            )
+            if DEPENDENCY_FILES & set(changed_files):
+                requirements_file = self._find_requirements_file(project_path)
+                if requirements_file:
+                    started = time.monotonic()
+                    self._install_dependencies(job, project_name, project_path, requirements_file)
+                    timed('install', started)
+                    result['dependencies_reinstalled'] = True
             
-            logger.info(f"Requirements installed for '{project_name}'")
-            return True
+            # Compile the new code before the restart so replicas start warm
+            started = time.monotonic()
+            result['warmup'] = self._prepare(job, project_name, project_path)
+            timed('prepare', started)
             
-        except Exception as e:
-            logger.error(f"Error installing requirements for {project_name}: {e}")
-            self.log_storage.add_log_entry(
-                project_name,
-                f"Failed to install requirements: {e}",
-                'ERROR',
-                'project_service'
-            )
-            return False
+            from deployer.services.process_service import ProcessService
+            process_service = ProcessService.get_instance()
+            if process_service.is_project_running(project_name):
+                started = time.monotonic()
+                job.check_cancelled()
+                current = self.get_project(project_name) or project
+                process_service.restart_project(current, restart_strategy)
+                timed('restart', started)
+                result['restarted'] = True
+            
+            self._invalidate_project(project_name)
+            self._disk_changed(project_name, 'code', 'git', 'venv')
+            return result
+        
+        description = f"Update to {ref}" if ref else "Update"
+        return JobService.get_instance().submit('update', project_name, update, description=description)
+    
+    def _fast_forward(self, project_path: Path, old_commit: str, job: Job) -> str:
+        """Fast-forward the current branch to its upstream, returning the new HEAD."""
+        try:
+            upstream = self._git_output(project_path, 'rev-parse', '@{upstream}')
+        except ProjectServiceError:
+            raise ProjectServiceError("Current branch has no upstream, pass a ref to check out")
+        
+        if upstream == old_commit:
+            return old_commit
+        
+        job.run_command(['git', 'merge', '--ff-only', '@{upstream}'], cwd=str(project_path))
+        return self._git_output(project_path, 'rev-parse', 'HEAD')
     
-    def _clone_repository(self, github_url: str, target_path: Path) -> None:
-        """Clone a repository (local or remote)."""
+    def _checkout_ref(self, project_path: Path, ref: str, job: Job) -> str:
+        """Check out a branch, tag or commit, returning the new HEAD."""
+        try:
+            # Remote branch: keep a local branch of the same name tracking it
+            self._git_output(project_path, 'rev-parse', '--verify', f'refs/remotes/origin/{ref}')
+            command = ['git', 'checkout', '-B', ref, '--track', f'origin/{ref}']
+        except ProjectServiceError:
+            try:
+                commit = self._git_output(project_path, 'rev-parse', '--verify', f'{ref}^{{commit}}')
+            except ProjectServiceError:
+                raise ProjectServiceError(f"Unknown ref: {ref}")
+            command = ['git', 'checkout', '--detach', commit]
+        
+        job.run_command(command, cwd=str(project_path))
+        return self._git_output(project_path, 'rev-parse', 'HEAD')
+    
+    @staticmethod
+    def _git_output(project_path: Path, *args: str) -> str:
+        """Run a quick local git command and return its output."""
+        result = subprocess.run(
+            ['git'] + list(args),
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        if result.returncode != 0:
+            raise ProjectServiceError(result.stderr.strip() or f"git {args[0]} failed")
+        return result.stdout.strip()
+    
+    def _clone_repository(self, github_url: str, target_path: Path, job: Job) -> None:
+        """
+        Clone a repository (local or remote).
+        
+        Remote repositories are cloned from a shared bare mirror (or shallow /
+        partial, see GIT_CLONE_MODE), local ones by hardlinking their objects.
+        The clone is made in a hidden partial directory and renamed into place
+        once complete, so half-cloned projects never show up.
+        """
+        partial_path = self._partial_path(target_path.name)
         try:
             # Create parent directory if it doesn't exist
             target_path.parent.mkdir(parents=True, exist_ok=True)
+            if partial_path.exists():
+                shutil.rmtree(partial_path)
             
             # Handle local file paths
             if github_url.startswith('file://') or github_url.startswith('/'):
@@ -414,37 +905,18 @@ class ProjectService:
                 
                 if not (source_path / '.git').exists():
                     raise ProjectServiceError(f"Path is not a git repository: {local_path}")
-                
-                # Copy local repository
-                shutil.copytree(source_path, target_path)
-                logger.info(f"Copied local repository from {source_path} to {target_path}")
-                return
-            
-            # Clone remote repository
-            result = subprocess.run(
-                ['git', 'clone', github_url, str(target_path)],
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
-            
-            if result.returncode != 0:
-                if target_path.exists():
-                    shutil.rmtree(target_path)
-                raise subprocess.CalledProcessError(result.returncode, 'git clone', result.stderr)
             
-            logger.info(f"Successfully cloned {github_url} to {target_path}")
+            method = MirrorService.get_instance().clone(github_url, partial_path, job)
+            job.check_cancelled()
+            partial_path.rename(target_path)
             
-        except subprocess.TimeoutExpired:
-            if target_path.exists():
-                shutil.rmtree(target_path)
-            raise ProjectServiceError("Git clone timed out")
+            logger.info(f"Cloned {github_url} to {target_path} ({method})")
+        
         except FileNotFoundError:
             raise ProjectServiceError("Git is not installed or not in PATH")
-        except Exception as e:
-            if target_path.exists():
-                shutil.rmtree(target_path)
-            raise ProjectServiceError(f"Failed to clone repository: {e}")
+        finally:
+            if partial_path.exists():
+                shutil.rmtree(partial_path, ignore_errors=True)
     
     def get_project_stats(self) -> Dict[str, Any]:
         """Get project statistics."""
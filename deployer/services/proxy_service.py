@@ -0,0 +1,541 @@
+"""Built-in HTTP reverse proxy for deployed projects."""
+
+import http.client
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailers', 'transfer-encoding', 'upgrade'
+}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ProxyServiceError(Exception):
+    """Proxy service specific error."""
+    pass
+
+
+class UpstreamUnavailable(Exception):
+    """Raised when a request could not be delivered to any upstream."""
+    pass
+
+
+class Upstream:
+    """A project replica reachable on a local port, with a keep-alive pool."""
+
+    def __init__(self, host: str, port: int, max_idle: int = 32, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.active = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.closed = False
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    @property
+    def ejected(self) -> bool:
+        """Check if the upstream is currently ejected."""
+        return time.monotonic() < self.ejected_until
+
+    def acquire(self, fresh: bool = False) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        Take a pooled connection or open a new one.
+
+        Args:
+            fresh: Always open a new connection
+
+        Returns:
+            Connection and whether it was reused from the pool
+        """
+        with self._lock:
+            self.active += 1
+            self.requests += 1
+            if self._idle and not fresh:
+                return self._idle.pop(), True
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        """Return a connection to the pool (or close it)."""
+        with self._lock:
+            self.active -= 1
+            if reusable and not self.closed and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def report_success(self) -> None:
+        """Record a successful exchange."""
+        self.consecutive_failures = 0
+
+    def report_failure(self, eject_after: int, base_ejection: float) -> None:
+        """Record a failure and eject the upstream after too many in a row."""
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures < eject_after or self.ejected:
+                return
+            self.ejections += 1
+            self.ejected_until = time.monotonic() + base_ejection * min(self.ejections, 10)
+            self.consecutive_failures = 0
+            idle, self._idle = self._idle, []
+
+        for conn in idle:
+            conn.close()
+        logger.warning(f"Ejected upstream {self.host}:{self.port} after {eject_after} consecutive failures")
+
+    def close(self) -> None:
+        """Close all pooled connections; connections in use are closed when released."""
+        with self._lock:
+            self.closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            'port': self.port,
+            'active': self.active,
+            'idle': len(self._idle),
+            'requests': self.requests,
+            'failures': self.failures,
+            'ejections': self.ejections,
+            'ejected': self.ejected
+        }
+
+
+class RouteStats:
+    """Latency and throughput counters for one route."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency_total_ms = 0.0
+        self.latency_max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float, status: int, bytes_in: int, bytes_out: int) -> None:
+        """Record one proxied request."""
+        with self._lock:
+            self.requests += 1
+            if status >= 500:
+                self.errors += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.latency_total_ms += latency_ms
+            self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+            index = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if latency_ms <= bound),
+                         len(LATENCY_BUCKETS_MS))
+            self.buckets[index] += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Approximate a latency percentile from the histogram buckets."""
+        if not self.requests:
+            return None
+        target = self.requests * fraction
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return float(LATENCY_BUCKETS_MS[index]) if index < len(LATENCY_BUCKETS_MS) \
+                    else self.latency_max_ms
+        return self.latency_max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'requests_per_second': round(self.requests / elapsed, 3),
+            'latency_avg_ms': round(self.latency_total_ms / self.requests, 2) if self.requests else None,
+            'latency_p50_ms': self.percentile(0.5),
+            'latency_p95_ms': self.percentile(0.95),
+            'latency_max_ms': round(self.latency_max_ms, 2),
+            'latency_buckets_ms': dict(zip([str(b) for b in LATENCY_BUCKETS_MS] + ['inf'], self.buckets))
+        }
+
+
+class _PooledHTTPServer(HTTPServer):
+    """HTTP server handling connections on a bounded worker pool."""
+
+    def __init__(self, address, handler, workers: int):
+        super().__init__(address, handler)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='proxy')
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+
+class ProxyService:
+    """Reverse proxy routing ``/p/<project>/`` or a Host header to project replicas."""
+
+    _instance: Optional['ProxyService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.enabled = self._config.get('PROXY_ENABLED', False)
+        self.host = self._config.get('PROXY_HOST', '0.0.0.0')
+        self.port = self._config.get('PROXY_PORT', 8088)
+        self.workers = self._config.get('PROXY_WORKERS', 32)
+        self.domain = (self._config.get('PROXY_DOMAIN') or '').lower().lstrip('.')
+        self.balancer = self._config.get('PROXY_BALANCER', 'round_robin')
+        self.eject_after = self._config.get('PROXY_EJECT_AFTER', 5)
+        self.base_ejection = float(self._config.get('PROXY_EJECTION_SECONDS', 30))
+        self.upstream_host = '127.0.0.1'
+
+        if self.balancer not in ('round_robin', 'least_connections'):
+            raise ProxyServiceError(f"Unknown proxy balancer: {self.balancer}")
+
+        # (project, port) -> pool; a port reused by another replica gets a new one
+        self.upstreams: Dict[Tuple[str, int], Upstream] = {}
+        self.route_stats: Dict[str, RouteStats] = {}
+        self._counters: Dict[str, itertools.count] = {}
+        self._server: Optional[_PooledHTTPServer] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the proxy service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'ProxyService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise ProxyServiceError("ProxyService not initialized")
+        return cls._instance
+
+    def start(self) -> bool:
+        """
+        Start serving in a dedicated thread, separate from the Flask workers.
+
+        Returns:
+            True if the proxy is running
+        """
+        if not self.enabled or self._server is not None:
+            return self._server is not None
+
+        try:
+            self._server = _PooledHTTPServer((self.host, self.port), self._make_handler(), self.workers)
+        except OSError as e:
+            logger.error(f"Could not start proxy on {self.host}:{self.port}: {e}")
+            return False
+
+        thread = threading.Thread(target=self._server.serve_forever, name='proxy-acceptor', daemon=True)
+        thread.start()
+        logger.info(f"Reverse proxy listening on http://{self.host}:{self.port}")
+        return True
+
+    def stop(self) -> None:
+        """Stop the proxy and close upstream pools."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for upstream in list(self.upstreams.values()):
+            upstream.close()
+
+    def resolve(self, path: str, host_header: Optional[str]) -> Optional[Tuple[str, str, str]]:
+        """
+        Map a request to a project.
+
+        Args:
+            path: Request path including query string
+            host_header: Value of the Host header
+
+        Returns:
+            (project name, upstream path, stripped prefix) or None
+        """
+        if path.startswith('/p/'):
+            rest = path[3:]
+            name, sep, remainder = rest.partition('/')
+            name, qsep, query = name.partition('?')
+            if name:
+                upstream_path = '/' + remainder if sep else '/'
+                if qsep:
+                    upstream_path += '?' + query
+                return name, upstream_path, f'/p/{name}'
+
+        if self.domain and host_header:
+            host = host_header.split(':', 1)[0].lower()
+            suffix = '.' + self.domain
+            if host.endswith(suffix) and host != suffix:
+                return host[:-len(suffix)], path, ''
+
+        return None
+
+    def pick_upstream(self, project_name: str, exclude: Optional[set] = None) -> Optional[Upstream]:
+        """
+        Choose an upstream replica for a project.
+
+        Args:
+            project_name: Name of project
+            exclude: Ports already tried for this request
+
+        Returns:
+            Upstream, or None if the project has no replica
+        """
+        from deployer.services.process_service import ProcessService
+
+        ports = [p for p in ProcessService.get_instance().get_active_ports(project_name)
+                 if not exclude or p not in exclude]
+        if not ports:
+            return None
+
+        candidates = [self._get_upstream(project_name, port) for port in ports]
+        healthy = [u for u in candidates if not u.ejected]
+        # Panic mode: if every replica is ejected, try them anyway
+        candidates = healthy or candidates
+
+        if self.balancer == 'least_connections':
+            return min(candidates, key=lambda u: (u.active, u.requests))
+
+        counter = self._counters.setdefault(project_name, itertools.count())
+        return candidates[next(counter) % len(candidates)]
+
+    def get_inflight(self, project_name: str, ports: List[int]) -> int:
+        """Count requests in flight to the given ports of a project."""
+        upstreams = [self.upstreams.get((project_name, port)) for port in ports]
+        return sum(upstream.active for upstream in upstreams if upstream is not None)
+
+    def remove_upstream(self, project_name: str, port: int) -> None:
+        """Forget a stopped replica: close its pool and drop its ejection state."""
+        with self._lock:
+            upstream = self.upstreams.pop((project_name, port), None)
+        if upstream is not None:
+            upstream.close()
+
+    def record(self, project_name: str, latency_ms: float, status: int,
+               bytes_in: int, bytes_out: int) -> None:
+        """Record counters for a proxied request."""
+        stats = self.route_stats.get(project_name)
+        if stats is None:
+            with self._lock:
+                stats = self.route_stats.setdefault(project_name, RouteStats())
+        stats.record(latency_ms, status, bytes_in, bytes_out)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get proxy configuration, routes and upstream health."""
+        from deployer.services.process_service import ProcessService
+
+        process_service = ProcessService.get_instance()
+        routes = {}
+        for project_name in set(self.route_stats) | set(process_service.get_running_projects()):
+            stats = self.route_stats.get(project_name)
+            ports = process_service.get_active_ports(project_name)
+            routes[project_name] = {
+                'path': f'/p/{project_name}/',
+                'host': f'{project_name}.{self.domain}' if self.domain else None,
+                'stats': stats.to_dict() if stats else RouteStats().to_dict(),
+                'upstreams': [self._get_upstream(project_name, p).to_dict() for p in ports]
+            }
+
+        return {
+            'enabled': self.enabled,
+            'running': self._server is not None,
+            'listen': f'{self.host}:{self.port}',
+            'balancer': self.balancer,
+            'workers': self.workers,
+            'routes': routes
+        }
+
+    def _get_upstream(self, project_name: str, port: int) -> Upstream:
+        """Get or create the pool for a project's upstream port."""
+        key = (project_name, port)
+        upstream = self.upstreams.get(key)
+        if upstream is None:
+            with self._lock:
+                upstream = self.upstreams.setdefault(key, Upstream(self.upstream_host, port))
+        return upstream
+
+    def _make_handler(self):
+        """Create the request handler class bound to this service."""
+        service = self
+
+        class ProxyHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            server_version = 'DeployerProxy'
+            timeout = 60  # free the worker from idle keep-alive clients
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self._proxy()
+
+            do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_GET
+
+            def log_message(self, format, *args):
+                logger.debug("proxy %s - %s", self.address_string(), format % args)
+
+            def _proxy(self):
+                started = time.perf_counter()
+                route = service.resolve(self.path, self.headers.get('Host'))
+                if route is None:
+                    self._send_error(404, 'No route for request')
+                    return
+
+                project_name, upstream_path, prefix = route
+                body = self._read_body()
+                status = 502
+                bytes_out = 0
+                try:
+                    status, bytes_out = self._forward(project_name, upstream_path, prefix, body)
+                except UpstreamUnavailable as e:
+                    status = 503 if 'no replica' in str(e) else 502
+                    self._send_error(status, str(e))
+                finally:
+                    service.record(project_name, (time.perf_counter() - started) * 1000,
+                                   status, len(body or b''), bytes_out)
+
+            def _forward(self, project_name: str, path: str, prefix: str,
+                         body: Optional[bytes]) -> Tuple[int, int]:
+                headers = {k: v for k, v in self.headers.items()
+                           if k.lower() not in HOP_BY_HOP_HEADERS}
+                forwarded_for = self.headers.get('X-Forwarded-For')
+                client_ip = self.client_address[0]
+                headers['X-Forwarded-For'] = f'{forwarded_for}, {client_ip}' if forwarded_for else client_ip
+                headers['X-Forwarded-Host'] = self.headers.get('Host', '')
+                if prefix:
+                    headers['X-Forwarded-Prefix'] = prefix
+                if body is not None:
+                    headers['Content-Length'] = str(len(body))
+
+                tried = set()
+                attempts = 2 if self.command in IDEMPOTENT_METHODS else 1
+                for _ in range(attempts):
+                    upstream = service.pick_upstream(project_name, tried)
+                    if upstream is None:
+                        break
+
+                    response = None
+                    conn, reused = upstream.acquire()
+                    while response is None:
+                        try:
+                            conn.request(self.command, path, body=body, headers=headers)
+                            response = conn.getresponse()
+                        except (OSError, http.client.HTTPException):
+                            upstream.release(conn, reusable=False)
+                            if not reused:
+                                break
+                            # The upstream closed an idle pooled connection: the request
+                            # never reached it, so retry the same upstream on a new one
+                            conn, reused = upstream.acquire(fresh=True)
+
+                    if response is None:
+                        tried.add(upstream.port)
+                        upstream.report_failure(service.eject_after, service.base_ejection)
+                        continue
+
+                    try:
+                        bytes_out = self._relay(response)
+                    except (OSError, http.client.HTTPException):
+                        upstream.release(conn, reusable=False)
+                        self.close_connection = True
+                        return 502, 0
+
+                    upstream.release(conn, reusable=not response.will_close)
+                    if response.status >= 500:
+                        upstream.report_failure(service.eject_after, service.base_ejection)
+                    else:
+                        upstream.report_success()
+                    return response.status, bytes_out
+
+                if not tried:
+                    raise UpstreamUnavailable(f"Project '{project_name}' has no replica running")
+                raise UpstreamUnavailable(f"Upstream for '{project_name}' is unavailable")
+
+            def _relay(self, response: http.client.HTTPResponse) -> int:
+                """Stream an upstream response to the client."""
+                self.send_response_only(response.status, response.reason)
+                length = response.getheader('Content-Length')
+                has_body = self.command != 'HEAD' and response.status not in (204, 304)
+                chunked = length is None and has_body and self.request_version != 'HTTP/1.0'
+                if length is None and has_body and not chunked:
+                    # HTTP/1.0 clients: delimit the body by closing the connection
+                    self.close_connection = True
+                for key, value in response.getheaders():
+                    if key.lower() not in HOP_BY_HOP_HEADERS:
+                        self.send_header(key, value)
+                if chunked:
+                    self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+
+                sent = 0
+                while True:
+                    chunk = response.read1(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    sent += len(chunk)
+                    if chunked:
+                        self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                    else:
+                        self.wfile.write(chunk)
+                if chunked:
+                    self.wfile.write(b'0\r\n\r\n')
+                self.wfile.flush()
+                # Mark the response finished so the connection can be reused
+                response.close()
+                return sent
+
+            def _read_body(self) -> Optional[bytes]:
+                length = self.headers.get('Content-Length')
+                if length:
+                    return self.rfile.read(int(length))
+                if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+                    chunks = []
+                    while True:
+                        size = int(self.rfile.readline().split(b';', 1)[0].strip() or b'0', 16)
+                        if size == 0:
+                            self.rfile.readline()
+                            break
+                        chunks.append(self.rfile.read(size))
+                        self.rfile.readline()
+                    return b''.join(chunks)
+                return None
+
+            def _send_error(self, status: int, message: str) -> None:
+                payload = ('{"error": "%s"}' % message.replace('"', "'")).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(payload)
+
+        return ProxyHandler
@@ -0,0 +1,144 @@
+"""Readiness probes used to decide when a new replica can take traffic."""
+
+import http.client
+import socket
+import subprocess
+import time
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, Optional, Any
+
+PROBE_TYPES = ('tcp', 'http', 'process')
+
+
+class ReadinessError(Exception):
+    """Readiness probe specific error."""
+    pass
+
+
+@dataclass
+class ReadinessProbe:
+    """How to check that a replica is ready to serve."""
+
+    type: str = 'tcp'               # tcp connect, http GET, or process still alive
+    path: str = '/'                 # request path for http probes
+    timeout: float = 30.0           # seconds to wait for readiness before giving up
+    interval: float = 0.5           # seconds between attempts
+    initial_delay: float = 0.0      # seconds to wait before the first attempt
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert probe to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]],
+                  defaults: Optional['ReadinessProbe'] = None) -> 'ReadinessProbe':
+        """
+        Create a probe from a dictionary, validating every value.
+
+        Args:
+            data: Probe settings
+            defaults: Probe whose values fill in missing settings
+
+        Raises:
+            ReadinessError: If a value is invalid
+        """
+        data = data or {}
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ReadinessError(f"Unknown readiness settings: {', '.join(sorted(unknown))}")
+
+        merged = (defaults or cls()).to_dict()
+        merged.update({key: value for key, value in data.items() if value is not None})
+
+        try:
+            probe = cls(
+                type=str(merged['type']),
+                path=str(merged['path']),
+                timeout=float(merged['timeout']),
+                interval=float(merged['interval']),
+                initial_delay=float(merged['initial_delay'])
+            )
+        except (TypeError, ValueError) as e:
+            raise ReadinessError(f"Invalid readiness settings: {e}")
+
+        probe.validate()
+        return probe
+
+    def validate(self) -> None:
+        """Validate probe settings."""
+        if self.type not in PROBE_TYPES:
+            raise ReadinessError(f"type must be one of: {', '.join(PROBE_TYPES)}")
+        if not self.path.startswith('/'):
+            raise ReadinessError("path must start with '/'")
+        if self.timeout <= 0:
+            raise ReadinessError("timeout must be positive")
+        if self.interval <= 0:
+            raise ReadinessError("interval must be positive")
+        if self.initial_delay < 0:
+            raise ReadinessError("initial_delay cannot be negative")
+
+    def check(self, host: str, port: Optional[int]) -> bool:
+        """
+        Run a single probe attempt.
+
+        Args:
+            host: Host the replica listens on
+            port: Port of the replica
+
+        Returns:
+            True if the replica answered
+        """
+        if self.type == 'process':
+            return True
+        if port is None:
+            return False
+
+        attempt_timeout = max(min(self.interval * 4, 5.0), 0.5)
+
+        if self.type == 'tcp':
+            try:
+                with socket.create_connection((host, port), timeout=attempt_timeout):
+                    return True
+            except OSError:
+                return False
+
+        connection = http.client.HTTPConnection(host, port, timeout=attempt_timeout)
+        try:
+            connection.request('GET', self.path, headers={'User-Agent': 'deployer-readiness'})
+            response = connection.getresponse()
+            response.read()
+            return 200 <= response.status < 400
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            connection.close()
+
+    def wait_until_ready(self, process: subprocess.Popen, host: str,
+                         port: Optional[int]) -> None:
+        """
+        Block until the replica passes the probe.
+
+        Args:
+            process: Replica process, must stay alive while waiting
+            host: Host the replica listens on
+            port: Port of the replica
+
+        Raises:
+            ReadinessError: If the process exits or the timeout expires
+        """
+        deadline = time.monotonic() + self.timeout
+        if self.initial_delay:
+            time.sleep(min(self.initial_delay, self.timeout))
+
+        while True:
+            if process.poll() is not None:
+                raise ReadinessError(f"process exited with code {process.returncode}")
+            if self.check(host, port):
+                # The process may have crashed while answering the probe
+                if process.poll() is None:
+                    return
+                raise ReadinessError(f"process exited with code {process.returncode}")
+            if time.monotonic() >= deadline:
+                raise ReadinessError(f"not ready after {self.timeout:g}s ({self.type} probe)")
+            time.sleep(self.interval)
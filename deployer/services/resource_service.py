@@ -0,0 +1,713 @@
+"""Per-project resource limits using cgroup v2 with a nice/ionice fallback."""
+
+import logging
+import math
+import os
+import re
+import resource
+import shutil
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Callable
+
+from deployer.storage.json_storage import get_project_storage
+
+logger = logging.getLogger(__name__)
+
+CGROUP_CONTROLLERS = ('cpu', 'memory', 'pids')
+CPU_PERIOD_USEC = 100000
+
+# Limits each cgroup controller enforces
+CONTROLLER_FIELDS = {
+    'cpu': ('cpu_quota', 'cpu_weight'),
+    'memory': ('memory_max', 'memory_high'),
+    'pids': ('pids_max',),
+}
+
+# Presets applied to fields that a project does not set explicitly
+PRIORITY_CLASSES = {
+    'high': {'cpu_weight': 400, 'nice': -5, 'ionice_class': 2, 'ionice_level': 0},
+    'normal': {'cpu_weight': 100, 'nice': 0, 'ionice_class': 2, 'ionice_level': 4},
+    'low': {'cpu_weight': 25, 'nice': 10, 'ionice_class': 2, 'ionice_level': 7},
+    'idle': {'cpu_weight': 1, 'nice': 19, 'ionice_class': 3, 'ionice_level': None},
+}
+
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+class ResourceServiceError(Exception):
+    """Resource service specific error."""
+    pass
+
+
+def parse_size(value: Any) -> Optional[int]:
+    """
+    Parse a memory size into bytes.
+
+    Args:
+        value: Integer byte count or string such as ``512M`` or ``2G``
+
+    Returns:
+        Size in bytes, or None if no value was given
+
+    Raises:
+        ResourceServiceError: If the value cannot be parsed
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*$', str(value).upper())
+    if not match:
+        raise ResourceServiceError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def weight_to_nice(weight: int) -> int:
+    """Map a cgroup cpu.weight to the closest nice value (100 == nice 0)."""
+    # Each nice step is roughly a 1.25x change in scheduler weight
+    nice = round(-math.log(max(weight, 1) / 100) / math.log(1.25))
+    return max(-20, min(19, nice))
+
+
+@dataclass
+class ResourceLimits:
+    """Resource limits for a project's processes."""
+
+    priority_class: Optional[str] = None
+    cpu_quota: Optional[float] = None       # CPU cores, e.g. 1.5
+    cpu_weight: Optional[int] = None        # cgroup cpu.weight, 1-10000
+    memory_max: Optional[int] = None        # bytes, hard limit
+    memory_high: Optional[int] = None       # bytes, throttling threshold
+    pids_max: Optional[int] = None
+    address_space_max: Optional[int] = None  # bytes of virtual memory (RLIMIT_AS), not RSS
+    nice: Optional[int] = None
+    ionice_class: Optional[int] = None      # 1 realtime, 2 best-effort, 3 idle
+    ionice_level: Optional[int] = None      # 0 (highest) - 7 (lowest)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert limits to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'ResourceLimits':
+        """
+        Create limits from a dictionary, validating every value.
+
+        Raises:
+            ResourceServiceError: If a value is invalid
+        """
+        data = data or {}
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ResourceServiceError(f"Unknown resource limits: {', '.join(sorted(unknown))}")
+
+        try:
+            limits = cls(
+                priority_class=data.get('priority_class') or None,
+                cpu_quota=float(data['cpu_quota']) if data.get('cpu_quota') not in (None, '') else None,
+                cpu_weight=int(data['cpu_weight']) if data.get('cpu_weight') not in (None, '') else None,
+                memory_max=parse_size(data.get('memory_max')),
+                memory_high=parse_size(data.get('memory_high')),
+                pids_max=int(data['pids_max']) if data.get('pids_max') not in (None, '') else None,
+                address_space_max=parse_size(data.get('address_space_max')),
+                nice=int(data['nice']) if data.get('nice') not in (None, '') else None,
+                ionice_class=int(data['ionice_class']) if data.get('ionice_class') not in (None, '') else None,
+                ionice_level=int(data['ionice_level']) if data.get('ionice_level') not in (None, '') else None,
+            )
+        except (TypeError, ValueError) as e:
+            raise ResourceServiceError(f"Invalid resource limits: {e}")
+
+        limits.validate()
+        return limits
+
+    def validate(self) -> None:
+        """Validate limit ranges."""
+        if self.priority_class is not None and self.priority_class not in PRIORITY_CLASSES:
+            raise ResourceServiceError(
+                f"priority_class must be one of: {', '.join(PRIORITY_CLASSES)}"
+            )
+        if self.cpu_quota is not None and self.cpu_quota <= 0:
+            raise ResourceServiceError("cpu_quota must be positive")
+        if self.cpu_weight is not None and not 1 <= self.cpu_weight <= 10000:
+            raise ResourceServiceError("cpu_weight must be between 1 and 10000")
+        if self.pids_max is not None and self.pids_max < 1:
+            raise ResourceServiceError("pids_max must be positive")
+        if self.address_space_max is not None and self.address_space_max < 1:
+            raise ResourceServiceError("address_space_max must be positive")
+        if self.nice is not None and not -20 <= self.nice <= 19:
+            raise ResourceServiceError("nice must be between -20 and 19")
+        if self.ionice_class is not None and self.ionice_class not in (1, 2, 3):
+            raise ResourceServiceError("ionice_class must be 1, 2 or 3")
+        if self.ionice_level is not None and not 0 <= self.ionice_level <= 7:
+            raise ResourceServiceError("ionice_level must be between 0 and 7")
+
+    def resolved(self) -> 'ResourceLimits':
+        """Return a copy with priority class presets filled in."""
+        data = self.to_dict()
+        preset = PRIORITY_CLASSES.get(self.priority_class or '', {})
+        for key, value in preset.items():
+            if data.get(key) is None:
+                data[key] = value
+        return ResourceLimits(**data)
+
+    def merged_with(self, defaults: 'ResourceLimits') -> 'ResourceLimits':
+        """Return a copy where unset fields fall back to defaults."""
+        data = self.to_dict()
+        for key, value in defaults.to_dict().items():
+            if data.get(key) is None:
+                data[key] = value
+        return ResourceLimits(**data)
+
+
+class LaunchSpec:
+    """How to launch a process so that its resource limits apply."""
+
+    def __init__(self, command_prefix: List[str], preexec_fn: Optional[Callable[[], None]],
+                 cgroup_path: Optional[Path], enforced: List[str]):
+        self.command_prefix = command_prefix
+        self.preexec_fn = preexec_fn
+        self.cgroup_path = cgroup_path
+        self.enforced = enforced
+
+    def wrap_command(self, command: List[str]) -> List[str]:
+        """Prefix the command with any wrapper (e.g. ionice)."""
+        return self.command_prefix + command
+
+
+class ResourceService:
+    """Service applying and reporting per-project resource limits."""
+
+    _instance: Optional['ResourceService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.backend = 'none'
+        self.cgroup_root: Optional[Path] = None
+        self.controllers: List[str] = []
+        self.default_limits = ResourceLimits.from_dict({
+            'memory_max': self._config.get('DEFAULT_MEMORY_MAX') or None,
+            'pids_max': self._config.get('DEFAULT_PIDS_MAX') or None,
+        })
+        self.oom_events: deque = deque(maxlen=100)
+        self._oom_counts: Dict[str, int] = {}
+        self._cgroups: Dict[str, Path] = {}
+        self._enforced: Dict[str, List[str]] = {}
+        # Limits applied at a weaker value than configured, per project
+        self._clamped: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._ionice = shutil.which('ionice')
+
+        requested = self._config.get('RESOURCE_BACKEND', 'auto')
+        if requested in ('auto', 'cgroup'):
+            self.cgroup_root = self._setup_cgroup_root()
+            if self.cgroup_root is not None:
+                self.backend = 'cgroup'
+            elif requested == 'cgroup':
+                logger.warning("cgroup v2 is not writable, falling back to rlimits")
+        if self.backend == 'none' and requested != 'none':
+            self.backend = 'rlimit'
+
+        logger.info(f"Resource limit backend: {self.backend}")
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the resource service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'ResourceService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise ResourceServiceError("ResourceService not initialized")
+        return cls._instance
+
+    # ------------------------------------------------------------------
+    # Limit configuration
+    # ------------------------------------------------------------------
+
+    def get_limits(self, project_name: str) -> ResourceLimits:
+        """Get the configured limits for a project."""
+        project_data = get_project_storage().get_project(project_name) or {}
+        try:
+            limits = ResourceLimits.from_dict(project_data.get('resource_limits'))
+        except ResourceServiceError as e:
+            logger.warning(f"Ignoring invalid resource limits for {project_name}: {e}")
+            limits = ResourceLimits()
+        return limits
+
+    def get_effective_limits(self, project_name: str) -> ResourceLimits:
+        """Get the limits that will actually be applied to a project."""
+        return self.get_limits(project_name).merged_with(self.default_limits).resolved()
+
+    def set_limits(self, project_name: str, data: Dict[str, Any]) -> ResourceLimits:
+        """
+        Store limits for a project and apply them live where possible.
+
+        Args:
+            project_name: Name of project
+            data: Limit values
+
+        Returns:
+            The stored limits
+
+        Raises:
+            ResourceServiceError: If the limits are invalid
+        """
+        limits = ResourceLimits.from_dict(data)
+        get_project_storage().update_project_fields(
+            project_name,
+            resource_limits={k: v for k, v in limits.to_dict().items() if v is not None}
+        )
+
+        # cgroup limits can be changed on a running process
+        cgroup_path = self._cgroups.get(project_name)
+        if cgroup_path is not None:
+            self._write_cgroup_limits(cgroup_path, self.get_effective_limits(project_name))
+
+        return limits
+
+    # ------------------------------------------------------------------
+    # Launching
+    # ------------------------------------------------------------------
+
+    def prepare_launch(self, project_name: str) -> LaunchSpec:
+        """
+        Prepare limits for a process about to be started.
+
+        Args:
+            project_name: Name of project
+
+        Returns:
+            LaunchSpec to pass into Popen
+        """
+        limits = self.get_effective_limits(project_name)
+        command_prefix: List[str] = []
+        enforced: List[str] = []
+        cgroup_procs: Optional[bytes] = None
+        rlimits: List[tuple] = []
+        cgroup_path = None
+
+        if self.backend == 'cgroup':
+            cgroup_path = self._create_project_cgroup(project_name, limits)
+            if cgroup_path is not None:
+                cgroup_procs = str(cgroup_path / 'cgroup.procs').encode()
+                enforced.extend(self._cgroup_enforced(limits))
+
+        if self.backend != 'none' and limits.address_space_max is not None:
+            # Virtual address space, an explicit opt-in: it is no substitute for
+            # memory_max, since runtimes reserve far more than they touch
+            rlimits.append((resource.RLIMIT_AS, limits.address_space_max))
+            enforced.append('address_space_max')
+
+        nice = limits.nice
+        if nice is None and limits.cpu_weight is not None and cgroup_path is None:
+            nice = weight_to_nice(limits.cpu_weight)
+        clamped: Dict[str, int] = {}
+        if self.backend != 'none' and nice is not None:
+            # Only root may lower niceness: report the value actually applied
+            if os.geteuid() != 0 and nice < os.nice(0):
+                nice = os.nice(0)
+                clamped['nice'] = nice
+            else:
+                enforced.append('nice')
+        else:
+            nice = None
+
+        if self.backend != 'none' and limits.ionice_class is not None and self._ionice:
+            command_prefix = [self._ionice, '-c', str(limits.ionice_class)]
+            if limits.ionice_level is not None and limits.ionice_class != 3:
+                command_prefix += ['-n', str(limits.ionice_level)]
+            enforced.append('ionice')
+
+        preexec_fn = None
+        if cgroup_procs or rlimits or nice:
+            preexec_fn = self._build_preexec(cgroup_procs, rlimits, nice)
+
+        self._enforced[project_name] = enforced
+        self._clamped[project_name] = clamped
+        if clamped:
+            logger.warning(f"{project_name}: nice clamped to {clamped['nice']} (only root may lower it)")
+        unenforced = self._unenforced(limits, cgroup_path is not None)
+        if unenforced:
+            logger.warning(f"{project_name}: limits not enforced without cgroup v2 controllers: "
+                           f"{', '.join(unenforced)}")
+
+        return LaunchSpec(command_prefix, preexec_fn, cgroup_path, enforced)
+
+    @staticmethod
+    def _build_preexec(cgroup_procs: Optional[bytes], rlimits: List[tuple],
+                       nice: Optional[int]) -> Callable[[], None]:
+        """Build a preexec_fn that runs in the child between fork and exec."""
+
+        def preexec():
+            # Keep this to raw syscalls: the parent is multi-threaded
+            if cgroup_procs:
+                try:
+                    fd = os.open(cgroup_procs, os.O_WRONLY)
+                    try:
+                        os.write(fd, b'0')
+                    finally:
+                        os.close(fd)
+                except OSError:
+                    pass
+            for limit, value in rlimits:
+                try:
+                    resource.setrlimit(limit, (value, value))
+                except (ValueError, OSError):
+                    pass
+            if nice:
+                try:
+                    os.nice(nice - os.nice(0))
+                except OSError:
+                    pass
+
+        return preexec
+
+    def release(self, project_name: str) -> None:
+        """Release resources held for a project after its process exited."""
+        self.check_oom(project_name)
+        with self._lock:
+            cgroup_path = self._cgroups.pop(project_name, None)
+            self._oom_counts.pop(project_name, None)
+            self._enforced.pop(project_name, None)
+            self._clamped.pop(project_name, None)
+        if cgroup_path is not None:
+            try:
+                cgroup_path.rmdir()
+            except OSError as e:
+                logger.debug(f"Could not remove cgroup {cgroup_path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def get_report(self, project_name: str, pids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Report current usage against the configured limits.
+
+        Args:
+            project_name: Name of project
+            pids: Root PIDs of the project's processes (used without cgroups)
+
+        Returns:
+            Dictionary with limits, usage and OOM information
+        """
+        limits = self.get_effective_limits(project_name)
+        cgroup_path = self._cgroups.get(project_name)
+
+        # Running projects have their cgroup or not; others would get one if the backend is cgroup
+        in_cgroup = cgroup_path is not None if project_name in self._enforced else self.backend == 'cgroup'
+
+        if cgroup_path is not None:
+            usage = self._read_cgroup_usage(cgroup_path)
+        elif pids:
+            usage = self._read_proc_usage(pids)
+        else:
+            usage = {}
+
+        percent = {}
+        if usage.get('memory_bytes') is not None and limits.memory_max:
+            percent['memory'] = round(usage['memory_bytes'] / limits.memory_max * 100, 1)
+        if usage.get('pids') is not None and limits.pids_max:
+            percent['pids'] = round(usage['pids'] / limits.pids_max * 100, 1)
+
+        return {
+            'backend': 'cgroup' if cgroup_path is not None else self.backend,
+            'limits': self.get_limits(project_name).to_dict(),
+            'effective_limits': limits.to_dict(),
+            'enforced': self._enforced.get(project_name, []),
+            'clamped': self._clamped.get(project_name, {}),
+            'unenforced': self._unenforced(limits, in_cgroup),
+            'usage': usage,
+            'percent': percent,
+            'oom_events': [e for e in self.oom_events if e['project_name'] == project_name]
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get backend information and recent OOM events."""
+        return {
+            'backend': self.backend,
+            'cgroup_root': str(self.cgroup_root) if self.cgroup_root else None,
+            'controllers': self.controllers,
+            'ionice_available': bool(self._ionice),
+            'default_limits': self.default_limits.to_dict(),
+            'unenforced_defaults': self._unenforced(self.default_limits.resolved(), self.backend == 'cgroup'),
+            'managed_cgroups': sorted(self._cgroups),
+            'oom_events': list(self.oom_events)
+        }
+
+    def poll_oom_events(self) -> None:
+        """Check every managed cgroup for new OOM kills."""
+        for project_name in list(self._cgroups):
+            self.check_oom(project_name)
+
+    def check_oom(self, project_name: str) -> None:
+        """Check a project's cgroup for new OOM kills and surface them."""
+        cgroup_path = self._cgroups.get(project_name)
+        if cgroup_path is None:
+            return
+
+        events = self._read_keyed_file(cgroup_path / 'memory.events')
+        oom_kills = events.get('oom_kill', 0)
+        with self._lock:
+            previous = self._oom_counts.get(project_name, 0)
+            self._oom_counts[project_name] = oom_kills
+
+        if oom_kills > previous:
+            self._record_oom(project_name, oom_kills - previous, suspected=False)
+
+    def record_exit(self, project_name: str, returncode: Optional[int]) -> None:
+        """Record an unexpected process exit that looks like an OOM kill."""
+        if project_name in self._cgroups:
+            self.check_oom(project_name)
+        elif returncode == -9:
+            # Without cgroups an unrequested SIGKILL is most likely the kernel OOM killer
+            self._record_oom(project_name, 1, suspected=True)
+
+    def _record_oom(self, project_name: str, count: int, suspected: bool) -> None:
+        """Store an OOM event and notify log and WebSocket clients."""
+        limits = self.get_effective_limits(project_name)
+        event = {
+            'project_name': project_name,
+            'timestamp': datetime.now().isoformat(),
+            'oom_kills': count,
+            'memory_max': limits.memory_max,
+            'suspected': suspected
+        }
+        self.oom_events.append(event)
+
+        message = (f"Process killed by SIGKILL, possibly out of memory" if suspected
+                   else f"Out of memory: {count} process(es) killed "
+                        f"(memory_max={limits.memory_max})")
+        logger.warning(f"{project_name}: {message}")
+
+        from deployer.services.log_service import LogService
+        LogService.add_log_entry(project_name, message, 'ERROR')
+
+        try:
+            from deployer.websocket.events import broadcast_project_status
+            broadcast_project_status(project_name, {'event': 'oom_kill', **event})
+        except Exception as e:
+            logger.debug(f"Could not broadcast OOM event: {e}")
+
+    # ------------------------------------------------------------------
+    # cgroup v2 helpers
+    # ------------------------------------------------------------------
+
+    def _setup_cgroup_root(self) -> Optional[Path]:
+        """Find or create a writable cgroup v2 subtree for projects."""
+        try:
+            base = self._find_own_cgroup()
+            if base is None:
+                return None
+
+            available = (base / 'cgroup.controllers').read_text().split()
+            controllers = [c for c in CGROUP_CONTROLLERS if c in available]
+            if not controllers or not os.access(base, os.W_OK):
+                return None
+
+            # cgroup v2 only allows controllers in cgroups without member processes,
+            # so move ourselves into a leaf before enabling them. Other processes
+            # are never moved: their cgroup is not ours to reorganize
+            own_pid = str(os.getpid())
+            procs = (base / 'cgroup.procs').read_text().split()
+            if procs and base != Path(self._mount_point() or '/'):
+                if set(procs) - {own_pid}:
+                    logger.info(f"cgroup {base} is shared with other processes and not delegated "
+                                f"to the deployer; set CGROUP_ROOT to a delegated subtree")
+                    return None
+                supervisor = base / 'deployer-supervisor'
+                supervisor.mkdir(exist_ok=True)
+                (supervisor / 'cgroup.procs').write_text(own_pid)
+
+            self._enable_controllers(base, controllers)
+            projects_root = base / 'deployer-projects'
+            projects_root.mkdir(exist_ok=True)
+            self._enable_controllers(projects_root, controllers)
+
+            self.controllers = controllers
+            return projects_root
+
+        except OSError as e:
+            logger.info(f"cgroup v2 not usable: {e}")
+            return None
+
+    def _find_own_cgroup(self) -> Optional[Path]:
+        """Locate the configured cgroup or the one this process lives in."""
+        configured = self._config.get('CGROUP_ROOT')
+        if configured:
+            path = Path(configured)
+            path.mkdir(parents=True, exist_ok=True)
+            return path
+
+        mount_point = self._mount_point()
+        if mount_point is None:
+            return None
+
+        with open('/proc/self/cgroup') as f:
+            for line in f:
+                hierarchy, _, rest = line.strip().partition(':')
+                controllers, _, path = rest.partition(':')
+                if hierarchy == '0' and controllers == '':
+                    return Path(mount_point) / path.lstrip('/')
+        return None
+
+    @staticmethod
+    def _mount_point() -> Optional[str]:
+        """Find the cgroup2 mount point."""
+        try:
+            with open('/proc/self/mounts') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) > 2 and parts[2] == 'cgroup2':
+                        return parts[1]
+        except OSError:
+            pass
+        return None
+
+    @staticmethod
+    def _enable_controllers(path: Path, controllers: List[str]) -> None:
+        """Enable controllers for the children of a cgroup."""
+        enabled = (path / 'cgroup.subtree_control').read_text().split()
+        missing = [c for c in controllers if c not in enabled]
+        if missing:
+            (path / 'cgroup.subtree_control').write_text(' '.join(f'+{c}' for c in missing))
+
+    def _create_project_cgroup(self, project_name: str, limits: ResourceLimits) -> Optional[Path]:
+        """Create (or reuse) a project's cgroup and write its limits."""
+        cgroup_path = self.cgroup_root / project_name
+        try:
+            cgroup_path.mkdir(exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not create cgroup for {project_name}: {e}")
+            return None
+
+        self._write_cgroup_limits(cgroup_path, limits)
+        with self._lock:
+            self._cgroups[project_name] = cgroup_path
+            events = self._read_keyed_file(cgroup_path / 'memory.events')
+            self._oom_counts[project_name] = events.get('oom_kill', 0)
+        return cgroup_path
+
+    def _write_cgroup_limits(self, cgroup_path: Path, limits: ResourceLimits) -> None:
+        """Write limits into cgroup interface files."""
+        values = {}
+        if 'cpu' in self.controllers:
+            quota = ('max' if limits.cpu_quota is None
+                     else str(int(limits.cpu_quota * CPU_PERIOD_USEC)))
+            values['cpu.max'] = f"{quota} {CPU_PERIOD_USEC}"
+            values['cpu.weight'] = str(limits.cpu_weight or 100)
+        if 'memory' in self.controllers:
+            values['memory.max'] = str(limits.memory_max or 'max')
+            values['memory.high'] = str(limits.memory_high or 'max')
+        if 'pids' in self.controllers:
+            values['pids.max'] = str(limits.pids_max or 'max')
+
+        for filename, value in values.items():
+            try:
+                (cgroup_path / filename).write_text(value)
+            except OSError as e:
+                logger.warning(f"Could not write {filename}={value} for {cgroup_path.name}: {e}")
+
+    def _cgroup_enforced(self, limits: ResourceLimits) -> List[str]:
+        """List which limits the available cgroup controllers enforce."""
+        return [name for controller in self.controllers
+                for name in CONTROLLER_FIELDS[controller]
+                if getattr(limits, name) is not None]
+
+    def _unenforced(self, limits: ResourceLimits, in_cgroup: bool) -> List[str]:
+        """
+        List the limits that are set but that nothing enforces.
+
+        Memory, pids and CPU quota limits need their cgroup v2 controller;
+        there is no per-process fallback for them.
+
+        Args:
+            limits: Effective limits
+            in_cgroup: Whether the process runs in a project cgroup
+        """
+        supported = set()
+        if self.backend != 'none':
+            supported.update(('nice', 'address_space_max'))
+            if self._ionice:
+                supported.update(('ionice_class', 'ionice_level'))
+            if in_cgroup:
+                supported.update(name for controller in self.controllers for name in CONTROLLER_FIELDS[controller])
+            else:
+                supported.add('cpu_weight')  # Mapped to a nice value
+        return [name for name, value in limits.to_dict().items()
+                if value is not None and name != 'priority_class' and name not in supported]
+
+    def _read_cgroup_usage(self, cgroup_path: Path) -> Dict[str, Any]:
+        """Read current usage from cgroup interface files."""
+        cpu_stat = self._read_keyed_file(cgroup_path / 'cpu.stat')
+        events = self._read_keyed_file(cgroup_path / 'memory.events')
+        return {
+            'memory_bytes': self._read_int(cgroup_path / 'memory.current'),
+            'cpu_seconds': (cpu_stat['usage_usec'] / 1e6) if 'usage_usec' in cpu_stat else None,
+            'cpu_throttled_seconds': (cpu_stat['throttled_usec'] / 1e6)
+                                     if 'throttled_usec' in cpu_stat else None,
+            'pids': self._read_int(cgroup_path / 'pids.current'),
+            'memory_high_events': events.get('high'),
+            'oom_kills': events.get('oom_kill'),
+        }
+
+    @staticmethod
+    def _read_proc_usage(pids: List[int]) -> Dict[str, Any]:
+        """Sum usage of processes and their descendants from /proc."""
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        ticks = os.sysconf('SC_CLK_TCK')
+        seen = set()
+        pending = list(pids)
+        memory = 0
+        cpu_ticks = 0
+
+        while pending:
+            pid = pending.pop()
+            if pid in seen:
+                continue
+            seen.add(pid)
+            try:
+                with open(f'/proc/{pid}/stat') as f:
+                    stat = f.read().rsplit(')', 1)[1].split()
+                cpu_ticks += int(stat[11]) + int(stat[12])
+                memory += int(stat[21]) * page_size
+                for task in os.listdir(f'/proc/{pid}/task'):
+                    with open(f'/proc/{pid}/task/{task}/children') as f:
+                        pending.extend(int(child) for child in f.read().split())
+            except (OSError, IndexError, ValueError):
+                continue
+
+        return {
+            'memory_bytes': memory,
+            'cpu_seconds': round(cpu_ticks / ticks, 2),
+            'pids': len(seen),
+        }
+
+    @staticmethod
+    def _read_int(path: Path) -> Optional[int]:
+        """Read an integer interface file."""
+        try:
+            return int(path.read_text().strip())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _read_keyed_file(path: Path) -> Dict[str, int]:
+        """Read a ``key value`` per line interface file."""
+        values = {}
+        try:
+            for line in path.read_text().splitlines():
+                key, _, value = line.partition(' ')
+                values[key] = int(value)
+        except (OSError, ValueError):
+            pass
+        return values
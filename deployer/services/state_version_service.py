@@ -0,0 +1,92 @@
+"""Change counters for projects and logs, used as HTTP validators."""
+
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Any, Tuple
+
+# (sequence number, wall-clock time of the change)
+Version = Tuple[int, float]
+
+
+class StateVersionServiceError(Exception):
+    """State version service specific error."""
+    pass
+
+
+class StateVersionService:
+    """
+    Counts changes so read endpoints can answer conditional requests cheaply.
+
+    Every mutation takes the next number of one process-wide sequence. A
+    project change (start, stop, create, delete, venv, install, update or a
+    change seen on disk) records it as that project's version and as the
+    global version; a log line records it as the project's log version.
+    Versions only ever grow, so an ETag made of the process epoch and a
+    version changes whenever the data behind it may have changed, also
+    across restarts.
+    """
+
+    _instance: Optional['StateVersionService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        started: Version = (0, time.time())
+        self._sequence = 0
+        self._global = started
+        self._all_projects = started
+        self._projects: Dict[str, Version] = {}
+        self._logs: Dict[str, Version] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the state version service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'StateVersionService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise StateVersionServiceError("StateVersionService not initialized")
+        return cls._instance
+
+    def bump_project(self, project_name: Optional[str]) -> None:
+        """Record a change of one project, or of every project with None."""
+        with self._lock:
+            version = self._next()
+            self._global = version
+            if project_name is None:
+                self._all_projects = version
+            else:
+                self._projects[project_name] = version
+
+    def bump_logs(self, project_name: str) -> None:
+        """Record a new log line of a project."""
+        with self._lock:
+            self._logs[project_name] = self._next()
+
+    def global_version(self) -> Version:
+        """Version of the project list."""
+        return self._global
+
+    def project_version(self, project_name: str) -> Version:
+        """Version of one project."""
+        return max(self._projects.get(project_name, self._all_projects), self._all_projects)
+
+    def log_version(self, project_name: str) -> Version:
+        """Version of a project's logs (which also depend on its replicas)."""
+        return max(self._logs.get(project_name, self._all_projects),
+                   self.project_version(project_name))
+
+    def etag(self, version: Version) -> str:
+        """Strong entity tag of a version."""
+        return f"{self.epoch}-{version[0]}"
+
+    def _next(self) -> Version:
+        """Take the next sequence number (caller holds the lock)."""
+        self._sequence += 1
+        return self._sequence, time.time()
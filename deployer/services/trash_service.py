@@ -0,0 +1,206 @@
+"""Vault trash: instant deletes by rename, reclaimed by a throttled background reaper."""
+
+import ctypes
+import logging
+import os
+import platform
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# ioprio_set syscall numbers, used to put the reaper in the idle I/O class
+_IOPRIO_SET = {'x86_64': 251, 'aarch64': 30, 'i686': 289, 'armv7l': 314}
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_WHO_PROCESS = 1
+
+
+class TrashServiceError(Exception):
+    """Trash service specific error."""
+    pass
+
+
+class TrashService:
+    """Moves deleted directories into ``vault/.trash`` and removes them in the background."""
+
+    _instance: Optional['TrashService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.trash_path = Path(self._config.get('VAULT_PATH', 'vault')) / '.trash'
+        self.batch = max(self._config.get('TRASH_REAP_BATCH', 500), 1)
+        self.pause = self._config.get('TRASH_REAP_PAUSE', 0.05)
+        self.interval = self._config.get('TRASH_REAP_INTERVAL', 30)
+        self._wakeup = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+        self._reclaimed = 0
+        self._listeners: List[Callable[[], None]] = []
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the trash service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'TrashService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise TrashServiceError("TrashService not initialized")
+        return cls._instance
+
+    def move_to_trash(self, path: Path, label: str) -> Optional[Path]:
+        """
+        Move a directory into the trash with a single rename.
+
+        Falls back to deleting in place when the directory lives on another
+        filesystem than the vault.
+
+        Args:
+            path: Directory to delete
+            label: Readable prefix of the trash entry, e.g. the project name
+
+        Returns:
+            Trash entry, or None if the directory was deleted in place
+        """
+        self.trash_path.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        target = self.trash_path / f"{label.replace('/', '_')}-{stamp}-{uuid.uuid4().hex[:8]}"
+        try:
+            os.rename(path, target)
+        except OSError as e:
+            logger.warning(f"Could not move {path} to trash ({e}), deleting in place")
+            shutil.rmtree(path)
+            return None
+
+        self._wakeup.set()
+        return target
+
+    def start_reaper(self) -> None:
+        """Empty the trash in a low-priority background thread."""
+        if self._reaper is not None:
+            return
+
+        def reap_loop():
+            self._lower_priority()
+            while True:
+                try:
+                    self.reap()
+                except Exception as e:
+                    logger.error(f"Error emptying trash: {e}")
+                self._wakeup.wait(self.interval)
+                self._wakeup.clear()
+
+        self._reaper = threading.Thread(target=reap_loop, daemon=True, name='trash-reaper')
+        self._reaper.start()
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Call back after the reaper removed entries."""
+        self._listeners.append(callback)
+
+    def reap(self) -> int:
+        """
+        Remove every trash entry, pausing between batches of files.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for entry in self._entries():
+            self._remove_throttled(entry)
+            removed += 1
+        self._reclaimed += removed
+        if removed:
+            for callback in self._listeners:
+                callback()
+        return removed
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get pending trash entries and reaper settings."""
+        now = time.time()
+        entries = []
+        for entry in self._entries():
+            try:
+                age = now - entry.lstat().st_ctime  # rename updates ctime
+            except OSError:
+                continue
+            entries.append({'name': entry.name, 'age_seconds': round(age, 1)})
+        return {
+            'path': str(self.trash_path),
+            'pending': entries,
+            'reclaimed': self._reclaimed,
+            'batch': self.batch,
+            'pause_seconds': self.pause
+        }
+
+    def _entries(self) -> List[Path]:
+        """List trash entries, oldest first."""
+        if not self.trash_path.exists():
+            return []
+        return sorted(self.trash_path.iterdir(), key=lambda p: p.name.rsplit('-', 2)[-2:])
+
+    def _remove_throttled(self, entry: Path) -> None:
+        """Delete a tree bottom-up, sleeping after every batch of unlinks."""
+        if entry.is_symlink() or not entry.is_dir():
+            entry.unlink(missing_ok=True)
+            return
+
+        count = 0
+        for root, dirs, files in os.walk(entry, topdown=False):
+            for name in files:
+                self._unlink(os.path.join(root, name))
+                count += 1
+                if count % self.batch == 0:
+                    time.sleep(self.pause)
+            for name in dirs:
+                path = os.path.join(root, name)
+                if os.path.islink(path):
+                    self._unlink(path)
+                else:
+                    try:
+                        os.rmdir(path)
+                    except OSError:
+                        pass  # Not empty: a file could not be removed
+        # Whatever the walk could not remove (permissions, races) goes here
+        shutil.rmtree(entry, ignore_errors=True)
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        """Remove a file, making its directory writable if needed."""
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            try:
+                os.chmod(os.path.dirname(path), 0o700)
+                os.unlink(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _lower_priority() -> None:
+        """Drop the calling thread to the lowest CPU and idle I/O priority (Linux)."""
+        if not hasattr(os, 'setpriority') or not hasattr(threading, 'get_native_id'):
+            return
+        tid = threading.get_native_id()
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, 19)
+        except OSError:
+            pass
+
+        syscall = _IOPRIO_SET.get(platform.machine())
+        if syscall is None:
+            return
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.syscall(syscall, _IOPRIO_WHO_PROCESS, tid, _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT)
+        except (OSError, AttributeError):
+            pass
@@ -0,0 +1,260 @@
+"""Vault directory watcher: inotify (via ctypes) with a stat-polling fallback."""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WATCH_MODES = ('auto', 'inotify', 'poll', 'off')
+
+# Entries of a project directory that change what a Project reports
+MARKER_NAMES = frozenset({
+    '__init__.py', '.git', 'venv', '.venv', 'env',
+    'requirements.txt', 'requirements.in', 'pyproject.toml'
+})
+
+# Vault entries that are never projects
+IGNORED_ENTRIES = frozenset({'data'})
+
+# inotify event masks (linux/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_ENTRY_CHANGES = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def is_project_entry(name: str) -> bool:
+    """Whether a vault entry name can be a project directory."""
+    return bool(name) and not name.startswith('.') and name not in IGNORED_ENTRIES
+
+
+class VaultWatcher:
+    """
+    Reports which projects of the vault changed on disk.
+
+    The callback receives a project name when that project's directory
+    appeared, disappeared or had one of its marker files (``__init__.py``,
+    ``.git/config``, the venv or the requirements files) changed, and None
+    when everything must be reloaded.
+    """
+
+    def __init__(self, vault_path: Path, on_change: Callable[[Optional[str]], None],
+                 mode: str = 'auto', poll_interval: float = 2.0):
+        if mode not in WATCH_MODES:
+            raise ValueError(f"VAULT_WATCH must be one of: {', '.join(WATCH_MODES)}")
+        self.vault_path = Path(vault_path)
+        self.on_change = on_change
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.backend: Optional[str] = None
+        self._listeners: List[Callable[[Optional[str]], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._fd: Optional[int] = None
+        self._libc = None
+        # watch descriptor -> (project name or None for the vault root, is .git dir)
+        self._watches: Dict[int, Tuple[Optional[str], bool]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether changes are being reported."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start watching in a daemon thread."""
+        if self.running or self.mode == 'off':
+            return
+        self.vault_path.mkdir(parents=True, exist_ok=True)
+
+        if self.mode in ('auto', 'inotify') and self._start_inotify():
+            self.backend = 'inotify'
+            target = self._inotify_loop
+        elif self.mode == 'inotify':
+            logger.warning("inotify is unavailable, watching the vault by polling")
+            self.backend = 'poll'
+            target = self._poll_loop
+        else:
+            self.backend = 'poll'
+            target = self._poll_loop
+
+        self._thread = threading.Thread(target=target, daemon=True, name='vault-watcher')
+        self._thread.start()
+
+    def add_listener(self, callback: Callable[[Optional[str]], None]) -> None:
+        """Also report changes to another callback (same arguments as on_change)."""
+        self._listeners.append(callback)
+
+    def _notify(self, project: Optional[str]) -> None:
+        """Report a change to the owner and every listener."""
+        self.on_change(project)
+        for callback in self._listeners:
+            try:
+                callback(project)
+            except Exception as e:
+                logger.error(f"Error in vault change listener: {e}")
+
+    # inotify backend
+
+    def _start_inotify(self) -> bool:
+        """Create the inotify instance and watch the vault and every project."""
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return False
+        if fd < 0:
+            return False
+
+        self._libc, self._fd = libc, fd
+        try:
+            self._add_watch(self.vault_path, None, False, _ENTRY_CHANGES | IN_ONLYDIR)
+            for entry in self.vault_path.iterdir():
+                if is_project_entry(entry.name) and entry.is_dir():
+                    self._watch_project(entry.name)
+        except OSError as e:
+            logger.warning(f"Could not watch the vault with inotify: {e}")
+            os.close(fd)
+            self._libc, self._fd = None, None
+            self._watches.clear()
+            return False
+        return True
+
+    def _add_watch(self, path: Path, project: Optional[str], is_git: bool, mask: int) -> None:
+        """Add an inotify watch, raising OSError on failure."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"{os.strerror(err)}: {path}")
+        with self._lock:
+            self._watches[wd] = (project, is_git)
+
+    def _watch_project(self, name: str) -> None:
+        """Watch a project's top-level entries and its .git/config."""
+        project_path = self.vault_path / name
+        try:
+            self._add_watch(project_path, name, False,
+                            _ENTRY_CHANGES | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise  # Out of watches: the caller falls back to polling
+            return  # Removed meanwhile
+        self._watch_git_dir(name)
+
+    def _watch_git_dir(self, name: str) -> None:
+        """Watch .git for config rewrites (git replaces it with a rename)."""
+        git_path = self.vault_path / name / '.git'
+        if git_path.is_dir():
+            try:
+                self._add_watch(git_path, name, True, IN_CLOSE_WRITE | IN_MOVED_TO | IN_ONLYDIR)
+            except OSError:
+                pass
+
+    def _inotify_loop(self) -> None:
+        """Read and dispatch inotify events."""
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except InterruptedError:
+                continue
+            except OSError as e:
+                logger.error(f"Vault watcher stopped: {e}")
+                return
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode(errors='surrogateescape')
+                offset += length
+                try:
+                    self._handle_event(wd, mask, name)
+                except Exception as e:
+                    logger.error(f"Error handling vault event: {e}")
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        """Translate one inotify event into a change notification."""
+        if mask & IN_Q_OVERFLOW:
+            self._notify(None)
+            return
+
+        with self._lock:
+            watch = self._watches.get(wd)
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+        if watch is None or mask & IN_IGNORED:
+            return
+
+        project, is_git = watch
+        if project is None:
+            # Vault root: a project directory appeared or went away
+            if not is_project_entry(name):
+                return
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self._watch_project(name)
+                except OSError as e:
+                    logger.warning(f"Could not watch project {name}: {e}")
+            self._notify(name)
+        elif is_git:
+            if name == 'config':
+                self._notify(project)
+        elif mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            self._notify(project)
+        elif name in MARKER_NAMES:
+            if name == '.git' and mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch_git_dir(project)
+            self._notify(project)
+
+    # Polling backend
+
+    def _poll_loop(self) -> None:
+        """Compare stat snapshots of the vault every poll_interval seconds."""
+        previous = self._snapshot()
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                current = self._snapshot()
+            except OSError as e:
+                logger.error(f"Error polling the vault: {e}")
+                continue
+            for name in previous.keys() | current.keys():
+                if previous.get(name) != current.get(name):
+                    self._notify(name)
+            previous = current
+
+    def _snapshot(self) -> Dict[str, Tuple]:
+        """Per project, the identity and change time of each marker entry."""
+        snapshot = {}
+        if not self.vault_path.exists():
+            return snapshot
+        for entry in os.scandir(self.vault_path):
+            if not is_project_entry(entry.name) or not entry.is_dir():
+                continue
+            markers = []
+            for marker in sorted(MARKER_NAMES) + ['.git/config']:
+                try:
+                    st = os.lstat(os.path.join(entry.path, marker))
+                    markers.append((marker, st.st_ino, st.st_ctime_ns))
+                except OSError:
+                    pass
+            snapshot[entry.name] = (entry.inode(), tuple(markers))
+        return snapshot
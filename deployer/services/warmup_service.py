@@ -0,0 +1,261 @@
+"""Deploy-time warm-up: bytecode precompilation, import checks and start timings."""
+
+import hashlib
+import json
+import logging
+import subprocess
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from deployer.services.job_service import JobServiceError
+from deployer.storage.json_storage import get_project_storage
+from deployer.utils.git_refs import git_dir, read_head
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT = '__init__.py'
+
+# Start durations kept per kind (cold / warm)
+START_SAMPLES = 20
+
+# Directories compileall should never descend into
+COMPILE_EXCLUDE = r'[/\\](\.git|\.hg|node_modules|__pycache__)([/\\]|$)'
+
+# Imports every top-level absolute import of the entry point without running
+# it. Modules of the project itself are only located, never imported: importing
+# them would run project code. Its venv (sys.prefix) does not count as project.
+IMPORT_CHECK = '''
+import ast, importlib, importlib.util, json, os, sys
+project = os.path.realpath(os.getcwd())
+environment = os.path.realpath(sys.prefix)
+def inside(path, root):
+    return os.path.realpath(path).startswith(root + os.sep)
+def is_local(name):
+    spec = importlib.util.find_spec(name.partition('.')[0])
+    paths = list(spec.submodule_search_locations or []) if spec else []
+    if spec and spec.has_location:
+        paths.append(spec.origin)
+    return any(inside(path, project) and not inside(path, environment) for path in paths)
+with open(sys.argv[1], 'rb') as f:
+    tree = ast.parse(f.read(), sys.argv[1])
+names = []
+for node in tree.body:
+    if isinstance(node, ast.Import):
+        names.extend(alias.name for alias in node.names)
+    elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+        names.append(node.module)
+failed = {}
+local = 0
+for name in dict.fromkeys(names):
+    try:
+        if is_local(name):
+            local += 1
+            continue
+        importlib.import_module(name)
+    except BaseException as e:
+        failed[name] = f"{type(e).__name__}: {e}"
+print(json.dumps({'modules': len(names), 'local': local, 'failed': failed}))
+'''
+
+
+class WarmupServiceError(Exception):
+    """Warm-up service specific error."""
+    pass
+
+
+class WarmupService:
+    """Prepares projects so their first start does not pay for compilation."""
+
+    _instance: Optional['WarmupService'] = None
+    _config: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.enabled = self._config.get('WARMUP_ENABLED', True)
+        self.workers = self._config.get('WARMUP_WORKERS', 0)
+        self.import_timeout = self._config.get('WARMUP_IMPORT_TIMEOUT', 30)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def initialize(cls, config: Dict[str, Any]) -> None:
+        """Initialize the warm-up service with configuration."""
+        cls._config = config
+        if cls._instance is None:
+            cls._instance = cls()
+
+    @classmethod
+    def get_instance(cls) -> 'WarmupService':
+        """Get the singleton instance."""
+        if cls._instance is None:
+            raise WarmupServiceError("WarmupService not initialized")
+        return cls._instance
+
+    def prepare(self, project_name: str, project_path: Path, python_executable: str,
+                job, force: bool = False) -> Dict[str, Any]:
+        """
+        Precompile a project and its venv and check that its entry point imports.
+
+        compileall runs on all cores and skips files whose bytecode is current.
+        It does not follow symlinked directories, so a venv linked to a shared
+        environment is compiled through its resolved path. The import check
+        runs in a short-lived interpreter and its result is cached per commit,
+        interpreter and installed package set. It imports the third-party and
+        standard library modules the entry point names; the project's own
+        modules are only located, so no project code runs.
+
+        Args:
+            project_name: Name of project
+            project_path: Project directory (a venv inside it is compiled too)
+            python_executable: Interpreter the project runs with
+            job: Job used to run and stream commands
+            force: Repeat the import check even if a cached result exists
+
+        Returns:
+            Preparation summary
+        """
+        commit = self._head_commit(project_path)
+        state = self._state(project_name)
+
+        targets = [str(project_path)]
+        venv_path = project_path / 'venv'
+        if venv_path.is_symlink() and venv_path.is_dir():
+            targets.append(str(venv_path.resolve()))
+
+        started = time.monotonic()
+        compiled = True
+        try:
+            job.run_command(
+                [python_executable, '-m', 'compileall', '-q', '-j', str(self.workers),
+                 '-x', COMPILE_EXCLUDE, *targets],
+                cwd=str(project_path)
+            )
+        except JobServiceError as e:
+            # Syntax errors in some files must not block the deploy
+            compiled = False
+            job.log(f"Some files could not be compiled: {e}")
+        compile_seconds = round(time.monotonic() - started, 3)
+
+        check_key = self._check_key(commit, project_path, python_executable)
+        import_check = state.get('import_check') or {}
+        if force or import_check.get('key') != check_key:
+            import_check = self._check_imports(project_path, python_executable)
+            import_check['key'] = check_key
+            if import_check['ok']:
+                job.log(f"Entry point imports OK ({import_check['modules']} modules)")
+            else:
+                job.log(f"Entry point import check failed: {import_check.get('error') or import_check['failed']}")
+        else:
+            job.log("Entry point import check cached for this commit")
+
+        summary = {
+            'commit': commit,
+            'prepared_at': datetime.now().isoformat(),
+            'compiled': compiled,
+            'compile_seconds': compile_seconds,
+            'import_check': import_check
+        }
+        with self._lock:
+            state = self._state(project_name)
+            state.update(summary)
+            state['warm_commit'] = commit
+            get_project_storage().update_project_fields(project_name, warmup=state)
+        return summary
+
+    def start_kind(self, project_path: Path, project_name: str) -> str:
+        """Whether the next start of a project is 'warm' (bytecode ready) or 'cold'."""
+        state = self._state(project_name)
+        if 'warm_commit' in state and state['warm_commit'] == self._head_commit(project_path):
+            return 'warm'
+        return 'cold'
+
+    def record_start(self, project_name: str, project_path: Path, kind: str,
+                     seconds: float) -> None:
+        """
+        Record how long a replica took to become ready.
+
+        Any start leaves bytecode behind, so the commit counts as warm afterwards.
+        """
+        with self._lock:
+            state = self._state(project_name)
+            times = state.setdefault('start_times', {}).setdefault(kind, [])
+            times.append(round(seconds, 3))
+            del times[:-START_SAMPLES]
+            state['warm_commit'] = self._head_commit(project_path)
+            get_project_storage().update_project_fields(project_name, warmup=state)
+
+    def get_status(self, project_name: str, project_path: Path) -> Dict[str, Any]:
+        """Get preparation state and cold/warm start statistics of a project."""
+        state = self._state(project_name)
+        commit = self._head_commit(project_path)
+        start_times = {}
+        for kind in ('cold', 'warm'):
+            samples: List[float] = state.get('start_times', {}).get(kind, [])
+            start_times[kind] = {
+                'count': len(samples),
+                'last_seconds': samples[-1] if samples else None,
+                'average_seconds': round(sum(samples) / len(samples), 3) if samples else None
+            }
+        return {
+            'enabled': self.enabled,
+            'commit': commit,
+            'prepared': state.get('commit') == commit and 'prepared_at' in state,
+            'next_start': self.start_kind(project_path, project_name),
+            'prepared_commit': state.get('commit'),
+            'prepared_at': state.get('prepared_at'),
+            'compiled': state.get('compiled'),
+            'compile_seconds': state.get('compile_seconds'),
+            'import_check': state.get('import_check'),
+            'start_times': start_times
+        }
+
+    def _check_imports(self, project_path: Path, python_executable: str) -> Dict[str, Any]:
+        """Import the entry point's dependencies in a throwaway interpreter."""
+        entry = project_path / ENTRY_POINT
+        if not entry.exists():
+            return {'ok': False, 'modules': 0, 'failed': {}, 'error': f"{ENTRY_POINT} not found"}
+
+        started = time.monotonic()
+        try:
+            result = subprocess.run(
+                [python_executable, '-c', IMPORT_CHECK, str(entry)],
+                cwd=project_path, capture_output=True, text=True,
+                stdin=subprocess.DEVNULL, timeout=self.import_timeout
+            )
+        except subprocess.TimeoutExpired:
+            return {'ok': False, 'modules': 0, 'failed': {},
+                    'error': f"import check timed out after {self.import_timeout}s"}
+        seconds = round(time.monotonic() - started, 3)
+
+        try:
+            report = json.loads(result.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            error = (result.stderr.strip().splitlines() or ['import check failed'])[-1]
+            return {'ok': False, 'modules': 0, 'failed': {}, 'error': error, 'seconds': seconds}
+
+        return {'ok': not report['failed'], 'modules': report['modules'],
+                'local': report['local'], 'failed': report['failed'], 'seconds': seconds}
+
+    @staticmethod
+    def _check_key(commit: Optional[str], project_path: Path, python_executable: str) -> str:
+        """Cache key of an import check: commit, interpreter and installed packages."""
+        packages = ''
+        for site_packages in sorted(project_path.glob('venv/lib/python*/site-packages')):
+            try:
+                packages += str(site_packages.stat().st_mtime_ns)
+            except OSError:
+                pass
+        raw = f"{commit}:{python_executable}:{packages}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _head_commit(project_path: Path) -> Optional[str]:
+        """Commit checked out in a project, or None outside git."""
+        repo = git_dir(project_path)
+        return read_head(repo)[1] if repo is not None else None
+
+    @staticmethod
+    def _state(project_name: str) -> Dict[str, Any]:
+        """Stored warm-up state of a project."""
+        return dict((get_project_storage().get_project(project_name) or {}).get('warmup') or {})
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 import logging
 
+from .log_archive import LogArchive
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,11 +21,10 @@ class JSONStorage:
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self._locks = {}
     
-    def _get_lock(self, filename: str) -> threading.Lock:
+    def _get_lock(self, filename: str) -> threading.RLock:
         """Get or create a lock for a specific file."""
-        if filename not in self._locks:
-            self._locks[filename] = threading.Lock()
-        return self._locks[filename]
+        # Re-entrant: update_file holds the lock while calling read_file/write_file
+        return self._locks.setdefault(filename, threading.RLock())
     
     def _get_file_path(self, filename: str) -> Path:
         """Get the full path for a storage file."""
@@ -137,6 +138,17 @@ class ProjectStorage:
         
         return self.storage.update_file(self.projects_file, update_projects)
     
+    def update_project_fields(self, project_name: str, **fields: Any) -> bool:
+        """Merge fields into a project's stored settings."""
+        def update_projects(projects_data):
+            project_data = projects_data.get(project_name, {})
+            project_data.update(fields)
+            project_data['updated_at'] = datetime.now().isoformat()
+            projects_data[project_name] = project_data
+            return projects_data
+        
+        return self.storage.update_file(self.projects_file, update_projects)
+    
     def delete_project(self, project_name: str) -> bool:
         """Delete a project."""
         def update_projects(projects_data):
@@ -154,14 +166,20 @@ class ProjectStorage:
 class LogStorage:
     """Storage manager for logs."""
     
-    def __init__(self, storage: JSONStorage):
+    def __init__(self, storage: JSONStorage, archive: Optional[LogArchive] = None):
         self.storage = storage
         self.max_logs_per_file = 1000
+        # Complete history; the JSON file only keeps the recent entries
+        self.archive = archive
     
     def _get_log_filename(self, project_name: str) -> str:
         """Get the log filename for a project."""
         return f'logs_{project_name}'
     
+    def get_log_file_path(self, project_name: str) -> Path:
+        """Get the path of a project's log file."""
+        return self.storage._get_file_path(self._get_log_filename(project_name))
+    
     def get_project_logs(self, project_name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get logs for a project."""
         filename = self._get_log_filename(project_name)
@@ -173,7 +191,8 @@ class LogStorage:
         return logs
     
     def add_log_entry(self, project_name: str, message: str, level: str = 'INFO', 
-                     source: str = 'system', timestamp: Optional[str] = None) -> bool:
+                     source: str = 'system', timestamp: Optional[str] = None,
+                     replica: Optional[int] = None) -> bool:
         """Add a log entry for a project."""
         if timestamp is None:
             timestamp = datetime.now().isoformat()
@@ -186,6 +205,8 @@ class LogStorage:
             'source': source,
             'project_name': project_name
         }
+        if replica is not None:
+            log_entry['replica'] = replica
         
         def update_logs(log_data):
             if 'logs' not in log_data:
@@ -201,16 +222,25 @@ class LogStorage:
             return log_data
         
         filename = self._get_log_filename(project_name)
+        if self.archive is not None:
+            try:
+                self.archive.append(project_name, log_entry)
+            except OSError as e:
+                logger.error(f"Error archiving log entry of {project_name}: {e}")
         return self.storage.update_file(filename, update_logs)
     
     def clear_project_logs(self, project_name: str) -> bool:
         """Clear all logs for a project."""
         filename = self._get_log_filename(project_name)
+        if self.archive is not None:
+            self.archive.clear(project_name)
         return self.storage.write_file(filename, {'logs': [], 'last_updated': datetime.now().isoformat()})
     
     def delete_project_logs(self, project_name: str) -> bool:
         """Delete all logs for a project."""
         filename = self._get_log_filename(project_name)
+        if self.archive is not None:
+            self.archive.clear(project_name)
         return self.storage.delete_file(filename)
 
 
@@ -251,13 +281,15 @@ _log_storage = None
 _metadata_storage = None
 
 
-def initialize_storage(storage_path: str):
+def initialize_storage(storage_path: str, log_segment_size: int = 8 * 1024 * 1024,
+                       log_max_segments: int = 64):
     """Initialize the global storage instances."""
     global _storage, _project_storage, _log_storage, _metadata_storage
     
     _storage = JSONStorage(storage_path)
     _project_storage = ProjectStorage(_storage)
-    _log_storage = LogStorage(_storage)
+    archive = LogArchive(Path(storage_path) / 'log_archive', log_segment_size, log_max_segments)
+    _log_storage = LogStorage(_storage, archive)
     _metadata_storage = MetadataStorage(_storage)
     
     logger.info(f"JSON storage initialized at: {storage_path}")
@@ -0,0 +1,138 @@
+"""Append-only log history: one JSON line per entry, sealed into gzip segments."""
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LIVE_SEGMENT = 'current.jsonl'
+SEGMENT_PATTERN = re.compile(r'^(\d{6})\.jsonl\.gz$')
+
+
+class LogArchive:
+    """
+    Complete log history of every project, next to the capped JSON log files.
+
+    Entries are appended to ``<project>/current.jsonl``. Once it reaches the
+    segment size it is compressed into the next numbered ``NNNNNN.jsonl.gz``
+    segment, which never changes again, so downloads can send the files as
+    they are. The oldest segments beyond max_segments are deleted.
+    """
+
+    def __init__(self, root: Path, segment_size: int = 8 * 1024 * 1024, max_segments: int = 64):
+        self.root = Path(root)
+        self.segment_size = max(segment_size, 1)
+        self.max_segments = max_segments
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def append(self, project_name: str, entry: Dict[str, Any]) -> None:
+        """Append one entry to a project's live segment, sealing it when full."""
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock(project_name):
+            directory = self.project_path(project_name)
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(directory / LIVE_SEGMENT, 'ab') as f:
+                f.write(line)
+                size = f.tell()
+            if size >= self.segment_size:
+                self._seal(project_name)
+
+    def segments(self, project_name: str) -> List[Dict[str, Any]]:
+        """Sealed segments oldest first, then the live one."""
+        directory = self.project_path(project_name)
+        sealed = self._sealed_numbers(project_name)
+        result = []
+        for number in sealed:
+            try:
+                stat = (directory / f'{number:06d}.jsonl.gz').stat()
+            except OSError:
+                continue  # Deleted by retention meanwhile
+            result.append({'segment': number, 'live': False, 'compressed': True,
+                           'size': stat.st_size, 'modified': stat.st_mtime})
+        try:
+            stat = (directory / LIVE_SEGMENT).stat()
+            result.append({'segment': (sealed[-1] if sealed else 0) + 1, 'live': True, 'compressed': False,
+                           'size': stat.st_size, 'modified': stat.st_mtime})
+        except OSError:
+            pass
+        return result
+
+    def segment_path(self, project_name: str, segment: Optional[int] = None) -> Optional[Path]:
+        """
+        File of a segment.
+
+        Args:
+            project_name: Project name
+            segment: Segment number, None for the live segment
+
+        Returns:
+            Path, or None if the segment does not exist
+        """
+        directory = self.project_path(project_name)
+        if segment is not None:
+            sealed = directory / f'{segment:06d}.jsonl.gz'
+            if sealed.exists():
+                return sealed
+            numbers = self._sealed_numbers(project_name)
+            if segment != (numbers[-1] if numbers else 0) + 1:
+                return None
+        live = directory / LIVE_SEGMENT
+        return live if live.exists() else None
+
+    def usage(self, project_name: str) -> int:
+        """Bytes used by a project's history."""
+        return sum(segment['size'] for segment in self.segments(project_name))
+
+    def clear(self, project_name: str) -> None:
+        """Delete a project's history."""
+        with self._lock(project_name):
+            shutil.rmtree(self.project_path(project_name), ignore_errors=True)
+
+    def project_path(self, project_name: str) -> Path:
+        """Directory of a project's history."""
+        return self.root / project_name
+
+    def _seal(self, project_name: str) -> None:
+        """Compress the live segment into the next numbered one (caller holds the lock)."""
+        directory = self.project_path(project_name)
+        numbers = self._sealed_numbers(project_name)
+        number = (numbers[-1] if numbers else 0) + 1
+        sealing = directory / f'{LIVE_SEGMENT}.sealing'
+        target = directory / f'{number:06d}.jsonl.gz'
+        temporary = target.with_name(target.name + '.tmp')
+
+        # Readers holding the live file keep reading the renamed inode
+        os.rename(directory / LIVE_SEGMENT, sealing)
+        try:
+            with open(sealing, 'rb') as source, gzip.open(temporary, 'wb', compresslevel=6) as out:
+                shutil.copyfileobj(source, out, 1024 * 1024)
+            os.rename(temporary, target)
+            sealing.unlink()
+        except OSError as e:
+            logger.error(f"Could not seal log segment of {project_name}: {e}")
+            temporary.unlink(missing_ok=True)
+            os.rename(sealing, directory / LIVE_SEGMENT)
+            return
+
+        if self.max_segments > 0:
+            for old in (numbers + [number])[:-self.max_segments]:
+                (directory / f'{old:06d}.jsonl.gz').unlink(missing_ok=True)
+
+    def _sealed_numbers(self, project_name: str) -> List[int]:
+        """Numbers of the sealed segments, ascending."""
+        try:
+            names = os.listdir(self.project_path(project_name))
+        except OSError:
+            return []
+        return sorted(int(match.group(1)) for match in map(SEGMENT_PATTERN.match, names) if match)
+
+    def _lock(self, project_name: str) -> threading.Lock:
+        """Lock serializing appends and seals of one project."""
+        return self._locks.setdefault(project_name, threading.Lock())
@@ -0,0 +1,100 @@
+"""Conditional GET helpers: ETag / If-None-Match and Last-Modified / If-Modified-Since."""
+
+import io
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from flask import Response, current_app, request
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+from werkzeug.wsgi import wrap_file
+
+
+def not_modified(etag: str, last_modified: float) -> Optional[Response]:
+    """
+    Answer a conditional GET before the response body is built.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+
+    Args:
+        etag: Current entity tag of the resource (without quotes)
+        last_modified: Time of the last change of the resource
+
+    Returns:
+        A 304 response if the client's copy is current, None otherwise
+    """
+    if request.if_none_match:
+        current = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since is not None:
+        current = int(last_modified) <= request.if_modified_since.timestamp()
+    else:
+        current = False
+
+    if not current:
+        return None
+    return add_validators(Response(status=304), etag, last_modified)
+
+
+def add_validators(response: Response, etag: str, last_modified: float) -> Response:
+    """
+    Add ETag, Last-Modified and Cache-Control headers to a response.
+
+    Last-Modified has a one second resolution, so it is left out while the
+    last change is less than a second old: a second change within the same
+    second would otherwise be hidden from If-Modified-Since.
+    """
+    response.set_etag(etag)
+    if time.time() - last_modified >= 1:
+        response.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+    # Cacheable, but revalidated on every use
+    response.cache_control.no_cache = True
+    return response
+
+
+class SnapshotFile(io.FileIO):
+    """Read-only file that ends at its size when opened, even while it is appended to."""
+
+    def __init__(self, path: Path):
+        super().__init__(path, 'rb')
+        self.size = os.fstat(self.fileno()).st_size
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        remaining = self.size - self.tell()
+        if remaining <= 0:
+            return b''
+        return super().read(remaining if size is None or size < 0 else min(size, remaining))
+
+
+def send_file_range(path: Path, mimetype: str, download_name: Optional[str] = None) -> Response:
+    """
+    Send a file from disk, honouring Range, If-Range and the conditional headers.
+
+    The body is the WSGI file wrapper of the open file, so Gunicorn sends a
+    full download with sendfile() and ranges are read in blocks; nothing is
+    held in memory. Only the bytes present when the file was opened are sent,
+    which keeps Content-Length right for a log that is still being written.
+
+    Args:
+        path: File to send
+        mimetype: Content type of the file
+        download_name: Sent as an attachment with this name if given
+
+    Raises:
+        OSError: If the file cannot be opened
+    """
+    file = SnapshotFile(path)
+    stat = os.fstat(file.fileno())
+    response = current_app.response_class(wrap_file(request.environ, file), mimetype=mimetype,
+                                          direct_passthrough=True)
+    response.content_length = file.size
+    if download_name:
+        response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+    # Appending changes the size, sealing or clearing the inode
+    add_validators(response, f"{stat.st_ino:x}-{file.size:x}-{stat.st_mtime_ns:x}", stat.st_mtime)
+    try:
+        return response.make_conditional(request.environ, accept_ranges=True, complete_length=file.size)
+    except RequestedRangeNotSatisfiable as e:
+        file.close()
+        return e.get_response(request.environ)
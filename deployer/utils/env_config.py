@@ -36,7 +36,9 @@ def get_env_var(key: str, default: Any = None, cast_type: type = str) -> Any:
         return default
     
     if cast_type == bool:
-        return value.lower() in ('true', '1', 'yes', 'on')
+        if isinstance(value, bool):
+            return value
+        return str(value).lower() in ('true', '1', 'yes', 'on')
     elif cast_type == int:
         try:
             return int(value)
@@ -79,11 +81,111 @@ def get_app_config() -> Dict[str, Any]:
         
         # Security settings
         'MAX_CONTENT_LENGTH': get_env_var('MAX_CONTENT_LENGTH', 16 * 1024 * 1024, int),  # 16MB
-        'RATE_LIMIT_PER_MINUTE': get_env_var('RATE_LIMIT_PER_MINUTE', 60, int),
+        # Reverse proxies in front of the app whose X-Forwarded-For is trusted (0: none)
+        'TRUSTED_PROXIES': get_env_var('TRUSTED_PROXIES', 0, int),
+        
+        # Rate limits per route group (comma-separated count/period pairs)
+        'RATE_LIMIT_READ': get_env_var('RATE_LIMIT_READ', '300/minute'),
+        'RATE_LIMIT_WRITE': get_env_var('RATE_LIMIT_WRITE', '60/minute'),
+        'RATE_LIMIT_HEAVY': get_env_var('RATE_LIMIT_HEAVY', '10/minute,100/hour'),
+        'RATE_LIMIT_MAX_KEYS': get_env_var('RATE_LIMIT_MAX_KEYS', 10000, int),
+        # memory (one process), shm or sqlite (shared by every process of the host)
+        'RATE_LIMIT_STORE': get_env_var('RATE_LIMIT_STORE', 'memory'),
+        'RATE_LIMIT_STORE_PATH': get_env_var('RATE_LIMIT_STORE_PATH', ''),
+        'DISABLE_RATE_LIMITING': get_env_var('DISABLE_RATE_LIMITING', False, bool),
         
         # WebSocket settings
         'WEBSOCKET_PING_TIMEOUT': get_env_var('WEBSOCKET_PING_TIMEOUT', 60, int),
         'WEBSOCKET_PING_INTERVAL': get_env_var('WEBSOCKET_PING_INTERVAL', 25, int),
+        # Lifecycle events within this many seconds go out as one message per project
+        'LIFECYCLE_COALESCE_WINDOW': get_env_var('LIFECYCLE_COALESCE_WINDOW', 0.2, float),
+        
+        # Server-Sent Events log streams
+        'LOG_STREAM_HEARTBEAT': get_env_var('LOG_STREAM_HEARTBEAT', 15, int),
+        'LOG_STREAM_BUFFER': get_env_var('LOG_STREAM_BUFFER', 1000, int),
+        'LOG_STREAM_MAX_CLIENTS': get_env_var('LOG_STREAM_MAX_CLIENTS', 32, int),
+        
+        # Log history, served by /logs/raw (segments are gzipped once full, 0 keeps all)
+        'LOG_ARCHIVE_SEGMENT_SIZE': get_env_var('LOG_ARCHIVE_SEGMENT_SIZE', 8 * 1024 * 1024, int),
+        'LOG_ARCHIVE_MAX_SEGMENTS': get_env_var('LOG_ARCHIVE_MAX_SEGMENTS', 64, int),
+        
+        # Gzip JSON responses from this size in bytes (0 disables it)
+        'API_GZIP_MIN_SIZE': get_env_var('API_GZIP_MIN_SIZE', 0, int),
+        'API_GZIP_LEVEL': get_env_var('API_GZIP_LEVEL', 6, int),
+        
+        # Resource limit settings (backend: auto, cgroup, rlimit or none)
+        'RESOURCE_BACKEND': get_env_var('RESOURCE_BACKEND', 'auto'),
+        'CGROUP_ROOT': get_env_var('CGROUP_ROOT', ''),
+        'DEFAULT_MEMORY_MAX': get_env_var('DEFAULT_MEMORY_MAX', ''),
+        'DEFAULT_PIDS_MAX': get_env_var('DEFAULT_PIDS_MAX', 0, int),
+        
+        # Process settings
+        'MAX_CONCURRENT_PROJECTS': get_env_var('MAX_CONCURRENT_PROJECTS', 10, int),
+        'MAX_REPLICAS_PER_PROJECT': get_env_var('MAX_REPLICAS_PER_PROJECT', 16, int),
+        'PROJECT_PORT_RANGE': get_env_var('PROJECT_PORT_RANGE', '20000-20999'),
+        
+        # Blue/green restart settings (readiness probe: tcp, http or process)
+        'READINESS_PROBE': get_env_var('READINESS_PROBE', 'tcp'),
+        'READINESS_TIMEOUT': get_env_var('READINESS_TIMEOUT', 30, int),
+        'DRAIN_TIMEOUT': get_env_var('DRAIN_TIMEOUT', 30, int),
+        
+        # Background job settings (per-kind values as kind=number pairs)
+        'JOB_WORKERS': get_env_var('JOB_WORKERS', 4, int),
+        'JOB_CONCURRENCY': get_env_var('JOB_CONCURRENCY', 'clone=2,venv=2,install=2,update=2,prepare=2'),
+        'JOB_TIMEOUTS': get_env_var('JOB_TIMEOUTS', 'clone=300,venv=300,install=1800,update=1800,prepare=600'),
+        'JOB_TIMEOUT': get_env_var('JOB_TIMEOUT', 1800, int),
+        'JOB_RETENTION': get_env_var('JOB_RETENTION', 200, int),
+        
+        # Git clone settings (mode: mirror, partial, shallow or direct)
+        'GIT_CLONE_MODE': get_env_var('GIT_CLONE_MODE', 'mirror'),
+        'GIT_MIRROR_MAX_AGE': get_env_var('GIT_MIRROR_MAX_AGE', 60, int),
+        'GIT_MIRROR_REFRESH_INTERVAL': get_env_var('GIT_MIRROR_REFRESH_INTERVAL', 600, int),
+        'GIT_FETCH_TIMEOUT': get_env_var('GIT_FETCH_TIMEOUT', 300, int),
+        
+        # Git status cache (dirty/ahead/behind recomputed in the background)
+        'GIT_STATUS_TTL': get_env_var('GIT_STATUS_TTL', 10, int),
+        'GIT_STATUS_WORKERS': get_env_var('GIT_STATUS_WORKERS', 2, int),
+        
+        # Shared environment settings (sharing: off, symlink or copy)
+        'ENV_SHARING': get_env_var('ENV_SHARING', 'symlink'),
+        'ENV_GC_GRACE': get_env_var('ENV_GC_GRACE', 3600, int),
+        'ENV_GC_INTERVAL': get_env_var('ENV_GC_INTERVAL', 600, int),
+        
+        # Vault watcher settings (mode: auto, inotify, poll or off)
+        'VAULT_WATCH': get_env_var('VAULT_WATCH', 'auto'),
+        'VAULT_WATCH_POLL_INTERVAL': get_env_var('VAULT_WATCH_POLL_INTERVAL', 2.0, float),
+        
+        # Disk usage settings (quotas as sizes such as 2G, empty for none)
+        'DISK_QUOTA_PROJECT': get_env_var('DISK_QUOTA_PROJECT', ''),
+        'DISK_QUOTA_VAULT': get_env_var('DISK_QUOTA_VAULT', ''),
+        'DISK_USAGE_DEBOUNCE': get_env_var('DISK_USAGE_DEBOUNCE', 5.0, float),
+        'DISK_USAGE_RESCAN_INTERVAL': get_env_var('DISK_USAGE_RESCAN_INTERVAL', 3600, int),
+        
+        # Trash settings (deleted directories are removed in batches of files)
+        'TRASH_REAP_BATCH': get_env_var('TRASH_REAP_BATCH', 500, int),
+        'TRASH_REAP_PAUSE': get_env_var('TRASH_REAP_PAUSE', 0.05, float),
+        'TRASH_REAP_INTERVAL': get_env_var('TRASH_REAP_INTERVAL', 30, int),
+        
+        # Warm-up settings (bytecode precompilation after clone, install and update)
+        'WARMUP_ENABLED': get_env_var('WARMUP_ENABLED', True, bool),
+        'WARMUP_WORKERS': get_env_var('WARMUP_WORKERS', 0, int),  # 0 = all cores
+        'WARMUP_IMPORT_TIMEOUT': get_env_var('WARMUP_IMPORT_TIMEOUT', 30, int),
+        
+        # Reverse proxy settings (balancer: round_robin or least_connections)
+        'PROXY_ENABLED': get_env_var('PROXY_ENABLED', False, bool),
+        'PROXY_HOST': get_env_var('PROXY_HOST', '0.0.0.0'),
+        'PROXY_PORT': get_env_var('PROXY_PORT', 8088, int),
+        'PROXY_WORKERS': get_env_var('PROXY_WORKERS', 32, int),
+        'PROXY_DOMAIN': get_env_var('PROXY_DOMAIN', ''),
+        'PROXY_BALANCER': get_env_var('PROXY_BALANCER', 'round_robin'),
+        'PROXY_EJECT_AFTER': get_env_var('PROXY_EJECT_AFTER', 5, int),
+        'PROXY_EJECTION_SECONDS': get_env_var('PROXY_EJECTION_SECONDS', 30, int),
+        
+        # CPU placement settings (mode: off, weight or usage)
+        'CPU_PLACEMENT': get_env_var('CPU_PLACEMENT', 'off'),
+        'CPU_RESERVED': get_env_var('CPU_RESERVED', '0'),
+        'CPU_PIN_DEPLOYER': get_env_var('CPU_PIN_DEPLOYER', False, bool),
+        'CPU_PLACEMENT_INTERVAL': get_env_var('CPU_PLACEMENT_INTERVAL', 30, int),
     }
     
     return config
@@ -95,4 +197,10 @@ def get_server_config() -> Dict[str, Any]:
         'HOST': get_env_var('HOST', '0.0.0.0'),
         'PORT': get_env_var('PORT', 5000, int),
         'DEBUG': get_env_var('DEBUG', False, bool),
+        
+        # Production server (SERVER_MODE=production runs Gunicorn gthread workers)
+        'SERVER_MODE': get_env_var('SERVER_MODE', 'development'),
+        'SERVER_WORKERS': get_env_var('SERVER_WORKERS', 1, int),
+        'SERVER_THREADS': get_env_var('SERVER_THREADS', 64, int),
+        'SERVER_KEEPALIVE': get_env_var('SERVER_KEEPALIVE', 5, int),
     }
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""Read git metadata (HEAD, refs, config) straight from the repository files."""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+def git_dir(project_path: Path) -> Optional[Path]:
+    """
+    Locate the git directory of a working tree.
+
+    Follows ``gitdir:`` files used by worktrees and submodules.
+
+    Returns:
+        Git directory, or None if the path is not a git working tree
+    """
+    dot_git = Path(project_path) / '.git'
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        content = dot_git.read_text().strip()
+    except OSError:
+        return None
+    if content.startswith('gitdir:'):
+        path = Path(content[len('gitdir:'):].strip())
+        return path if path.is_absolute() else (Path(project_path) / path).resolve()
+    return None
+
+
+def common_dir(repo_dir: Path) -> Path:
+    """Directory holding refs and config shared by all worktrees."""
+    try:
+        content = (repo_dir / 'commondir').read_text().strip()
+    except OSError:
+        return repo_dir
+    path = Path(content)
+    return path if path.is_absolute() else (repo_dir / path).resolve()
+
+
+def read_head(repo_dir: Path) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read HEAD.
+
+    Returns:
+        (branch name or None when detached, commit or None for an unborn branch)
+    """
+    try:
+        head = (repo_dir / 'HEAD').read_text().strip()
+    except OSError:
+        return None, None
+    if head.startswith('ref:'):
+        ref = head[len('ref:'):].strip()
+        branch = ref[len('refs/heads/'):] if ref.startswith('refs/heads/') else ref
+        return branch, resolve_ref(repo_dir, ref)
+    return None, head or None
+
+
+def resolve_ref(repo_dir: Path, ref: str) -> Optional[str]:
+    """Resolve a full ref name (e.g. ``refs/heads/main``) to a commit."""
+    for _ in range(5):  # Follow a few levels of symbolic refs
+        value = None
+        for base in (repo_dir, common_dir(repo_dir)):
+            try:
+                value = (base / ref).read_text().strip()
+                break
+            except OSError:
+                continue
+        if value is None:
+            return read_packed_refs(common_dir(repo_dir)).get(ref)
+        if not value.startswith('ref:'):
+            return value
+        ref = value[len('ref:'):].strip()
+    return None
+
+
+def read_packed_refs(repo_dir: Path) -> Dict[str, str]:
+    """Parse ``packed-refs`` into a ref -> commit map."""
+    refs = {}
+    try:
+        lines = (repo_dir / 'packed-refs').read_text().splitlines()
+    except OSError:
+        return refs
+    for line in lines:
+        if not line or line[0] in '#^':
+            continue
+        commit, _, ref = line.partition(' ')
+        refs[ref.strip()] = commit
+    return refs
+
+
+def read_config(repo_dir: Path) -> Dict[str, Dict[str, str]]:
+    """
+    Parse the repository config.
+
+    Returns:
+        Values per section, with sections named like ``remote "origin"``
+    """
+    sections: Dict[str, Dict[str, str]] = {}
+    current: Optional[Dict[str, str]] = None
+    try:
+        lines = (common_dir(repo_dir) / 'config').read_text().splitlines()
+    except OSError:
+        return sections
+    for raw in lines:
+        line = raw.strip()
+        if not line or line[0] in '#;':
+            continue
+        match = re.match(r'^\[\s*([^\s\]"]+)(?:\s+"(.*)")?\s*\]$', line)
+        if match:
+            name = match.group(1).lower()
+            if match.group(2) is not None:
+                name += f' "{match.group(2)}"'
+            current = sections.setdefault(name, {})
+            continue
+        if current is not None:
+            key, _, value = line.partition('=')
+            current[key.strip().lower()] = value.strip().strip('"')
+    return sections
+
+
+def remote_url(repo_dir: Path, remote: str = 'origin') -> Optional[str]:
+    """URL of a remote."""
+    return read_config(repo_dir).get(f'remote "{remote}"', {}).get('url')
+
+
+def upstream_ref(repo_dir: Path, branch: Optional[str]) -> Optional[str]:
+    """Remote-tracking ref a branch follows, e.g. ``refs/remotes/origin/main``."""
+    if not branch:
+        return None
+    settings = read_config(repo_dir).get(f'branch "{branch}"', {})
+    remote, merge = settings.get('remote'), settings.get('merge')
+    if not remote or not merge:
+        return None
+    if remote == '.':
+        return merge
+    if not merge.startswith('refs/heads/'):
+        return None
+    return f"refs/remotes/{remote}/{merge[len('refs/heads/'):]}"
+
+
+def ref_files(repo_dir: Path, refs: List[str]) -> List[Path]:
+    """Files whose modification changes the value of HEAD or the given refs."""
+    shared = common_dir(repo_dir)
+    files = [repo_dir / 'HEAD', shared / 'packed-refs', shared / 'config']
+    files.extend(shared / ref for ref in refs if ref)
+    return files
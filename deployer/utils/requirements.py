@@ -0,0 +1,124 @@
+"""Requirements file parsing utilities."""
+
+import re
+from typing import Dict, List, Optional
+
+# Requirement lines that depend on the project checkout or on other files
+_LOCAL_REFERENCE = re.compile(r'^(-e|--editable|-r|--requirement|-c|--constraint|\.|/|file:)|@\s*file:')
+
+_COMMENT = re.compile(r'(^|\s+)#.*$')
+
+_NAME = re.compile(r'^([A-Za-z0-9][A-Za-z0-9._-]*)(.*)$')
+
+
+def canonical_name(name: str) -> str:
+    """Canonicalize a distribution name (PEP 503)."""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def logical_lines(text: str) -> List[str]:
+    """Lines of a requirements file with backslash continuations joined, as pip reads them."""
+    lines = []
+    continued = ''
+    for raw in text.splitlines():
+        if raw.endswith('\\') and not _COMMENT.search(raw):
+            continued += raw[:-1] + ' '
+            continue
+        lines.append(continued + raw)
+        continued = ''
+    if continued:
+        lines.append(continued)
+    return lines
+
+
+def requirement_lines(text: str) -> List[str]:
+    """
+    Get the meaningful lines of a requirements file.
+
+    Continuations are joined, comments, blank lines and whitespace are
+    dropped and project names are canonicalized, so equivalent files give
+    the same lines. Whitespace inside an environment marker is meaningful
+    (``not in``, ``and``) and only collapsed to single spaces. Per-requirement
+    options (``--hash=...``) stay on their requirement's line, separated by
+    a space.
+
+    Args:
+        text: Requirements file contents
+
+    Returns:
+        Normalized lines in file order
+
+    Examples:
+        >>> requirement_lines('Flask_Cors >= 4.0 ;  python_version >= "3.8"  and os_name != "nt"')
+        ['flask-cors>=4.0; python_version >= "3.8" and os_name != "nt"']
+        >>> requirement_lines('bar;platform_system not in "Windows"  # no wheels')
+        ['bar; platform_system not in "Windows"']
+    """
+    lines = []
+    for raw in logical_lines(text):
+        line = _COMMENT.sub('', raw).strip()
+        if not line:
+            continue
+        match = _NAME.match(line)
+        if match and not is_option(line):
+            spec, sep, options = match.group(2).partition(' -')
+            spec, semicolon, marker = spec.partition(';')
+            line = canonical_name(match.group(1)) + re.sub(r'\s+', '', spec)
+            if semicolon:
+                # A URL requirement needs whitespace before its marker
+                line += (' ; ' if '@' in spec else '; ') + ' '.join(marker.split())
+            if sep:
+                line += ' -' + ' '.join(options.split())
+        else:
+            line = ' '.join(line.split())
+        lines.append(line)
+    return lines
+
+
+def has_local_references(lines: List[str]) -> bool:
+    """Whether any line is an option, editable install or local path."""
+    return any(_LOCAL_REFERENCE.search(line) for line in lines)
+
+
+def needs_full_install(lines: List[str]) -> bool:
+    """
+    Whether the file must be installed as a whole with ``pip install -r``.
+
+    Options (index URLs, find-links, constraints) and hash-checking apply to
+    the whole file and cannot be passed to pip one requirement at a time.
+    """
+    return has_local_references(lines) or any(is_option(line) or ' --hash' in line for line in lines)
+
+
+def is_option(line: str) -> bool:
+    """Whether a line is a pip option rather than a requirement."""
+    return line.startswith('-')
+
+
+def requirement_name(line: str) -> Optional[str]:
+    """Canonical project name of a requirement line."""
+    match = _NAME.match(line)
+    if not match or is_option(line):
+        return None
+    return canonical_name(re.split(r'[\[;@<>=!~ ]', match.group(1), 1)[0])
+
+
+def pinned_version(line: str) -> Optional[str]:
+    """Version of an exact ``name==version`` pin."""
+    match = re.match(r'^[A-Za-z0-9._-]+(?:\[[^\]]*\])?==([^,;\s]+)$', line)
+    return match.group(1) if match else None
+
+
+def parse_freeze(text: str) -> Dict[str, str]:
+    """
+    Parse ``pip freeze`` output.
+
+    Returns:
+        Installed version per canonical project name
+    """
+    installed = {}
+    for line in text.splitlines():
+        name, sep, version = line.strip().partition('==')
+        if sep:
+            installed[canonical_name(name)] = version
+    return installed
@@ -0,0 +1,142 @@
+"""In-memory manifest of the React build, served with precompressed variants."""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from flask import Response, abort, current_app, request, send_file
+
+logger = logging.getLogger(__name__)
+
+# Preference order when the client accepts several encodings
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+# Vite writes content-hashed names (index-4f1a2b3c.js) into assets/
+HASHED_ASSET = re.compile(r'^assets/.+-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$')
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+INDEX = 'index.html'
+
+
+@dataclass
+class StaticAsset:
+    """One file of the build."""
+
+    path: Path
+    mimetype: str
+    etag: str
+    immutable: bool
+    # Encoding -> precompressed file
+    variants: Dict[str, Path] = field(default_factory=dict)
+
+
+class StaticAssets:
+    """
+    Serves the React build from a manifest made when the app starts.
+
+    Requests are answered from the manifest without touching the disk to
+    find the file. A ``.br`` or ``.gz`` file written next to an asset by the
+    frontend build is sent instead when the client accepts that encoding.
+    Hashed file names never change content and are cached for a year as
+    immutable; everything else is revalidated. ``index.html`` is held in
+    memory, gzipped once if the build did not. Restart after rebuilding.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.assets: Dict[str, StaticAsset] = {}
+        self.index: Optional[Dict[Optional[str], bytes]] = None
+        self.index_etag = ''
+        self.reload()
+
+    def reload(self) -> None:
+        """Scan the build directory."""
+        assets = {}
+        for directory, _dirs, names in os.walk(self.root):
+            for name in names:
+                path = Path(directory) / name
+                relative = path.relative_to(self.root).as_posix()
+                if any(relative.endswith(suffix) for suffix in ENCODINGS.values()) and \
+                        os.path.exists(path.with_suffix('')):
+                    continue  # Variant of another file
+                stat = path.stat()
+                assets[relative] = StaticAsset(
+                    path=path,
+                    mimetype=mimetypes.guess_type(name)[0] or 'application/octet-stream',
+                    etag=f"{stat.st_size:x}-{stat.st_mtime_ns:x}",
+                    immutable=bool(HASHED_ASSET.match(relative))
+                )
+                for encoding, suffix in ENCODINGS.items():
+                    variant = path.with_name(name + suffix)
+                    # A variant older than its file is left over from a previous build
+                    if variant.exists() and variant.stat().st_mtime_ns >= stat.st_mtime_ns:
+                        assets[relative].variants[encoding] = variant
+
+        index = assets.pop(INDEX, None)
+        self.assets = assets
+        if index is None:
+            self.index = None
+            logger.warning(f"No frontend build at {self.root}")
+            return
+        content = index.path.read_bytes()
+        self.index = {None: content}
+        for encoding, variant in index.variants.items():
+            self.index[encoding] = variant.read_bytes()
+        self.index.setdefault('gzip', gzip.compress(content, 9, mtime=0))
+        self.index_etag = hashlib.sha1(content).hexdigest()[:20]
+        logger.info(f"Frontend build indexed: {len(assets) + 1} files at {self.root}")
+
+    def send(self, path: str) -> Response:
+        """Response for a build file, index.html for unknown paths (client-side routes)."""
+        asset = self.assets.get(path)
+        if asset is None:
+            return self.send_index()
+
+        encoding = self._negotiate(asset.variants)
+        response = send_file(
+            asset.variants[encoding] if encoding else asset.path,
+            mimetype=asset.mimetype,
+            conditional=True,
+            etag=f"{asset.etag}-{encoding}" if encoding else asset.etag,
+            max_age=IMMUTABLE_MAX_AGE if asset.immutable else None
+        )
+        if asset.immutable:
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.no_cache = True
+        return self._add_encoding(response, encoding, asset.variants)
+
+    def send_index(self) -> Response:
+        """index.html from memory."""
+        if self.index is None:
+            abort(404)
+        encoding = self._negotiate(self.index)
+        response = current_app.response_class(self.index[encoding], mimetype='text/html')
+        response.set_etag(f"{self.index_etag}-{encoding}" if encoding else self.index_etag)
+        # Names the current hashed assets: always revalidated
+        response.cache_control.no_cache = True
+        self._add_encoding(response, encoding, self.index)
+        return response.make_conditional(request)
+
+    @staticmethod
+    def _negotiate(available) -> Optional[str]:
+        """Best encoding of the available ones the client accepts, None for identity."""
+        offered = [encoding for encoding in ENCODINGS if encoding in available]
+        if not offered:
+            return None
+        return request.accept_encodings.best_match(offered)
+
+    @staticmethod
+    def _add_encoding(response: Response, encoding: Optional[str], available) -> Response:
+        """Mark the encoding sent, and that another one could have been."""
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if any(key in ENCODINGS for key in available):
+            response.vary.add('Accept-Encoding')
+        return response
@@ -1,8 +1,6 @@
 """Main view routes."""
 
-import os
-from pathlib import Path
-from flask import Blueprint, send_from_directory, current_app
+from flask import Blueprint, current_app
 
 main_bp = Blueprint('main', __name__)
 
@@ -10,19 +8,14 @@ main_bp = Blueprint('main', __name__)
 @main_bp.route('/')
 def index():
     """Serve the React frontend."""
-    frontend_path = Path(current_app.root_path) / 'static' / 'dist'
-    return send_from_directory(frontend_path, 'index.html')
+    return current_app.static_assets.send_index()
 
 
 @main_bp.route('/<path:path>')
 def serve_static(path):
     """Serve static files from React build."""
-    frontend_path = Path(current_app.root_path) / 'static' / 'dist'
-    if os.path.exists(os.path.join(frontend_path, path)):
-        return send_from_directory(frontend_path, path)
-    else:
-        # For React Router, serve index.html for unknown routes
-        return send_from_directory(frontend_path, 'index.html')
+    # For React Router, unknown routes get index.html
+    return current_app.static_assets.send(path)
 
 
 @main_bp.route('/api/health')
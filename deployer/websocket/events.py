@@ -1,4 +1,4 @@
-"""WebSocket event handlers for real-time project logs."""
+"""WebSocket event handlers for real-time project logs and lifecycle events."""
 
 import logging
 from flask_socketio import emit, join_room, leave_room, disconnect
@@ -9,9 +9,17 @@ logger = logging.getLogger(__name__)
 # Store active connections per project
 active_connections = {}
 
+# SocketIO server used for broadcasts from background threads
+_socketio = None
+
+# Room of clients that follow every project's lifecycle (the dashboard)
+DASHBOARD_ROOM = 'dashboard'
+
 
 def register_events(socketio):
     """Register all WebSocket event handlers."""
+    global _socketio
+    _socketio = socketio
     
     @socketio.on('connect')
     def handle_connect():
@@ -63,6 +71,19 @@ def register_events(socketio):
         except Exception as e:
             logger.error(f"Error getting recent logs for {project_name}: {e}")
     
+    @socketio.on('join_dashboard')
+    def handle_join_dashboard(data=None):
+        """Handle joining the room of lifecycle events of every project."""
+        join_room(DASHBOARD_ROOM)
+        logger.info(f"Client {request.sid} joined the dashboard")
+        emit('joined_dashboard', {'room': DASHBOARD_ROOM})
+    
+    @socketio.on('leave_dashboard')
+    def handle_leave_dashboard(data=None):
+        """Handle leaving the dashboard room."""
+        leave_room(DASHBOARD_ROOM)
+        emit('left_dashboard', {'room': DASHBOARD_ROOM})
+    
     @socketio.on('leave_project_logs')
     def handle_leave_project_logs(data):
         """Handle leaving a project's log room."""
@@ -88,11 +109,9 @@ def register_events(socketio):
 
 def broadcast_log_message(project_name, log_data):
     """Broadcast a log message to all clients watching this project."""
-    from flask import current_app
-    
-    if hasattr(current_app, 'socketio'):
+    if _socketio is not None:
         room = f"project_{project_name}_logs"
-        current_app.socketio.emit('new_log', {
+        _socketio.emit('new_log', {
             'project_name': project_name,
             'log': log_data
         }, room=room)
@@ -100,16 +119,54 @@ def broadcast_log_message(project_name, log_data):
 
 def broadcast_project_status(project_name, status_data):
     """Broadcast project status change to all clients watching this project."""
-    from flask import current_app
-    
-    if hasattr(current_app, 'socketio'):
+    if _socketio is not None:
         room = f"project_{project_name}_logs"
-        current_app.socketio.emit('project_status', {
+        _socketio.emit('project_status', {
             'project_name': project_name,
             'status': status_data
         }, room=room)
 
 
+def broadcast_job_status(project_name, job_data):
+    """Broadcast a background job state change to all clients watching this project."""
+    if _socketio is not None:
+        room = f"project_{project_name}_logs"
+        _socketio.emit('job_status', {
+            'project_name': project_name,
+            'job': job_data
+        }, room=room)
+
+
+def broadcast_lifecycle_events(batch):
+    """
+    Broadcast one coalesced batch of lifecycle events.
+    
+    The dashboard room gets a single ``project_events`` message for the whole
+    batch; each project's room gets one ``project_status`` message. Every
+    update carries the project's current status, so clients apply it
+    without refetching.
+    """
+    if _socketio is None:
+        return
+    
+    from deployer.services.process_service import ProcessService
+    process_service = ProcessService.get_instance()
+    
+    updates = []
+    for project_name, events in batch.items():
+        replicas = process_service.get_replica_count(project_name)
+        update = {
+            'project_name': project_name,
+            'running': replicas > 0,
+            'replicas': replicas,
+            'events': [event.to_dict() for event in events]
+        }
+        updates.append(update)
+        broadcast_project_status(project_name, {'event': 'lifecycle', **update})
+    
+    _socketio.emit('project_events', {'updates': updates}, room=DASHBOARD_ROOM)
+
+
 def get_active_connections():
     """Get count of active connections per project."""
     return {project: len(sids) for project, sids in active_connections.items()}
\ No newline at end of file
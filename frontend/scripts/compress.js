@@ -0,0 +1,41 @@
+// Writes .gz and .br variants next to the build output, served by the backend
+// according to Accept-Encoding. Uses Node's zlib only: no extra dependencies.
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs';
+import { extname, join } from 'node:path';
+import { fileURLToPath } from 'node:url';
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib';
+
+const DIST = fileURLToPath(new URL('../../deployer/static/dist', import.meta.url));
+const COMPRESSIBLE = new Set(['.html', '.js', '.mjs', '.css', '.json', '.svg', '.txt', '.map', '.webmanifest']);
+const MIN_SIZE = 1024;
+
+function* files(dir) {
+  for (const entry of readdirSync(dir, { withFileTypes: true })) {
+    const path = join(dir, entry.name);
+    if (entry.isDirectory()) yield* files(path);
+    else yield path;
+  }
+}
+
+let written = 0;
+for (const path of files(DIST)) {
+  if (!COMPRESSIBLE.has(extname(path)) || statSync(path).size < MIN_SIZE) continue;
+  const data = readFileSync(path);
+  const variants = {
+    '.gz': gzipSync(data, { level: 9 }),
+    '.br': brotliCompressSync(data, {
+      params: {
+        [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+        [constants.BROTLI_PARAM_SIZE_HINT]: data.length,
+      },
+    }),
+  };
+  for (const [suffix, compressed] of Object.entries(variants)) {
+    // Only worth serving if it saves bytes
+    if (compressed.length < data.length) {
+      writeFileSync(path + suffix, compressed);
+      written += 1;
+    }
+  }
+}
+console.log(`compress: ${written} precompressed variants written to ${DIST}`);
@@ -0,0 +1,50 @@
+import { useEffect, useRef } from 'react';
+import WebSocketService from '../services/websocket';
+import api from '../services/api';
+import useProjectStore from '../stores/useProjectStore';
+
+// Apply one coalesced batch: every update carries the project's current status
+const applyUpdates = (updates) => {
+  const { getProject, addProject, updateProject, removeProject } = useProjectStore.getState();
+
+  updates.forEach(({ project_name: projectName, running, replicas, events = [] }) => {
+    const types = events.map(event => event.type);
+    if (types.lastIndexOf('deleted') > types.lastIndexOf('created')) {
+      removeProject(projectName);
+      return;
+    }
+
+    if (!getProject(projectName)) {
+      // Created by another client: read it once
+      api.getProject(projectName)
+        .then(project => addProject({ ...project, running, replicas }))
+        .catch(error => console.error(`Failed to load project ${projectName}:`, error));
+      return;
+    }
+
+    const changes = { running, replicas, status: running ? 'running' : 'stopped' };
+    if (types.includes('venv_created')) changes.has_venv = true;
+    updateProject(projectName, changes);
+  });
+};
+
+// Keep the project store current from the dashboard room instead of polling
+export const useDashboardEvents = (onConnect) => {
+  const onConnectRef = useRef(onConnect);
+  onConnectRef.current = onConnect;
+
+  useEffect(() => {
+    const wsService = new WebSocketService();
+
+    wsService.on('project_events', (data) => applyUpdates(data?.updates || []));
+
+    // Events missed while disconnected: resynchronize (a 304 when nothing changed)
+    wsService.on('connected', () => onConnectRef.current?.());
+
+    wsService.connectDashboard();
+
+    return () => wsService.disconnect();
+  }, []);
+};
+
+export default useDashboardEvents;
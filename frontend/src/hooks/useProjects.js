@@ -10,6 +10,7 @@ export const useProjects = () => {
     loading,
     error,
     setProjects,
+    setOverviewEtag,
     setLoading,
     setError,
     updateProject,
@@ -20,14 +21,18 @@ export const useProjects = () => {
 
   const toast = useToastStore();
 
-  // Fetch all projects
+  // Fetch all projects from the dashboard overview, unless unchanged since the last one
   const fetchProjects = useCallback(async (showLoading = true) => {
+    const { overviewEtag } = useProjectStore.getState();
+    // Only the first load hides the grid: later ones are usually a 304
+    showLoading = showLoading && !overviewEtag;
     try {
       if (showLoading) setLoading(true);
       clearError();
       
-      const data = await api.getProjects();
-      setProjects(data || []);
+      const { data, etag } = await api.getOverview(overviewEtag);
+      if (data) setProjects(data.projects || []);
+      setOverviewEtag(etag);
     } catch (error) {
       console.error('Failed to fetch projects:', error);
       setError(error.message);
@@ -37,24 +42,24 @@ export const useProjects = () => {
     } finally {
       if (showLoading) setLoading(false);
     }
-  }, [setProjects, setLoading, setError, clearError, toast]);
+  }, [setProjects, setOverviewEtag, setLoading, setError, clearError, toast]);
 
-  // Create a new project
+  // Create a new project: the clone runs as a background job
   const createProject = useCallback(async (projectData) => {
     try {
-      setLoading(true);
-      const newProject = await api.createProject(projectData);
+      const { project_name: projectName, job } = await api.createProject(projectData);
+      toast.info('Creating project', `Cloning ${projectName}...`);
+      await api.waitForJob(job);
+      const newProject = { running: false, replicas: 0, ...await api.getProject(projectName) };
       addProject(newProject);
-      toast.success('Project created', `${newProject.name} has been created successfully`);
+      toast.success('Project created', `${projectName} has been created successfully`);
       return newProject;
     } catch (error) {
       console.error('Failed to create project:', error);
       toast.error('Failed to create project', error.message);
       throw error;
-    } finally {
-      setLoading(false);
     }
-  }, [addProject, setLoading, toast]);
+  }, [addProject, toast]);
 
   // Start a project
   const startProject = useCallback(async (projectName) => {
@@ -122,11 +127,11 @@ export const useProjects = () => {
     }
   }, [updateProject, toast]);
 
-  // Environment management
+  // Environment management (venv creation and installs run as background jobs)
   const createVenv = useCallback(async (projectName) => {
     try {
-      setLoading(true);
-      const result = await api.createVenv(projectName);
+      const { job } = await api.createVenv(projectName);
+      const result = await api.waitForJob(job);
       updateProject(projectName, { has_venv: true });
       toast.success('Virtual environment created', `Virtual environment for ${projectName} has been created`);
       return result;
@@ -134,10 +139,8 @@ export const useProjects = () => {
       console.error('Failed to create venv:', error);
       toast.error('Failed to create virtual environment', error.message);
       throw error;
-    } finally {
-      setLoading(false);
     }
-  }, [updateProject, setLoading, toast]);
+  }, [updateProject, toast]);
 
   const deleteVenv = useCallback(async (projectName) => {
     try {
@@ -156,8 +159,8 @@ export const useProjects = () => {
 
   const installRequirements = useCallback(async (projectName) => {
     try {
-      setLoading(true);
-      const result = await api.installRequirements(projectName);
+      const { job } = await api.installRequirements(projectName);
+      const result = await api.waitForJob(job);
       updateProject(projectName, { has_requirements: true });
       toast.success('Requirements installed', `Requirements for ${projectName} have been installed`);
       return result;
@@ -165,10 +168,8 @@ export const useProjects = () => {
       console.error('Failed to install requirements:', error);
       toast.error('Failed to install requirements', error.message);
       throw error;
-    } finally {
-      setLoading(false);
     }
-  }, [updateProject, setLoading, toast]);
+  }, [updateProject, toast]);
 
   // Set up polling for project updates
   useEffect(() => {
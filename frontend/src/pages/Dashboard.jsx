@@ -2,11 +2,17 @@ import { useState } from 'react';
 import ProjectGrid from '../components/ProjectGrid/ProjectGrid';
 import ProjectModal from '../components/ProjectModal/ProjectModal';
 import useProjectStore from '../stores/useProjectStore';
+import useProjects from '../hooks/useProjects';
+import useDashboardEvents from '../hooks/useDashboardEvents';
 import { LoadingSpinner } from '../components/ui';
 
 const Dashboard = () => {
   const [selectedProject, setSelectedProject] = useState(null);
   const { loading, error } = useProjectStore();
+  const { fetchProjects } = useProjects();
+
+  // Lifecycle events of every project, applied to the store as they come
+  useDashboardEvents(() => fetchProjects(false));
 
   const handleProjectClick = (project) => {
     setSelectedProject(project);
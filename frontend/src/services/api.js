@@ -1,4 +1,4 @@
-import { API_ENDPOINTS } from '../utils/constants';
+import { API_ENDPOINTS, INTERVALS, JOB_FINISHED_STATES } from '../utils/constants';
 
 class ApiError extends Error {
   constructor(message, status, data) {
@@ -15,16 +15,23 @@ class ApiService {
   }
 
   async request(url, options = {}) {
+    const { headers, onResponse, ...rest } = options;
     const config = {
       headers: {
         'Content-Type': 'application/json',
-        ...options.headers,
+        ...headers,
       },
-      ...options,
+      ...rest,
     };
 
     try {
       const response = await fetch(`${this.baseURL}${url}`, config);
+      if (onResponse) onResponse(response);
+      
+      // Not modified since the ETag sent in If-None-Match
+      if (response.status === 304) {
+        return null;
+      }
       
       if (!response.ok) {
         let errorData;
@@ -136,12 +143,40 @@ class ApiService {
   }
 
   async installRequirements(name) {
-    return this.request(`${API_ENDPOINTS.PROJECTS}/${encodeURIComponent(name)}/requirements`, {
+    return this.request(`${API_ENDPOINTS.PROJECTS}/${encodeURIComponent(name)}/install`, {
       method: 'POST',
     });
   }
 
+  // Background jobs
+  async getJob(id) {
+    return this.request(`${API_ENDPOINTS.JOBS}${encodeURIComponent(id)}`);
+  }
+
+  // Poll a job returned with a 202 until it finishes; rejects unless it succeeded
+  async waitForJob(job, interval = INTERVALS.JOB_POLLING) {
+    let current = job;
+    while (!JOB_FINISHED_STATES.includes(current.status)) {
+      await new Promise(resolve => setTimeout(resolve, interval));
+      current = await this.getJob(current.id);
+    }
+    if (current.status !== 'succeeded') {
+      throw new ApiError(current.error || `Job ${current.status}`, 0, current);
+    }
+    return current;
+  }
+
   // System API
+  // Dashboard snapshot; data is null when nothing changed since etag
+  async getOverview(etag = null, logLines = 20) {
+    let responseEtag = null;
+    const data = await this.request(`${API_ENDPOINTS.SYSTEM}overview?logs=${logLines}`, {
+      headers: etag ? { 'If-None-Match': etag } : {},
+      onResponse: (response) => { responseEtag = response.headers.get('ETag'); },
+    });
+    return { data, etag: responseEtag || (data ? null : etag) };
+  }
+
   async getSystemStats() {
     return this.request(`${API_ENDPOINTS.SYSTEM}/stats`);
   }
@@ -34,6 +34,33 @@ class WebSocketService {
     }
   }
 
+  // Default namespace: lifecycle events of every project (the dashboard room)
+  connectDashboard() {
+    if (this.socket && this.socket.connected) {
+      this.disconnect();
+    }
+
+    try {
+      this.socket = io({
+        transports: ['websocket', 'polling'],
+        timeout: 10000,
+        reconnection: true,
+        reconnectionAttempts: this.maxReconnectAttempts,
+        reconnectionDelay: this.reconnectDelay,
+      });
+
+      // Rooms do not survive a reconnection: join again on every connect
+      this.socket.on('connect', () => this.socket.emit('join_dashboard'));
+      this.setupEventHandlers();
+
+      return this.socket;
+    } catch (error) {
+      console.error('WebSocket connection error:', error);
+      this.emit('error', error);
+      return null;
+    }
+  }
+
   setupEventHandlers() {
     if (!this.socket) return;
 
@@ -62,6 +89,10 @@ class WebSocketService {
       this.emit('project_status', data);
     });
 
+    this.socket.on('project_events', (data) => {
+      this.emit('project_events', data);
+    });
+
     this.socket.on('error', (error) => {
       console.error('WebSocket error:', error);
       this.emit('error', error);
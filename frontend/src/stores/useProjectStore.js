@@ -11,10 +11,14 @@ const useProjectStore = create(
     filter: '',
     sortBy: 'name',
     sortOrder: 'asc',
+    // ETag of the last overview snapshot, sent back to skip unchanged ones
+    overviewEtag: null,
 
     // Actions
     setProjects: (projects) => set({ projects }),
     
+    setOverviewEtag: (overviewEtag) => set({ overviewEtag }),
+    
     setLoading: (loading) => set({ loading }),
     
     setError: (error) => set({ error }),
@@ -34,9 +38,9 @@ const useProjectStore = create(
       )
     })),
     
-    // Add a new project
+    // Add a new project (replaces it if a lifecycle event inserted it first)
     addProject: (project) => set((state) => ({
-      projects: [...state.projects, project]
+      projects: [...state.projects.filter(existing => existing.name !== project.name), project]
     })),
     
     // Remove a project
@@ -40,6 +40,7 @@ export const SPACING = {
 export const API_ENDPOINTS = {
   PROJECTS: '/api/projects/',  // Add trailing slash to avoid redirects
   SYSTEM: '/api/system/',
+  JOBS: '/api/jobs/',
   WS_LOGS: '/ws/logs'
 }
 
@@ -47,5 +48,9 @@ export const API_ENDPOINTS = {
 export const INTERVALS = {
   PROJECT_POLLING: 30000, // 30 seconds - increased to debug infinite loop
   LOG_BUFFER_FLUSH: 100, // 100ms for log buffering
-  RECONNECT_DELAY: 1000 // 1 second for WebSocket reconnection
-}
\ No newline at end of file
+  RECONNECT_DELAY: 1000, // 1 second for WebSocket reconnection
+  JOB_POLLING: 1000 // 1 second between background job status checks
+}
+
+// Background job states after which the job no longer changes
+export const JOB_FINISHED_STATES = ['succeeded', 'failed', 'cancelled', 'timed_out']
\ No newline at end of file